@@ -0,0 +1,101 @@
+"""
+Benchmark handling StructuredErrors with the default error handler
+
+Requests are sent directly to the ASGI application rendered from `template_service.py`, with an
+added endpoint that raises a StructuredError whose attributes hold a list of 100 items. The error
+is logged and returned by the default error handler. The "before" measurement uses the
+`StructuredError.structured_error` that Service-Kit previously shipped, which deep-copied the
+attributes every time it was accessed.
+
+Rendering a response with a fixed message, such as UnauthorizedResponse, is then measured by
+itself, with a pydantic model and JSONResponse as before, and with PrerenderedErrorResponse.
+
+Usage:
+    python -m benchmarks.error_handling [--requests N]
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from copy import deepcopy
+from http import HTTPStatus
+from typing import Any
+
+from fastapi.responses import JSONResponse, Response
+
+from service_kit.api import PrerenderedErrorResponse, UnauthorizedResponse
+from service_kit.errors import StructuredError
+
+from .utils import (
+    configure_null_logger,
+    http_scope,
+    load_template_service,
+    measure_requests_per_second,
+)
+
+ITEMS = [{"id": i, "name": f"item-{i}", "tags": ["a", "b"]} for i in range(100)]
+
+
+class OrderFailedError(StructuredError):
+    pass
+
+
+def legacy_structured_error(self: StructuredError) -> dict[str, Any]:
+    return deepcopy(self._attributes)
+
+
+def render_unauthorized_response(request_id: str) -> Response:
+    return JSONResponse(
+        status_code=HTTPStatus.UNAUTHORIZED,
+        content=UnauthorizedResponse(request_id=request_id).model_dump(),
+    )
+
+
+def measure_nanoseconds_per_response(render: Callable[[str], Response], responses: int) -> float:
+    request_id = "01JAB8N6Z1FW3XQ2M5T7YV9C4D"
+    start = time.perf_counter_ns()
+    for _ in range(responses):
+        render(request_id)
+
+    return (time.perf_counter_ns() - start) / responses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per measurement")
+    args = parser.parse_args()
+
+    configure_null_logger()
+    scope = http_scope("POST", "/orders")
+
+    app = load_template_service().app
+
+    @app.post("/orders")
+    async def create_order():
+        raise OrderFailedError("The order failed", order_id="1234", items=ITEMS)
+
+    after_eps = measure_requests_per_second(app, scope, args.requests)
+
+    structured_error = StructuredError.structured_error
+    StructuredError.structured_error = property(legacy_structured_error)  # type: ignore[assignment]
+    try:
+        before_eps = measure_requests_per_second(app, scope, args.requests)
+    finally:
+        StructuredError.structured_error = structured_error  # type: ignore[method-assign]
+
+    print(f"before (deep copies):        {before_eps:10.0f} errors/sec")
+    print(f"after (read-only view):      {after_eps:10.0f} errors/sec")
+    print(f"speedup:                     {after_eps / before_eps:10.2f}x")
+
+    responses = args.requests * 20
+    before_ns = measure_nanoseconds_per_response(render_unauthorized_response, responses)
+    after_ns = measure_nanoseconds_per_response(
+        PrerenderedErrorResponse(UnauthorizedResponse, HTTPStatus.UNAUTHORIZED).render, responses
+    )
+    print(f"before (render 401):         {before_ns:10.0f} ns/response")
+    print(f"after (prerendered 401):     {after_ns:10.0f} ns/response")
+    print(f"speedup:                     {before_ns / after_ns:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
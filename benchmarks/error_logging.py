@@ -0,0 +1,104 @@
+"""
+Benchmark logging the same error repeatedly, as happens during an outage
+
+An error that is raised a few frames deep is logged with `log_basic_error()`, with and without
+`error_deduplication_window`. Without it, every occurrence formats and logs the full traceback.
+With it, only the first occurrence in the window does, and the other occurrences are logged as
+compact records with a fingerprint and an occurrence count.
+
+An ExceptionGroup raised by a TaskGroup of 500 failed tasks is then logged with
+`log_exception_group()`, which logs one record per task by default, and one summary record with
+`aggregate=True`.
+
+Usage:
+    python -m benchmarks.error_logging [--errors N]
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Callable
+from typing import Any
+
+from service_kit.logging import log_basic_error, log_exception_group
+
+from .utils import configure_null_logger
+
+
+def query_database(depth: int):
+    if depth == 0:
+        raise ConnectionError("Connection refused")
+
+    query_database(depth - 1)
+
+
+def log_repeated_error():
+    try:
+        query_database(depth=5)
+    except ConnectionError as err:
+        log_basic_error(err)
+
+
+def create_task_group_error(tasks: int) -> ExceptionGroup:
+    async def query():
+        query_database(depth=5)
+
+    async def run():
+        async with asyncio.TaskGroup() as task_group:
+            for _ in range(tasks):
+                task_group.create_task(query())
+
+    try:
+        asyncio.run(run())
+    except ExceptionGroup as group:
+        return group
+
+    raise AssertionError("The tasks didn't fail")
+
+
+def measure(log: Callable[[], None], errors: int, **configuration: Any) -> tuple[float, float]:
+    written_bytes = 0
+
+    def count_bytes(message: str):
+        nonlocal written_bytes
+        written_bytes += len(message)
+
+    configure_null_logger(sink=count_bytes, **configuration)
+
+    start = time.perf_counter()
+    for _ in range(errors):
+        log()
+
+    return errors / (time.perf_counter() - start), written_bytes / errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--errors", type=int, default=20000, help="Errors per measurement")
+    args = parser.parse_args()
+
+    configurations: dict[str, dict[str, Any]] = {
+        "before (full tracebacks):": {},
+        "after (deduplicated):": {"error_deduplication_window": 60.0},
+    }
+    for label, configuration in configurations.items():
+        errors_per_second, bytes_per_error = measure(
+            log_repeated_error, args.errors, **configuration
+        )
+        print(
+            f"{label:<30} {errors_per_second:10.0f} errors/sec {bytes_per_error:8.0f} bytes/error"
+        )
+
+    group = create_task_group_error(tasks=500)
+    groups = max(args.errors // 1000, 1)
+    for label, aggregate in (("before (record per task):", False), ("after (aggregated):", True)):
+        groups_per_second, bytes_per_group = measure(
+            lambda: log_exception_group(group, aggregate=aggregate), groups
+        )
+        print(
+            f"{label:<30} {groups_per_second:10.1f} groups/sec {bytes_per_group:8.0f} bytes/group"
+        )
+
+
+if __name__ == "__main__":
+    main()
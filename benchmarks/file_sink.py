@@ -0,0 +1,94 @@
+"""
+Benchmark writing log records to files with different buffering and fsync policies
+
+Records are written through the logger, as they are in a service, to a FileSink in a temporary
+directory. One in every 100 records is logged at ERROR, which is what FsyncPolicy.CRITICAL
+persists immediately. On Linux, the number of write system calls per record is reported as well.
+
+Usage:
+    python -m benchmarks.file_sink [--records N]
+"""
+
+import argparse
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+
+from service_kit.logging import FsyncPolicy, LogLevel, configure_logger, logger
+
+from .json_encoding import REQUEST_LOG_RECORD
+
+EXTRA_FIELDS = {
+    key: value
+    for key, value in REQUEST_LOG_RECORD.items()
+    if key not in ("timestamp", "level", "module", "file", "function", "message")
+}
+CONFIGURATIONS: dict[str, dict[str, Any]] = {
+    "unbuffered": {},
+    "buffered (64 KiB)": {"log_file_buffer_size": 64 * 1024},
+    "buffered, fsync interval": {
+        "log_file_buffer_size": 64 * 1024,
+        "log_file_fsync_policy": FsyncPolicy.INTERVAL,
+    },
+    "buffered, fsync critical": {
+        "log_file_buffer_size": 64 * 1024,
+        "log_file_fsync_policy": FsyncPolicy.CRITICAL,
+    },
+    "unbuffered, fsync critical": {"log_file_fsync_policy": FsyncPolicy.CRITICAL},
+}
+
+
+def count_write_syscalls() -> int | None:
+    try:
+        with open("/proc/self/io") as io_file:
+            for line in io_file:
+                if line.startswith("syscw:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+
+    return None
+
+
+def measure(log_directory: Path, records: int, **kwargs) -> tuple[float, float | None]:
+    configure_logger(LogLevel.INFO, log_directory, pretty_print_logs=False, **kwargs)
+    # Only the file sink is measured, so the stderr sink, which is added first, is removed
+    logger.remove(min(logger._core.handlers))  # type: ignore[attr-defined]
+
+    start_write_syscalls = count_write_syscalls()
+    start = time.perf_counter()
+    for i in range(records):
+        if i % 100 == 0:
+            logger.error("Request failed", **EXTRA_FIELDS)
+        else:
+            logger.info("Request received", **EXTRA_FIELDS)
+
+    # Reconfiguring the logger stops the file sink, which writes any buffered records
+    configure_logger(log_level=50000, log_directory=None, pretty_print_logs=False)
+
+    records_per_second = records / (time.perf_counter() - start)
+    end_write_syscalls = count_write_syscalls()
+    if start_write_syscalls is None or end_write_syscalls is None:
+        return records_per_second, None
+
+    return records_per_second, (end_write_syscalls - start_write_syscalls) / records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=100000, help="Records per measurement")
+    args = parser.parse_args()
+
+    for name, kwargs in CONFIGURATIONS.items():
+        with TemporaryDirectory() as log_directory:
+            records_per_second, writes_per_record = measure(
+                Path(log_directory), args.records, **kwargs
+            )
+
+        writes = f"{writes_per_record:10.3f} writes/record" if writes_per_record is not None else ""
+        print(f"{name + ':':<30} {records_per_second:10.0f} records/sec {writes}")
+
+
+if __name__ == "__main__":
+    main()
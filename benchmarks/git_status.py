@@ -0,0 +1,77 @@
+"""
+Benchmark getting the git status that is logged at startup
+
+Previously, `log_git_status()` ran `git` five times: to check that the current directory is a
+repository, and to get the commit, its parents, the status of the worktree, and the tags. Now, the
+commit, its parents, and its tags are read directly from the `.git` directory, and `git` is only
+run to check whether the worktree is clean if `check_worktree` is set. With
+`prefer_git_status_yaml`, the status is read from a YAML file that was written when the service was
+built, and neither `git` nor the repository is used.
+
+Usage:
+    python -m benchmarks.git_status [--runs N] [--repository PATH]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from service_kit.logging.startup import (
+    _get_commit_id,
+    _get_parents,
+    _get_repository_status,
+    _get_tags,
+    _read_yaml_file,
+    get_git_status,
+    write_git_status_yaml,
+)
+
+
+def run_git(repository_path: Path):
+    # What log_git_status() did before
+    _get_commit_id(repository_path)
+    _get_commit_id(repository_path)
+    _get_parents(repository_path)
+    _get_repository_status(repository_path)
+    _get_tags(repository_path)
+
+
+def measure_ms(get_status: Callable[[], object], runs: int) -> float:
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        get_status()
+        durations.append(time.perf_counter() - start)
+
+    return statistics.median(durations) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20, help="Times to get the status")
+    parser.add_argument(
+        "--repository", type=Path, default=Path.cwd(), help="A path in a git repository"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        git_status_yaml_path = Path(temporary_directory) / "git_status.yaml"
+        write_git_status_yaml(git_status_yaml_path, args.repository)
+
+        scenarios: dict[str, Callable[[], object]] = {
+            "git (before)": lambda: run_git(args.repository),
+            ".git directory (default)": lambda: get_git_status(args.repository),
+            ".git directory and git diff-index": lambda: get_git_status(
+                args.repository, check_worktree=True
+            ),
+            "YAML file written at build time": lambda: _read_yaml_file(git_status_yaml_path),
+        }
+        for name, get_status in scenarios.items():
+            print(f"{name + ':':<50} {measure_ms(get_status, args.runs):10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark the cold-start cost of importing service_kit.api
+
+Each measurement imports `service_kit.api` in a fresh Python process with `-X importtime`, so that
+nothing is cached in memory. The wall time of the import and the self time of each of Service-Kit's
+own modules are reported, as the median across all runs. Previously, `service_kit.api.responses`
+generated the JSON schemas of the standard responses at import time. Now, they're generated by
+FastAPI when the OpenAPI schema is first requested, and the time that takes is reported as well.
+
+Usage:
+    python -m benchmarks.import_time [--runs N] [--module MODULE] [--json]
+"""
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Any
+
+from .utils import load_template_service
+
+# A line of -X importtime's output: "import time: <self us> | <cumulative us> | <module>"
+IMPORT_TIME_PATTERN = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|\s+(\S+)\s*$")
+
+
+def measure_import(module: str) -> tuple[float, dict[str, int]]:
+    """
+    Import a module in a fresh process
+
+    :return: The wall time of the import in milliseconds, and the self time of each of
+             Service-Kit's modules in microseconds
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    wall_time_ms = (time.perf_counter() - start) * 1000
+
+    self_times_us = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match is not None and match.group(3).startswith("service_kit"):
+            self_times_us[match.group(3)] = int(match.group(1))
+
+    return wall_time_ms, self_times_us
+
+
+def measure_openapi_schema_ms() -> float:
+    app = load_template_service().app
+
+    start = time.perf_counter()
+    app.openapi()
+
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10, help="Fresh processes to measure")
+    parser.add_argument("--module", default="service_kit.api", help="The module to import")
+    parser.add_argument("--json", action="store_true", help="Write the results as JSON")
+    args = parser.parse_args()
+
+    wall_times_ms = []
+    self_times_us: dict[str, list[int]] = defaultdict(list)
+    for _ in range(args.runs):
+        wall_time_ms, module_self_times_us = measure_import(args.module)
+        wall_times_ms.append(wall_time_ms)
+        for module, self_time_us in module_self_times_us.items():
+            self_times_us[module].append(self_time_us)
+
+    results: dict[str, Any] = {
+        "module": args.module,
+        "import_wall_time_ms": statistics.median(wall_times_ms),
+        "self_times_us": {
+            module: statistics.median(times)
+            for module, times in sorted(
+                self_times_us.items(), key=lambda item: statistics.median(item[1]), reverse=True
+            )
+        },
+        "first_openapi_schema_ms": measure_openapi_schema_ms(),
+    }
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+        return
+
+    import_label = f"import {args.module}:"
+    openapi_label = "first /openapi.json of template service:"
+    print(f"{import_label:<50} {results['import_wall_time_ms']:10.1f} ms")
+    print(f"{openapi_label:<50} {results['first_openapi_schema_ms']:10.1f} ms")
+    print("Self time of Service-Kit's modules:")
+    for module, self_time_us in results["self_times_us"].items():
+        print(f"  {module:<48} {self_time_us / 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark the colorizers used to add colors to log records written to a terminal
+
+Each colorizer colorizes a typical "Request received" record, as produced by
+`RequestLogMiddleware`, in both compact and pretty-printed form.
+
+Usage:
+    python -m benchmarks.json_colorizing [--records N]
+"""
+
+import argparse
+import time
+
+from service_kit.logging import (
+    JSONColorizerType,
+    JSONEncoderType,
+    create_json_colorizer,
+    create_json_encoder,
+)
+from service_kit.logging._logger import Serializer
+
+from .json_encoding import REQUEST_LOG_RECORD
+
+
+def measure_records_per_second(
+    colorizer_type: JSONColorizerType, pretty_print: bool, records: int
+) -> float:
+    json_str = create_json_encoder(
+        JSONEncoderType.STDLIB, Serializer._default_serializer, pretty_print=pretty_print
+    ).encode(REQUEST_LOG_RECORD)
+    colorizer = create_json_colorizer(colorizer_type)
+
+    start = time.perf_counter()
+    for _ in range(records):
+        colorizer.colorize(json_str)
+
+    return records / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=20000, help="Records per measurement")
+    args = parser.parse_args()
+
+    for colorizer_type in (JSONColorizerType.PYGMENTS, JSONColorizerType.ANSI):
+        for pretty_print in (False, True):
+            label = f"{colorizer_type} ({'pretty' if pretty_print else 'compact'})"
+            records_per_second = measure_records_per_second(
+                colorizer_type, pretty_print, args.records
+            )
+            print(f"{label:<20} {records_per_second:12.0f} records/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark the JSON encoders used to serialize log records
+
+Each available encoder serializes the fields of a typical "Request received" record, as produced
+by `RequestLogMiddleware`, in both compact and pretty-printed form.
+
+Usage:
+    python -m benchmarks.json_encoding [--records N]
+"""
+
+import argparse
+import time
+from typing import Any, Final
+
+from service_kit.logging import JSONEncoderType, LogLevel, create_json_encoder
+from service_kit.logging._logger import Serializer
+
+REQUEST_LOG_RECORD: Final[dict[str, Any]] = {
+    "timestamp": "2026-10-17 12:00:00:123456 +0000",
+    "level": LogLevel.INFO,
+    "module": "request_log_middleware",
+    "file": "/app/.venv/lib/python3.11/site-packages/service_kit/api/request_log_middleware.py",
+    "function": "log_request",
+    "message": "Request received",
+    "request_id": "0192a3f4-5b6c-7d8e-9f01-23456789abcd",
+    "method": "POST",
+    "path": "/echo/customer-1234",
+    "query_parameters": {"page": "2", "limit": "50"},
+    "source": {"host": "10.0.12.34", "port": 54321},
+    "url": "http://service.internal:8080/echo/customer-1234?page=2&limit=50",
+}
+
+
+def measure_records_per_second(encoder_type: JSONEncoderType, pretty_print: bool, records: int):
+    encoder = create_json_encoder(
+        encoder_type, Serializer._default_serializer, pretty_print=pretty_print
+    )
+
+    start = time.perf_counter()
+    for _ in range(records):
+        encoder.encode(REQUEST_LOG_RECORD)
+
+    return records / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=200000, help="Records per measurement")
+    args = parser.parse_args()
+
+    for encoder_type in (JSONEncoderType.STDLIB, JSONEncoderType.ORJSON, JSONEncoderType.MSGSPEC):
+        for pretty_print in (False, True):
+            label = f"{encoder_type} ({'pretty' if pretty_print else 'compact'})"
+            try:
+                records_per_second = measure_records_per_second(
+                    encoder_type, pretty_print, args.records
+                )
+            except ImportError:
+                print(f"{label:<20} not installed")
+                continue
+
+            print(f"{label:<20} {records_per_second:12.0f} records/sec")
+
+
+if __name__ == "__main__":
+    main()
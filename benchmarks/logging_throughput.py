@@ -0,0 +1,244 @@
+"""
+Benchmark the per-record cost of logging in each of the logger's modes
+
+A typical "Request received" record is logged through the logger configured by
+`configure_logger()` in each scenario below, with stderr replaced by a stream that discards what
+is written to it. For each scenario, the following are reported:
+
+- records/sec: the throughput of logging records back to back
+- p50/p99 latency: the distribution of the time it takes to log a single record
+- alloc bytes/record: the peak memory allocated while logging a single record, as traced by
+  `tracemalloc`, which approximates the per-record allocations
+
+The results can be written as JSON with `--json`, and compared with a previous JSON result with
+`--baseline`, in which case the exit code is 1 if any scenario's throughput regressed by more than
+`--max-regression`.
+
+Usage:
+    python -m benchmarks.logging_throughput [--records N] [--scenario NAME ...] [--json]
+                                            [--baseline PATH] [--max-regression FRACTION]
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Final
+
+from service_kit.logging import LogLevel
+from service_kit.logging import _logger as logger_module
+from service_kit.logging import configure_logger, intercept_preconfigured_loggers, logger
+
+from .json_encoding import REQUEST_LOG_RECORD
+
+EXTRA_FIELDS: Final[dict[str, Any]] = {
+    key: value
+    for key, value in REQUEST_LOG_RECORD.items()
+    if key not in ("timestamp", "level", "module", "file", "function", "message")
+}
+BOUND_EXTRA: Final[dict[str, Any]] = {
+    "service": "benchmark",
+    "version": "1.0.0",
+    "environment": "production",
+}
+INTERCEPTED_LOGGER_NAME: Final[str] = "benchmark.third_party"
+
+# The configure_logger() parameters of each scenario, except for "colorize", which colorizes the
+# records written to stderr as if it were a terminal, "log_file", which writes the records to a log
+# file in a temporary directory, and "intercepted", which logs the records through Python's logging
+# library and InterceptHandler
+SCENARIOS: Final[dict[str, dict[str, Any]]] = {
+    "compact": {},
+    "pretty": {"pretty_print_logs": True},
+    "colorized": {"colorize": True},
+    "colorized-pretty": {"colorize": True, "pretty_print_logs": True},
+    "sort-fields": {"sort_fields": True},
+    "extra": {"extra": BOUND_EXTRA},
+    "file": {"log_file": True},
+    "file-buffered": {"log_file": True, "log_file_buffer_size": 1024 * 1024},
+    "intercepted": {"intercepted": True},
+}
+
+
+class NullStream:
+    def write(self, _: str):
+        pass
+
+    def flush(self):
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+
+@contextmanager
+def configured_logger(
+    log_directory: Path,
+    colorize: bool = False,
+    log_file: bool = False,
+    intercepted: bool = False,
+    pretty_print_logs: bool = False,
+    **kwargs: Any,
+) -> Iterator[Callable[[], None]]:
+    """
+    Configure the logger for a scenario
+
+    :return: A callable that logs one record
+    """
+    io_stream = logger_module.io_stream
+    colorize_stderr = logger_module.serializer._colorize
+    logger_module.io_stream = NullStream()
+    logger_module.serializer._colorize = colorize
+    try:
+        configure_logger(
+            LogLevel.INFO,
+            log_directory if log_file else None,
+            pretty_print_logs,
+            **kwargs,
+        )
+
+        log: Callable[[], None]
+        if intercepted:
+            intercept_preconfigured_loggers([INTERCEPTED_LOGGER_NAME])
+            third_party_logger = logging.getLogger(INTERCEPTED_LOGGER_NAME)
+            log = lambda: third_party_logger.info("Request received")  # noqa: E731
+        else:
+            log = lambda: logger.info("Request received", **EXTRA_FIELDS)  # noqa: E731
+
+        yield log
+    finally:
+        configure_logger(LogLevel.INFO, None, pretty_print_logs=False)
+        logger_module.io_stream = io_stream
+        logger_module.serializer._colorize = colorize_stderr
+
+
+def measure_records_per_second(log: Callable[[], None], records: int) -> float:
+    start = time.perf_counter()
+    for _ in range(records):
+        log()
+
+    return records / (time.perf_counter() - start)
+
+
+def measure_latencies_ns(log: Callable[[], None], records: int) -> list[int]:
+    latencies = []
+    for _ in range(records):
+        start = time.perf_counter_ns()
+        log()
+        latencies.append(time.perf_counter_ns() - start)
+
+    return latencies
+
+
+def measure_allocated_bytes(log: Callable[[], None], records: int) -> float:
+    allocated = []
+    tracemalloc.start()
+    try:
+        for _ in range(records):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            log()
+            _, peak = tracemalloc.get_traced_memory()
+            allocated.append(peak - before)
+    finally:
+        tracemalloc.stop()
+
+    return statistics.mean(allocated)
+
+
+def run_scenario(name: str, records: int) -> dict[str, Any]:
+    with TemporaryDirectory() as tmp_dir:
+        with configured_logger(Path(tmp_dir), **SCENARIOS[name]) as log:
+            measure_records_per_second(log, max(records // 10, 1))  # Warm up
+            records_per_second = measure_records_per_second(log, records)
+            latencies = measure_latencies_ns(log, records)
+            allocated_bytes = measure_allocated_bytes(log, max(records // 10, 1))
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    return {
+        "scenario": name,
+        "records_per_second": records_per_second,
+        "p50_latency_ns": percentiles[49],
+        "p99_latency_ns": percentiles[98],
+        "allocated_bytes_per_record": allocated_bytes,
+    }
+
+
+def find_regressions(
+    results: list[dict[str, Any]], baseline: list[dict[str, Any]], max_regression: float
+) -> list[str]:
+    baseline_by_scenario = {result["scenario"]: result for result in baseline}
+
+    regressions = []
+    for result in results:
+        previous = baseline_by_scenario.get(result["scenario"])
+        if previous is None:
+            continue
+
+        change = result["records_per_second"] / previous["records_per_second"] - 1
+        if change < -max_regression:
+            regressions.append(f"{result['scenario']}: {change:+.1%} records/sec")
+
+    return regressions
+
+
+def print_results(results: list[dict[str, Any]]):
+    print(
+        f"{'scenario':<20} {'records/sec':>12} {'p50 latency':>12} {'p99 latency':>12} "
+        f"{'alloc bytes/record':>19}"
+    )
+    for result in results:
+        print(
+            f"{result['scenario']:<20} {result['records_per_second']:12.0f} "
+            f"{result['p50_latency_ns'] / 1000:10.1f}us {result['p99_latency_ns'] / 1000:10.1f}us "
+            f"{result['allocated_bytes_per_record']:19.0f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=20000, help="Records per measurement")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=SCENARIOS,
+        help="A scenario to run. Can be repeated. (default: all scenarios)",
+    )
+    parser.add_argument("--json", action="store_true", help="Write the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="A JSON result to compare the results with")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.1,
+        help="The largest allowed drop in records/sec compared to the baseline (default: 0.1)",
+    )
+    args = parser.parse_args()
+
+    results = [run_scenario(name, args.records) for name in args.scenario or SCENARIOS]
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        print_results(results)
+
+    if args.baseline is not None:
+        regressions = find_regressions(
+            results, json.loads(args.baseline.read_text()), args.max_regression
+        )
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark redacting secrets from the debug "Request received" log record
+
+Previously, `RequestLogMiddleware.sanitize_headers()` redacted the Authorization header with a
+Python loop, and nothing else was redacted. Now `sanitize_headers()` redacts the Authorization,
+Cookie, and Set-Cookie headers with a single comprehension, whatever the logger's redaction policy
+is. If a redaction policy is configured, the logger's Redactor then applies it to every field of
+the record, including the request body. Sanitizing the headers costs about as much as before,
+since most of the time is spent decoding them, but redacting every field costs more than
+sanitizing the headers alone, which is why redaction is opt-in.
+
+Usage:
+    python -m benchmarks.redaction [--records N]
+"""
+
+import argparse
+import time
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from starlette.datastructures import Headers
+
+from service_kit.api import RequestLogMiddleware
+from service_kit.logging import RedactionPolicy, Redactor
+
+HEADERS = Headers(
+    raw=[
+        (b"host", b"127.0.0.1:8080"),
+        (b"user-agent", b"service-kit-benchmark"),
+        (b"accept", b"application/json"),
+        (b"accept-encoding", b"gzip, deflate"),
+        (b"content-type", b"application/json"),
+        (b"content-length", b"64"),
+        (b"x-request-id", b"01JAB8N6Z1FW3XQ2M5T7YV9C4D"),
+        (b"authorization", b"Bearer secret"),
+    ]
+)
+BODY = {"customer_id": "1234", "items": [{"sku": "A-1", "quantity": 2}], "password": "hunter2"}
+
+
+def build_fields(headers: Mapping[str, str]) -> dict[str, Any]:
+    return {
+        "timestamp": "2025-01-01 00:00:00:000000 +0000",
+        "level": "DEBUG",
+        "module": "request_log_middleware",
+        "file": "request_log_middleware.py",
+        "function": "log_request",
+        "message": "Request received",
+        "method": "POST",
+        "path": "/echo",
+        "query_parameters": {},
+        "source": {"host": "127.0.0.1", "port": 54321},
+        "url": "http://127.0.0.1:8080/echo",
+        "headers": headers,
+        "body": BODY,
+        "request_id": "01JAB8N6Z1FW3XQ2M5T7YV9C4D",
+    }
+
+
+def sanitize_headers_with_loop() -> dict[str, Any]:
+    # What RequestLogMiddleware.sanitize_headers() did before
+    sanitized_headers = {}
+    for k, v in HEADERS.items():
+        if k.lower() == "authorization":
+            sanitized_headers[k] = "********"
+        else:
+            sanitized_headers[k] = v
+
+    return build_fields(sanitized_headers)
+
+
+def sanitize_headers() -> dict[str, Any]:
+    return build_fields(RequestLogMiddleware.sanitize_headers(HEADERS))
+
+
+def sanitize_headers_and_redact_fields(redactor: Redactor) -> Callable[[], dict[str, Any]]:
+    return lambda: redactor.redact(sanitize_headers())
+
+
+def measure_nanoseconds_per_record(redact: Callable[[], dict[str, Any]], records: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(records):
+        redact()
+
+    return (time.perf_counter_ns() - start) / records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=200000, help="Records per measurement")
+    args = parser.parse_args()
+
+    redactor = Redactor(RedactionPolicy())
+    assert sanitize_headers_and_redact_fields(redactor)()["body"]["password"] == "********"
+
+    scenarios: dict[str, Callable[[], dict[str, Any]]] = {
+        "before (headers, loop)": sanitize_headers_with_loop,
+        "headers (comprehension)": sanitize_headers,
+        "headers and all fields": sanitize_headers_and_redact_fields(redactor),
+    }
+    for name, redact in scenarios.items():
+        nanoseconds = measure_nanoseconds_per_record(redact, args.records)
+        print(f"{name + ':':<30} {nanoseconds:10.0f} ns/record")
+
+
+if __name__ == "__main__":
+    main()
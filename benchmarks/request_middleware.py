@@ -0,0 +1,73 @@
+"""
+Benchmark the per-request cost of Service-Kit's request middleware
+
+Requests are sent directly to the ASGI application rendered from `template_service.py`, so no
+network or HTTP client overhead is included in the results. The "before" application runs the
+`BaseHTTPMiddleware`-based request ID and request log middleware that Service-Kit previously
+shipped.
+
+Usage:
+    python -m benchmarks.request_middleware [--requests N]
+"""
+
+import argparse
+
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from service_kit.api import RequestIDMiddleware, RequestLogMiddleware
+from service_kit.logging import logger
+
+from .utils import (
+    configure_null_logger,
+    http_scope,
+    load_template_service,
+    measure_requests_per_second,
+)
+
+
+class LegacyRequestIDMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        request.state.id = RequestIDMiddleware._generate_request_id()
+        return await call_next(request)
+
+
+class LegacyRequestLogMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        with logger.contextualize(request_id=request.state.id):
+            await RequestLogMiddleware.log_request(request)
+            response = await call_next(request)
+            await RequestLogMiddleware.log_response(response.status_code, response.headers)
+
+        return response
+
+
+def _replace_middleware(app, old_cls, new_cls):
+    for middleware in app.user_middleware:
+        if middleware.cls is old_cls:
+            middleware.cls = new_cls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=10000, help="Requests per measurement")
+    args = parser.parse_args()
+
+    configure_null_logger()
+    scope = http_scope("POST", "/echo/benchmark")
+
+    before = load_template_service("benchmark_service_before").app
+    _replace_middleware(before, RequestIDMiddleware, LegacyRequestIDMiddleware)
+    _replace_middleware(before, RequestLogMiddleware, LegacyRequestLogMiddleware)
+    after = load_template_service("benchmark_service_after").app
+
+    before_rps = measure_requests_per_second(before, scope, args.requests)
+    after_rps = measure_requests_per_second(after, scope, args.requests)
+
+    print(f"before (BaseHTTPMiddleware): {before_rps:10.0f} requests/sec")
+    print(f"after (ASGI middleware):     {after_rps:10.0f} requests/sec")
+    print(f"speedup:                     {after_rps / before_rps:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark the per-record cost of building the fields of a log record
+
+The fields of a typical "Request received" record are built with the serializer's current
+implementation and with the implementation that Service-Kit previously shipped, which formatted the
+whole timestamp with `strftime()` for every record. End-to-end throughput of `logger.info()` with a
+sink that serializes records but doesn't write them is reported as well.
+
+Usage:
+    python -m benchmarks.serializer [--records N]
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from typing import Any
+
+from service_kit.logging import logger
+from service_kit.logging._logger import serializer
+
+from .json_encoding import REQUEST_LOG_RECORD
+from .utils import configure_null_logger
+
+EXTRA_FIELDS = {
+    key: value
+    for key, value in REQUEST_LOG_RECORD.items()
+    if key not in ("timestamp", "level", "module", "file", "function", "message")
+}
+
+
+def legacy_build_subset(record_fields: tuple, extra: dict[str, Any]) -> dict[str, Any]:
+    time, level, module, file, function, message = record_fields
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S:%f %z"),
+        "level": level,
+        "module": module,
+        "file": file,
+        "function": function,
+        "message": message,
+        **extra,
+    }
+
+
+def capture_record_fields() -> tuple:
+    captured = []
+    handler_id = logger.add(lambda message: captured.append(message.record["extra"]), level=0)
+    try:
+        logger.info("Request received", **EXTRA_FIELDS)
+    finally:
+        logger.remove(handler_id)
+
+    return captured[0]._record_fields
+
+
+def measure_nanoseconds_per_record(
+    build_subset: Callable[[tuple, dict[str, Any]], dict[str, Any]],
+    record_fields: tuple,
+    records: int,
+) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(records):
+        build_subset(record_fields, EXTRA_FIELDS)
+
+    return (time.perf_counter_ns() - start) / records
+
+
+def measure_records_per_second(records: int) -> float:
+    start = time.perf_counter()
+    for _ in range(records):
+        logger.info("Request received", **EXTRA_FIELDS)
+
+    return records / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=200000, help="Records per measurement")
+    args = parser.parse_args()
+
+    configure_null_logger()
+    record_fields = capture_record_fields()
+
+    before = measure_nanoseconds_per_record(legacy_build_subset, record_fields, args.records)
+    after = measure_nanoseconds_per_record(serializer._build_subset, record_fields, args.records)
+    print(f"{'before (build fields):':<30} {before:10.0f} ns/record")
+    print(f"{'after (build fields):':<30} {after:10.0f} ns/record")
+    print(f"{'speedup:':<30} {before / after:10.2f}x")
+
+    records_per_second = measure_records_per_second(args.records // 4)
+    print(f"{'logger.info() end to end:':<30} {records_per_second:10.0f} records/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import asyncio
+import importlib.util
+import time
+from collections.abc import Callable
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from types import ModuleType
+from typing import Any, Final
+
+import jinja2
+
+from service_kit.logging import LogLevel, configure_logger, logger
+
+TEMPLATE_SERVICE_PATH: Final[Path] = Path(__file__).parent.parent / "template_service.py"
+
+
+def load_template_service(module_name: str = "benchmark_service") -> ModuleType:
+    """
+    Render `template_service.py` with its default endpoint and load it as a module
+
+    :param module_name: The name to give the rendered module
+    :return: The loaded module. Its `app` attribute is the service's FastAPI instance.
+    """
+    environment = jinja2.Environment()
+    template = environment.from_string(TEMPLATE_SERVICE_PATH.read_text())
+    source = template.render(
+        endpoints=None, module=module_name, package=None, project_name="benchmark"
+    )
+
+    with TemporaryDirectory() as tmp_dir:
+        module_path = Path(tmp_dir) / f"{module_name}.py"
+        module_path.write_text(source)
+
+        spec = importlib.util.spec_from_file_location(module_name, module_path)
+        module = importlib.util.module_from_spec(spec)  # type: ignore[arg-type]
+        spec.loader.exec_module(module)  # type: ignore[union-attr]
+
+    return module
+
+
+def configure_null_logger(
+    log_level: LogLevel = LogLevel.INFO, sink: Callable[[str], Any] = lambda _: None, **kwargs: Any
+):
+    """
+    Configure the logger so that records are fully serialized but never written anywhere
+
+    :param log_level: The minimum severity level of records that will be serialized
+    :param sink: A callable that is passed each serialized record (default: discard the records)
+    :param kwargs: Additional parameters to pass to configure_logger()
+    """
+    configure_logger(log_level, None, pretty_print_logs=False, **kwargs)
+    logger.remove()
+    logger.add(sink, level=log_level, format="{extra[serialized]}")
+
+
+def http_scope(method: str, path: str, query_string: bytes = b"") -> dict[str, Any]:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query_string,
+        "root_path": "",
+        "headers": [
+            (b"host", b"127.0.0.1:8080"),
+            (b"user-agent", b"service-kit-benchmark"),
+            (b"authorization", b"Bearer secret"),
+        ],
+        "client": ("127.0.0.1", 54321),
+        "server": ("127.0.0.1", 8080),
+    }
+
+
+async def call_asgi_app(app: Callable, scope: dict[str, Any]) -> int:
+    """
+    Send one request to an ASGI application without any network or HTTP client overhead
+
+    :param app: The ASGI application
+    :param scope: The request's ASGI scope
+    :return: The status code of the response
+    """
+    status_code = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+
+    await app(dict(scope), receive, send)
+
+    return status_code
+
+
+def measure_requests_per_second(
+    app: Callable, scope: dict[str, Any], requests: int, warmup: int = 500
+) -> float:
+    async def run() -> float:
+        for _ in range(warmup):
+            await call_asgi_app(app, scope)
+
+        start = time.perf_counter()
+        for _ in range(requests):
+            await call_asgi_app(app, scope)
+
+        return requests / (time.perf_counter() - start)
+
+    return asyncio.run(run())
@@ -1,10 +1,9 @@
+import importlib.util
+
+
 def require_extra(extra_name: str, deps: list[str]) -> None:
-    missing = []
-    for dep in deps:
-        try:
-            __import__(dep)
-        except ImportError:
-            missing.append(dep)
+    # The dependencies are only found, rather than imported, so that checking them is cheap
+    missing = [dep for dep in deps if importlib.util.find_spec(dep) is None]
     if missing:
         raise ImportError(
             f"The '{extra_name}' extra is required in order to use '{__package__}'. "
@@ -26,6 +25,7 @@ from .responses import (
     UnauthorizedResponse as UnauthorizedResponse,
     get_standard_responses as get_standard_responses,
 )
+from .prerendered_responses import PrerenderedErrorResponse as PrerenderedErrorResponse
 from .error_handling import (
     default_error_handler_middleware as default_error_handler_middleware,
     handle_basic_error as handle_basic_error,
@@ -1,16 +1,35 @@
+import importlib.util
+import logging
+import multiprocessing.connection
+import signal
+import socket
+import sys
 from collections.abc import Mapping
 from pathlib import Path
 from types import MappingProxyType as ImmutableMapping
-from typing import Any
+from typing import TYPE_CHECKING, Any, Final
 
-import uvicorn
 from fastapi import FastAPI
 
-from service_kit.configuration import ServiceConfiguration
-from service_kit.logging import SecurityRisk, configure_logger, logger
+from service_kit.configuration import EventLoop, HTTPProtocol, ServiceConfiguration
+from service_kit.logging import (
+    InterceptHandler,
+    SecurityRisk,
+    configure_logger,
+    logger,
+    start_log_aggregator,
+)
 
 from . import RequestLogMiddleware
 
+if TYPE_CHECKING:
+    import uvicorn
+
+UVICORN_LOGGERS: Final = ("uvicorn", "uvicorn.access", "uvicorn.asgi", "uvicorn.error")
+
+# The configuration that this process's logger was last configured with by _configure_logger()
+_logger_config: ServiceConfiguration | None = None
+
 
 async def bootstrap_logging(
     app: FastAPI, config: ServiceConfiguration, extra: Mapping[str, Any] = ImmutableMapping({})
@@ -18,11 +37,16 @@ async def bootstrap_logging(
     """
     Configures the logger and log-related middleware for the API
 
+    .. note::
+        Processes started by `launch_uvicorn()` have already configured the logger. If the
+        configuration hasn't changed since, only the extra fields are bound, so that the process
+        keeps writing to the same log file.
+
     :param app: The server's FastAPI instance
     :param config: The server's configuration
     :param extra: A mapping containing any extra fields that should be bound to the logger.
     """
-    configure_logger(config.log_level, config.log_directory, config.pretty_print_logs, extra=extra)
+    _configure_logger(config, extra)
     logger.info("Logger configured.")
     logger.info("Service configuration", config=config)
 
@@ -42,21 +66,220 @@ def launch_uvicorn(project_name: str, entrypoint: str, config: ServiceConfigurat
     """
     Launch the uvicorn server
 
+    The server is tuned with the `server_*` fields of the configuration, and runs `workers`
+    processes. uvloop and httptools are used if they're installed, unless another event loop or
+    HTTP protocol is configured. Each process configures the logger from the configuration as soon
+    as it starts, so that uvicorn's own log records are in the service's format.
+
+    .. note::
+        If `server_reuse_port` is set, each worker binds its own socket with SO_REUSEPORT, and the
+        kernel balances the incoming connections between them, instead of the workers competing to
+        accept connections from a single shared socket. Unlike uvicorn's own supervisor, a worker
+        that dies is not restarted; if one does, the server shuts down.
+
     :param project_name: The name of the project, used primarily for logging
     :param entrypoint: A string to pass to uvicorn that defines the entrypoint.
                        Example: "my_package.my_module.app"
     :param config: The server's configuration
     """
+    # uvicorn is only imported by the process that launches the server, since importing it is slow
+    import uvicorn
+
     logger.info(f"Starting {project_name}...")
-    uvicorn.run(
-        entrypoint,
-        host=str(config.bind_address),
-        port=config.port,
-        reload=config.enable_hot_reload,
-        ssl_keyfile=_get_path_str(config.ssl_keyfile),
-        ssl_certfile=_get_path_str(config.ssl_certfile),
+
+    log_aggregator = None
+    if config.log_aggregator_socket is not None and config.log_directory is not None:
+        log_aggregator = start_log_aggregator(
+            config.log_aggregator_socket,
+            config.log_directory,
+            log_file_max_size=config.log_file_max_size,
+            log_file_retention_count=config.log_file_retention_count,
+            log_file_retention_age=config.log_file_retention_age,
+            log_file_compression=config.log_file_compression,
+            log_file_buffer_size=config.log_file_buffer_size,
+            log_file_flush_interval=config.log_file_flush_interval,
+            log_file_fsync_policy=config.log_file_fsync_policy,
+        )
+
+    server_options = _get_server_options(config)
+    logger.info(
+        "Server options",
+        workers=config.workers,
+        event_loop=server_options["loop"],
+        http_protocol=server_options["http"],
+        reuse_port=config.server_reuse_port and not config.enable_hot_reload,
     )
 
+    try:
+        if config.server_reuse_port and not config.enable_hot_reload:
+            _run_reuse_port_workers(uvicorn.Config(entrypoint, **server_options))
+        else:
+            uvicorn.run(entrypoint, **server_options)
+    finally:
+        if log_aggregator is not None:
+            # uvicorn configured this process to send its records to the aggregator, too. They're
+            # only written to stderr from now on, so that nothing is sent to the aggregator once it
+            # stops, and this process doesn't start a log file of its own.
+            _configure_logger(config.model_copy(update={"log_directory": None}))
+            log_aggregator.stop()
+
+
+def _get_server_options(config: ServiceConfiguration) -> dict[str, Any]:
+    return {
+        "host": str(config.bind_address),
+        "port": config.port,
+        "reload": config.enable_hot_reload,
+        "workers": config.workers,
+        "loop": _resolve_event_loop(config.server_event_loop),
+        "http": _resolve_http_protocol(config.server_http_protocol),
+        "backlog": config.server_backlog,
+        "limit_concurrency": config.server_limit_concurrency,
+        "timeout_keep_alive": config.server_keep_alive_timeout,
+        "ssl_keyfile": _get_path_str(config.ssl_keyfile),
+        "ssl_certfile": _get_path_str(config.ssl_certfile),
+        "log_config": _get_log_config(config),
+    }
+
+
+def _resolve_event_loop(event_loop: EventLoop) -> str:
+    if event_loop != EventLoop.AUTO:
+        return event_loop.value
+
+    # uvloop doesn't support Windows
+    if sys.platform != "win32" and importlib.util.find_spec("uvloop") is not None:
+        return EventLoop.UVLOOP.value
+
+    return EventLoop.ASYNCIO.value
+
+
+def _resolve_http_protocol(http_protocol: HTTPProtocol) -> str:
+    if http_protocol != HTTPProtocol.AUTO:
+        return http_protocol.value
+
+    if importlib.util.find_spec("httptools") is not None:
+        return HTTPProtocol.HTTPTOOLS.value
+
+    return HTTPProtocol.H11.value
+
+
+def _get_log_config(config: ServiceConfiguration) -> dict[str, Any]:
+    # uvicorn applies this with logging.config.dictConfig() in every process that it starts,
+    # including each worker, before the service's app is imported.
+    return {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "handlers": {"service_kit": {"()": _configure_process_logging, "config": config}},
+        "loggers": {
+            name: {"handlers": ["service_kit"], "propagate": False} for name in UVICORN_LOGGERS
+        },
+    }
+
+
+def _configure_process_logging(config: ServiceConfiguration) -> logging.Handler:
+    _configure_logger(config)
+
+    return InterceptHandler(config.structured_access_logs)
+
+
+def _configure_logger(
+    config: ServiceConfiguration, extra: Mapping[str, Any] = ImmutableMapping({})
+):
+    global _logger_config
+
+    # Reconfiguring the logger would start a new log file
+    if config == _logger_config:
+        logger.configure(extra=dict(extra))
+        return
+
+    configure_logger(
+        config.log_level,
+        config.log_directory,
+        config.pretty_print_logs,
+        extra=extra,
+        queue_size=config.log_queue_size,
+        queue_overflow_policy=config.log_queue_overflow_policy,
+        json_encoder=config.log_json_encoder,
+        sampling_rules=config.log_sampling_rules,
+        rate_limit=config.log_rate_limit,
+        suppression_summary_interval=config.log_suppression_summary_interval,
+        structured_access_logs=config.structured_access_logs,
+        log_file_max_size=config.log_file_max_size,
+        log_file_retention_count=config.log_file_retention_count,
+        log_file_retention_age=config.log_file_retention_age,
+        log_file_compression=config.log_file_compression,
+        log_file_index=config.log_file_index,
+        log_file_buffer_size=config.log_file_buffer_size,
+        log_file_flush_interval=config.log_file_flush_interval,
+        log_file_fsync_policy=config.log_file_fsync_policy,
+        log_aggregator_socket=config.log_aggregator_socket,
+        flight_recorder_level=config.log_flight_recorder_level,
+        flight_recorder_capacity=config.log_flight_recorder_capacity,
+        redaction_policy=config.log_redaction_policy,
+        error_deduplication_window=config.log_error_deduplication_window,
+    )
+    _logger_config = config.model_copy()
+
+
+def _run_reuse_port_workers(uvicorn_config: "uvicorn.Config"):
+    if uvicorn_config.workers == 1:
+        _serve_on_reuse_port_socket(uvicorn_config)
+        return
+
+    # Like uvicorn's own supervisor, the workers are spawned rather than forked, so that they don't
+    # inherit the launching process's threads (e.g. the log aggregator's)
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=_run_reuse_port_worker, args=(uvicorn_config,))
+        for _ in range(uvicorn_config.workers)
+    ]
+    for worker in workers:
+        worker.start()
+
+    # SIGTERM would otherwise kill this process without stopping the workers
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        # The server shuts down as soon as any of the workers exits
+        multiprocessing.connection.wait([worker.sentinel for worker in workers])
+    except KeyboardInterrupt:
+        # The workers received the SIGINT too, and are shutting down gracefully
+        pass
+    finally:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.join()
+
+
+def _run_reuse_port_worker(uvicorn_config: "uvicorn.Config"):
+    uvicorn_config.configure_logging()
+    _serve_on_reuse_port_socket(uvicorn_config)
+
+
+def _serve_on_reuse_port_socket(uvicorn_config: "uvicorn.Config"):
+    import uvicorn
+
+    # Sockets bound with SO_REUSEPORT can listen on the same port, and the kernel balances the
+    # incoming connections between them
+    sock = _bind_reuse_port_socket(uvicorn_config.host, uvicorn_config.port)
+    uvicorn.Server(uvicorn_config).run(sockets=[sock])
+
+
+def _bind_reuse_port_socket(host: str, port: int) -> socket.socket:
+    if not hasattr(socket, "SO_REUSEPORT"):
+        raise OSError("SO_REUSEPORT is not supported on this platform")
+
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind((host, port))
+    except OSError:
+        sock.close()
+        raise
+
+    return sock
+
 
 def _get_path_str(path: Path | None) -> str | None:
     if path:
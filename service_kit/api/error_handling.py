@@ -1,3 +1,4 @@
+from functools import lru_cache
 from http import HTTPStatus
 from typing import Any, Callable, Type
 
@@ -7,7 +8,14 @@ from fastapi.responses import JSONResponse
 from service_kit.errors import StructuredError
 from service_kit.logging import log_basic_error, log_structured_error
 
-from . import APIResponse, InternalServerErrorResponse, UnauthorizedResponse
+from . import (
+    APIResponse,
+    InternalServerErrorResponse,
+    PrerenderedErrorResponse,
+    UnauthorizedResponse,
+)
+
+_UNAUTHORIZED_RESPONSE = PrerenderedErrorResponse(UnauthorizedResponse, HTTPStatus.UNAUTHORIZED)
 
 
 def register_authentication_error_handler(app: FastAPI):
@@ -28,10 +36,7 @@ def register_authentication_error_handler(app: FastAPI):
     @app.exception_handler(HTTPStatus.FORBIDDEN)
     @app.exception_handler(HTTPStatus.UNAUTHORIZED)
     async def handle_forbidden_error(request: Request, exc: HTTPStatus):
-        return JSONResponse(
-            status_code=HTTPStatus.UNAUTHORIZED,
-            content=UnauthorizedResponse(request_id=request.state.id).model_dump(),
-        )
+        return _UNAUTHORIZED_RESPONSE.render(request.state.id)
 
 
 def register_timeout_error_handler(app: FastAPI):
@@ -94,14 +99,25 @@ def handle_basic_error(
 ):
     log_basic_error(error)
 
-    error_message = message if message else str(error)
+    if message:
+        # A fixed message, e.g. for timeouts, so the response body can be rendered in advance
+        return _get_prerendered_response(response_type, status_code, message).render(
+            request.state.id
+        )
 
     return JSONResponse(
         status_code=status_code,
-        content=response_type(request_id=request.state.id, message=error_message).model_dump(),
+        content=response_type(request_id=request.state.id, message=str(error)).model_dump(),
     )
 
 
+@lru_cache(maxsize=128)
+def _get_prerendered_response(
+    response_type: Type[APIResponse], status_code: HTTPStatus, message: str
+) -> PrerenderedErrorResponse:
+    return PrerenderedErrorResponse(response_type, status_code, message)
+
+
 def handle_structured_error(
     request: Request,
     error: StructuredError,
@@ -1,7 +1,8 @@
-from typing import Callable
+import re
+from typing import Final
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from . import RequestID
 
@@ -21,12 +22,89 @@ except ImportError:
         return str(ULID())
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Response]
-    ) -> Response:
-        request.state.id = self._generate_request_id()
-        return await call_next(request)
+REQUEST_ID_HEADER: Final[str] = "X-Request-ID"
+
+# Inbound request IDs are logged and returned to callers, so only short, printable IDs are accepted.
+_VALID_REQUEST_ID: Final[re.Pattern] = re.compile(r"[A-Za-z0-9._:-]{1,128}")
+# https://www.w3.org/TR/trace-context/#traceparent-header-field-values
+_VALID_TRACEPARENT: Final[re.Pattern] = re.compile(
+    r"(?!ff)[0-9a-f]{2}-(?!0{32})([0-9a-f]{32})-(?!0{16})[0-9a-f]{16}-[0-9a-f]{2}(-.*)?"
+)
+
+
+class RequestIDMiddleware:
+    """
+    An ASGI middleware that assigns an ID to every HTTP request
+
+    The ID is stored in `request.state.id`.
+
+    :param app: The ASGI application to wrap
+    :param trust_inbound_request_id: If True, reuse a valid ID sent by the caller in the
+                                     `X-Request-ID` header or, failing that, the trace ID in a
+                                     W3C `traceparent` header, instead of generating a new one.
+                                     Only enable this if the callers are trusted (default: False)
+    :param response_header: The name of the response header in which the request ID is returned
+                            to the caller, or None to not return the ID (default: "X-Request-ID")
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        trust_inbound_request_id: bool = False,
+        response_header: str | None = REQUEST_ID_HEADER,
+    ):
+        self.app = app
+        self._trust_inbound_request_id = trust_inbound_request_id
+        self._response_header = response_header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        if self._trust_inbound_request_id:
+            request_id = self._get_inbound_request_id(scope)
+        if request_id is None:
+            request_id = self._generate_request_id()
+
+        scope.setdefault("state", {})["id"] = request_id
+
+        if self._response_header is None:
+            await self.app(scope, receive, send)
+            return
+
+        response_header = self._response_header
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[response_header] = request_id
+
+            await send(message)
+
+        await self.app(scope, receive, send_with_request_id)
+
+    @staticmethod
+    def _get_inbound_request_id(scope: Scope) -> RequestID | None:
+        request_id = None
+        traceparent = None
+
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+            elif name == b"traceparent":
+                traceparent = value.decode("latin-1")
+
+        if request_id is not None and _VALID_REQUEST_ID.fullmatch(request_id):
+            return request_id
+
+        if traceparent is not None:
+            match = _VALID_TRACEPARENT.fullmatch(traceparent)
+            if match:
+                return match.group(1)
+
+        return None
 
     @staticmethod
     def _generate_request_id() -> RequestID:
@@ -1,22 +1,77 @@
 import json
+from typing import Final
 
-from fastapi import Request, Response
 from starlette.datastructures import Headers
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from service_kit.logging import logger
+from service_kit.logging import discard_flight_recording, logger
 
+# Headers whose values are always replaced, regardless of the logger's redaction policy
+_SENSITIVE_HEADERS: Final = frozenset({"authorization", "cookie", "set-cookie"})
+
+
+class RequestLogMiddleware:
+    """
+    An ASGI middleware that logs every HTTP request and response
+
+    This is implemented as a raw ASGI middleware rather than a Starlette
+    `BaseHTTPMiddleware`. This avoids the extra task and memory stream that
+    `BaseHTTPMiddleware` adds to every request, and it does not wrap streaming
+    responses.
+
+    When a request ends, the records that the flight recorder kept for it are
+    discarded (see `logging.configure_logger()`).
+    """
 
-class RequestLogMiddleware(BaseHTTPMiddleware):
     debug: bool = False
 
-    async def dispatch(self, request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope, receive)
+
         with logger.contextualize(request_id=request.state.id):
+            if self.debug:
+                receive = await RequestLogMiddleware._buffer_request_body(request, receive)
+
             await RequestLogMiddleware.log_request(request)
-            response = await call_next(request)
-            await RequestLogMiddleware.log_response(response)
 
-        return response
+            async def send_and_log_response(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    await RequestLogMiddleware.log_response(
+                        message["status"], Headers(raw=message.get("headers", []))
+                    )
+
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_and_log_response)
+            finally:
+                discard_flight_recording(request.state.id)
+
+    @staticmethod
+    async def _buffer_request_body(request: Request, receive: Receive) -> Receive:
+        # Reading the body consumes the request's messages. They must be replayed so that the
+        # application can also read the body.
+        body = await request.body()
+        body_replayed = False
+
+        async def replay_request_body() -> Message:
+            nonlocal body_replayed
+
+            if body_replayed:
+                return await receive()
+
+            body_replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        return replay_request_body
 
     @classmethod
     async def log_request(cls, request: Request) -> None:
@@ -28,8 +83,6 @@ class RequestLogMiddleware(BaseHTTPMiddleware):
             "url": str(request.url),
         }
 
-        sanitized_headers = RequestLogMiddleware.sanitize_headers(request.headers)
-
         if cls.debug:
             try:
                 request_body = await request.json()
@@ -39,29 +92,21 @@ class RequestLogMiddleware(BaseHTTPMiddleware):
             logger.debug(
                 "Request received",
                 **common_request_fields,
-                headers=sanitized_headers,
+                headers=RequestLogMiddleware.sanitize_headers(request.headers),
                 body=request_body,
             )
         logger.info("Request received", **common_request_fields)
 
     @staticmethod
     def sanitize_headers(headers: Headers) -> dict[str, str]:
-        sanitized_headers = {}
-
-        for k, v in headers.items():
-            if k.lower() == "authorization":
-                sanitized_headers[k] = "********"
-            else:
-                sanitized_headers[k] = v
-
-        return sanitized_headers
+        return {k: "********" if k.lower() in _SENSITIVE_HEADERS else v for k, v in headers.items()}
 
     @classmethod
-    async def log_response(cls, response: Response):
+    async def log_response(cls, status_code: int, headers: Headers):
         if cls.debug:
             logger.debug(
                 "Sending response",
-                headers=dict(response.headers),
-                status_code=response.status_code,
+                headers=RequestLogMiddleware.sanitize_headers(headers),
+                status_code=status_code,
             )
-        logger.info("Sending reponse", status_code=response.status_code)
+        logger.info("Sending reponse", status_code=status_code)
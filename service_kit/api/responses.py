@@ -47,28 +47,17 @@ class ForbiddenRequestResponse(APIResponse):
     )
 
 
+# The response models are passed to FastAPI, rather than their schemas, so that the schemas are only
+# generated when the OpenAPI schema is first requested. FastAPI then generates each model's schema
+# once, and all of the routes refer to it.
 _standard_responses: dict[HTTPStatus, dict[str, Type[BaseModel] | dict]] = {
-    HTTPStatus.INTERNAL_SERVER_ERROR: {
-        "content": {"application/json": {"schema": InternalServerErrorResponse.model_json_schema()}}
-    },
-    HTTPStatus.BAD_REQUEST: {
-        "content": {"application/json": {"schema": BadRequestResponse.model_json_schema()}}
-    },
-    HTTPStatus.CONFLICT: {
-        "content": {"application/json": {"schema": ConflictResponse.model_json_schema()}}
-    },
-    HTTPStatus.NOT_FOUND: {
-        "content": {"application/json": {"schema": NotFoundResponse.model_json_schema()}}
-    },
-    HTTPStatus.TOO_MANY_REQUESTS: {
-        "content": {"application/json": {"schema": TooManyRequestsResponse.model_json_schema()}}
-    },
-    HTTPStatus.UNAUTHORIZED: {
-        "content": {"application/json": {"schema": UnauthorizedResponse.model_json_schema()}}
-    },
-    HTTPStatus.FORBIDDEN: {
-        "content": {"application/json": {"schema": ForbiddenRequestResponse.model_json_schema()}}
-    },
+    HTTPStatus.INTERNAL_SERVER_ERROR: {"model": InternalServerErrorResponse},
+    HTTPStatus.BAD_REQUEST: {"model": BadRequestResponse},
+    HTTPStatus.CONFLICT: {"model": ConflictResponse},
+    HTTPStatus.NOT_FOUND: {"model": NotFoundResponse},
+    HTTPStatus.TOO_MANY_REQUESTS: {"model": TooManyRequestsResponse},
+    HTTPStatus.UNAUTHORIZED: {"model": UnauthorizedResponse},
+    HTTPStatus.FORBIDDEN: {"model": ForbiddenRequestResponse},
 }
 
 
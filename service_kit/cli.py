@@ -0,0 +1,110 @@
+import argparse
+import os
+import sys
+from collections.abc import Sequence
+from datetime import datetime
+from pathlib import Path
+
+from service_kit.logging import (
+    GitRepositoryError,
+    LogLevel,
+    LogQuery,
+    query_logs,
+    write_git_status_yaml,
+)
+
+
+def main(argv: Sequence[str] | None = None):
+    """
+    The entry point of the `service-kit` command
+
+    :param argv: The command-line arguments, excluding the program name (default: sys.argv[1:])
+    """
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    args.command(args)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="service-kit")
+    subparsers = parser.add_subparsers(required=True)
+
+    logs_parser = subparsers.add_parser(
+        "logs",
+        help="Find log records in a log directory",
+        description=(
+            "Print the log records in a log directory that match all of the given criteria, in "
+            "the order in which they were logged. Indexed and compressed log files are supported. "
+            "A file is only indexed once it is rotated or its service stops, so the file that is "
+            "currently being written is always read in full."
+        ),
+    )
+    logs_parser.add_argument("log_directory", type=Path, help="The directory of the log files")
+    logs_parser.add_argument("--prefix", help="The prefix of the log files, if any")
+    logs_parser.add_argument("--request-id", help="Only print records with this request ID")
+    logs_parser.add_argument("--error-type", help="Only print records with this error type")
+    logs_parser.add_argument(
+        "--level",
+        type=str.upper,
+        choices=list(LogLevel),
+        help="Only print records at or above this level",
+    )
+    logs_parser.add_argument(
+        "--since",
+        type=datetime.fromisoformat,
+        help="Only print records logged at or after this ISO 8601 time (default timezone: local)",
+    )
+    logs_parser.add_argument(
+        "--until",
+        type=datetime.fromisoformat,
+        help="Only print records logged before this ISO 8601 time (default timezone: local)",
+    )
+    logs_parser.set_defaults(command=_query_logs)
+
+    git_status_parser = subparsers.add_parser(
+        "git-status",
+        help="Write the status of a git repository to a YAML file",
+        description=(
+            "Write the commit, parents, status, and tags of a git repository to a YAML file, which "
+            "log_git_status() can read at startup instead of reading the repository. This is meant "
+            "to be run when the service is built."
+        ),
+    )
+    git_status_parser.add_argument("output", type=Path, help="The YAML file to write")
+    git_status_parser.add_argument(
+        "--repository",
+        type=Path,
+        help="A path in the repository's worktree (default: the current directory)",
+    )
+    git_status_parser.set_defaults(command=_write_git_status)
+
+    return parser
+
+
+def _query_logs(args: argparse.Namespace):
+    if not args.log_directory.is_dir():
+        sys.exit(f"{args.log_directory} is not a directory")
+
+    query = LogQuery(
+        request_id=args.request_id,
+        error_type=args.error_type,
+        min_level=args.level,
+        since=args.since,
+        until=args.until,
+    )
+
+    try:
+        for record in query_logs(args.log_directory, query, args.prefix):
+            print(record)
+    except BrokenPipeError:
+        # The output was piped to a command that exited early, e.g. `head`. Python flushes stdout
+        # on exit, which would fail again, so it's redirected to /dev/null first.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+
+
+def _write_git_status(args: argparse.Namespace):
+    try:
+        write_git_status_yaml(args.output, args.repository)
+    except GitRepositoryError as err:
+        sys.exit(str(err))
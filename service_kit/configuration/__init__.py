@@ -1,5 +1,6 @@
 from .service_configuration import ServiceConfiguration as ServiceConfiguration
 from .feature_flag import FeatureFlag as FeatureFlag
+from .server_options import EventLoop as EventLoop, HTTPProtocol as HTTPProtocol
 from .utils import (
     coerce_to_tuple as coerce_to_tuple,
     parse_comma_separated_sequence as parse_comma_separated_sequence,
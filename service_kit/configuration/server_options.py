@@ -0,0 +1,27 @@
+from enum import StrEnum
+
+
+class EventLoop(StrEnum):
+    """
+    The event loop that uvicorn runs the service on
+    """
+
+    AUTO = "auto"
+    """uvloop if it's installed, otherwise asyncio"""
+    ASYNCIO = "asyncio"
+    """The standard library's event loop"""
+    UVLOOP = "uvloop"
+    """A faster event loop, which requires the uvloop package"""
+
+
+class HTTPProtocol(StrEnum):
+    """
+    The HTTP/1.1 implementation that uvicorn parses requests with
+    """
+
+    AUTO = "auto"
+    """httptools if it's installed, otherwise h11"""
+    H11 = "h11"
+    """A pure-Python implementation"""
+    HTTPTOOLS = "httptools"
+    """A faster implementation, which requires the httptools package"""
@@ -1,12 +1,24 @@
+from datetime import timedelta
 from ipaddress import IPv4Address
 from pathlib import Path
 from typing import Annotated, Self
 
-from pydantic import BeforeValidator, Field, model_validator
+from pydantic import BeforeValidator, ByteSize, Field, PositiveFloat, PositiveInt, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from service_kit import NetworkPort, ServiceKitBaseModel
-from service_kit.logging import LogLevel
+from service_kit.logging import (
+    FsyncPolicy,
+    JSONEncoderType,
+    LogFileCompression,
+    LogLevel,
+    LogRateLimit,
+    LogSamplingRule,
+    OverflowPolicy,
+    RedactionPolicy,
+)
+
+from .server_options import EventLoop, HTTPProtocol
 
 
 class ServiceConfiguration(BaseSettings, ServiceKitBaseModel):
@@ -21,19 +33,161 @@ class ServiceConfiguration(BaseSettings, ServiceKitBaseModel):
     enable_hot_reload: bool = Field(
         default=False, description="Enable hot-reloading during development"
     )
+    log_aggregator_socket: Path | None = Field(
+        default=None,
+        description=(
+            "If set, launch_uvicorn() starts a log aggregator that listens on this Unix socket, "
+            "and the log records of all workers are sent to it and written to one stream of log "
+            "files"
+        ),
+    )
     log_directory: Path | None = Field(
         default=None,
         description="The directory to write log files to (it will be created if it does not exist)",
     )
+    log_error_deduplication_window: PositiveFloat | None = Field(
+        default=None,
+        description=(
+            "If set, the traceback of each distinct error is logged only once per this many "
+            "seconds, and its other occurrences are counted"
+        ),
+    )
+    log_file_buffer_size: ByteSize | None = Field(
+        default=None,
+        description=(
+            "If set, log records are buffered and written to the log file together once this many "
+            'bytes (or a size with a unit, e.g. "64KiB") are buffered, or once the flush interval '
+            "has passed"
+        ),
+    )
+    log_file_compression: LogFileCompression | None = Field(
+        default=None, description="The algorithm used to compress rotated log files"
+    )
+    log_file_flush_interval: PositiveFloat = Field(
+        default=1.0,
+        description=(
+            "The maximum number of seconds that a buffered log record waits before it is written, "
+            'and the interval of the "interval" fsync policy'
+        ),
+    )
+    log_file_fsync_policy: FsyncPolicy = Field(
+        default=FsyncPolicy.NEVER,
+        description="When log records are forced to be persisted to disk",
+    )
+    log_file_index: bool = Field(
+        default=False,
+        description=(
+            "Write an index next to each log file, which speeds up querying the log files with "
+            "`service-kit logs`"
+        ),
+    )
+    log_file_max_size: ByteSize | None = Field(
+        default=None,
+        description=(
+            'The size at which a new log file is started, in bytes or with a unit (e.g. "100MiB"). '
+            "A new log file is also started every day at midnight."
+        ),
+    )
+    log_file_retention_age: timedelta | None = Field(
+        default=None,
+        description="Rotated log files that were last modified longer ago than this are deleted",
+    )
+    log_file_retention_count: PositiveInt | None = Field(
+        default=None, description="The number of rotated log files to keep"
+    )
+    log_flight_recorder_capacity: PositiveInt = Field(
+        default=100, description="The maximum number of log records kept per request"
+    )
+    log_flight_recorder_level: Annotated[
+        LogLevel | None, BeforeValidator(lambda v: v.upper() if isinstance(v, str) else v)
+    ] = Field(
+        default=None,
+        description=(
+            "If set, each request's log records at or above this level but below the log level "
+            "are kept in memory, and only written if the request logs an error"
+        ),
+    )
+    log_json_encoder: JSONEncoderType = Field(
+        default=JSONEncoderType.STDLIB, description="The JSON encoder used to serialize log records"
+    )
     log_level: Annotated[
         LogLevel, BeforeValidator(lambda v: v.upper() if isinstance(v, str) else v)
     ] = Field(default=LogLevel.INFO, description="The log level to use")
+    log_queue_overflow_policy: OverflowPolicy = Field(
+        default=OverflowPolicy.BLOCK,
+        description="What to do with new log records when the log queue is full",
+    )
+    log_queue_size: PositiveInt | None = Field(
+        default=None,
+        description=(
+            "If set, log records are queued and written by a background thread so that logging "
+            "never blocks on I/O"
+        ),
+    )
+    log_rate_limit: LogRateLimit | None = Field(
+        default=None, description="A rate limit for log records, per call site or per message"
+    )
+    log_redaction_policy: RedactionPolicy | None = Field(
+        default=None,
+        description="If set, the policy used to redact secrets from all fields of log records",
+    )
+    log_sampling_rules: tuple[LogSamplingRule, ...] = Field(
+        default=(), description="Rules that keep only one in every N matching log records"
+    )
+    log_suppression_summary_interval: PositiveFloat = Field(
+        default=60.0,
+        description=(
+            "The minimum number of seconds between summaries of log records that were suppressed "
+            "by sampling or rate limiting"
+        ),
+    )
     port: NetworkPort = Field(default=NetworkPort(8080), description="The port to listen on")
     pretty_print_logs: bool = Field(default=True, description="Enable pretty-printing of JSON logs")
+    server_backlog: PositiveInt = Field(
+        default=2048, description="The maximum number of connections waiting to be accepted"
+    )
+    server_event_loop: EventLoop = Field(
+        default=EventLoop.AUTO, description="The event loop that the server runs on"
+    )
+    server_http_protocol: HTTPProtocol = Field(
+        default=HTTPProtocol.AUTO, description="The implementation used to parse HTTP requests"
+    )
+    server_keep_alive_timeout: PositiveInt = Field(
+        default=5,
+        description="The number of seconds to keep an idle connection open before closing it",
+    )
+    server_limit_concurrency: PositiveInt | None = Field(
+        default=None,
+        description=(
+            "If set, the maximum number of concurrent connections and tasks per worker. Requests "
+            "beyond it are answered with a 503 response."
+        ),
+    )
+    server_reuse_port: bool = Field(
+        default=False,
+        description=(
+            "Bind a separate SO_REUSEPORT socket in each worker, so that the kernel balances "
+            "connections between them (Linux and BSD only, ignored when hot-reloading)"
+        ),
+    )
     ssl_certfile: Path | None = Field(
         default=None, description="The path to the SSL certificate file"
     )
     ssl_keyfile: Path | None = Field(default=None, description="The path to the SSL key file")
+    startup_time_budget: PositiveFloat | None = Field(
+        default=None,
+        description=(
+            "If set, the maximum number of seconds that the service may take to become ready. If "
+            "it takes longer, the service fails to start."
+        ),
+    )
+    structured_access_logs: bool = Field(
+        default=False,
+        description=(
+            "Log uvicorn's access log records with structured fields instead of a formatted message"
+        ),
+    )
+    workers: PositiveInt = Field(default=1, description="The number of uvicorn worker processes")
 
     @model_validator(mode="after")
     def override_log_level_on_debug(self) -> Self:
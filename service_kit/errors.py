@@ -1,4 +1,5 @@
-from copy import deepcopy
+from collections.abc import Mapping
+from types import MappingProxyType as ImmutableMapping
 from typing import Any
 
 
@@ -27,7 +28,7 @@ class StructuredError(Exception):
         >>> err.attr2
         'a2'
         >>> err.structured_error
-        {'attr1': 'a1', 'attr2': 'a2', 'message': 'my message'}
+        mappingproxy({'attr1': 'a1', 'attr2': 'a2', 'message': 'my message'})
 
     """
 
@@ -43,6 +44,12 @@ class StructuredError(Exception):
             raise AttributeError(name)
 
     @property
-    def structured_error(self) -> dict[str, Any]:
-        """A structured representation of the error"""
-        return deepcopy(self._attributes)
+    def structured_error(self) -> Mapping[str, Any]:
+        """
+        A structured representation of the error
+
+        This is a read-only view of the error's attributes, so accessing it doesn't copy them. The
+        attributes' values aren't copied either, and must not be modified. Use `dict()` (or
+        `copy.deepcopy()`, if nested values are modified) to get a mutable copy.
+        """
+        return ImmutableMapping(self._attributes)
@@ -1,10 +1,54 @@
 from .log_level import LogLevel as LogLevel
 from .security_risk import SecurityRisk as SecurityRisk
+from .log_index import LogSegmentIndex as LogSegmentIndex
+from .file_sink import (
+    FileSink as FileSink,
+    FsyncPolicy as FsyncPolicy,
+    LogFileCompression as LogFileCompression,
+)
+from .log_query import LogQuery as LogQuery, query_logs as query_logs
+from .error_fingerprints import (
+    ErrorDeduplicator as ErrorDeduplicator,
+    fingerprint_error as fingerprint_error,
+)
+from .flight_recorder import FlightRecorder as FlightRecorder
+from .log_aggregation import AggregatingSink as AggregatingSink, LogAggregator as LogAggregator
+from .json_colorizers import (
+    JSONColorizer as JSONColorizer,
+    JSONColorizerType as JSONColorizerType,
+    create_json_colorizer as create_json_colorizer,
+)
+from .json_encoders import (
+    JSONEncoder as JSONEncoder,
+    JSONEncoderType as JSONEncoderType,
+    create_json_encoder as create_json_encoder,
+)
+from .log_limiter import (
+    LogLimiter as LogLimiter,
+    LogRateLimit as LogRateLimit,
+    LogSamplingRule as LogSamplingRule,
+    RateLimitKey as RateLimitKey,
+)
+from .redaction import (
+    DEFAULT_REDACTED_KEYS as DEFAULT_REDACTED_KEYS,
+    RedactionPolicy as RedactionPolicy,
+    Redactor as Redactor,
+)
+from .queued_sink import (
+    OverflowPolicy as OverflowPolicy,
+    QueuedSink as QueuedSink,
+    QueuedSinkStatistics as QueuedSinkStatistics,
+)
 from ._logger import (
+    InterceptHandler as InterceptHandler,
     configure_logger as configure_logger,
+    count_error_occurrence as count_error_occurrence,
+    discard_flight_recording as discard_flight_recording,
+    get_log_queue_statistics as get_log_queue_statistics,
     intercept_preconfigured_loggers as intercept_preconfigured_loggers,
     intercept_uvicorn_loggers as intercept_uvicorn_loggers,
     logger as logger,
+    start_log_aggregator as start_log_aggregator,
 )
 from .error_logging import (
     log_basic_error as log_basic_error,
@@ -12,8 +56,20 @@ from .error_logging import (
     log_postgres_error as log_postgres_error,
     log_structured_error as log_structured_error,
 )
+from .git_repository import (
+    GitRepository as GitRepository,
+    GitRepositoryError as GitRepositoryError,
+)
 from .startup import (
+    GitStatus as GitStatus,
+    get_git_status as get_git_status,
     log_git_status as log_git_status,
     log_python_version as log_python_version,
     log_startup_information as log_startup_information,
+    write_git_status_yaml as write_git_status_yaml,
+)
+from .startup_profiler import (
+    StartupBudgetExceededError as StartupBudgetExceededError,
+    StartupProfiler as StartupProfiler,
+    startup_profiler as startup_profiler,
 )
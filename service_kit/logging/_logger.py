@@ -1,97 +1,302 @@
 from __future__ import annotations
 
-import inspect
-import json
+import functools
+import importlib.util
 import logging
-import os
 import sys
-from collections.abc import Iterable, Mapping
-from contextlib import suppress
+import threading
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from datetime import datetime, timedelta
 from pathlib import Path
 from types import MappingProxyType as ImmutableMapping
 from typing import Any
 
 import loguru
 from loguru import logger as _logger
-from pygments import highlight
-from pygments.formatters import TerminalTrueColorFormatter
-from pygments.lexers import JsonLexer
 
 from service_kit import ServiceKitBaseModel
 
-from . import LogLevel
+from . import (
+    AggregatingSink,
+    ErrorDeduplicator,
+    FileSink,
+    FlightRecorder,
+    FsyncPolicy,
+    JSONColorizerType,
+    JSONEncoder,
+    JSONEncoderType,
+    LogAggregator,
+    LogFileCompression,
+    LogLevel,
+    LogLimiter,
+    LogRateLimit,
+    LogSamplingRule,
+    OverflowPolicy,
+    QueuedSink,
+    QueuedSinkStatistics,
+    RedactionPolicy,
+    Redactor,
+    create_json_colorizer,
+    create_json_encoder,
+    fingerprint_error,
+)
+from .file_sink import get_file_name_template
 
 
 class InterceptHandler(logging.Handler):
-    # Reroutes messages for Python's logging library to Loguru.
-    # This is useful for catching the log messages from third-party libraries.
+    """
+    Reroutes records from Python's logging library to Loguru
+
+    This is useful for catching the log messages from third-party libraries. The location (file,
+    function, and line) of each record is taken from the logging library's record, rather than by
+    walking the stack.
+
+    :param structured_access_logs: Whether to log uvicorn's access log records with "client",
+                                   "method", "path", and "status_code" fields instead of a formatted
+                                   message (default: False)
+    """
+
+    def __init__(self, structured_access_logs: bool = False):
+        super().__init__()
+        self._structured_access_logs = structured_access_logs
+        self._levels: dict[str, str | int] = {}
+
     def emit(self, record: logging.LogRecord) -> None:
-        # Get corresponding Loguru level if it exists.
-        level: str | int
+        level = self._get_level(record)
+
+        _intercepted_record.current = record
         try:
-            level = logger.level(record.levelname).name
-        except ValueError:
-            level = record.levelno
+            intercepted_logger = (
+                _intercepted_logger
+                if record.exc_info is None
+                else _intercepted_logger.opt(exception=record.exc_info)
+            )
+
+            if self._structured_access_logs and _is_uvicorn_access_record(record):
+                client, method, path, _, status_code = record.args  # type: ignore[misc]
+                intercepted_logger.log(
+                    level,
+                    "Request handled",
+                    client=client,
+                    method=method,
+                    path=path,
+                    status_code=status_code,
+                )
+            else:
+                intercepted_logger.log(level, record.getMessage())
+        finally:
+            _intercepted_record.current = None
+
+    def _get_level(self, record: logging.LogRecord) -> str | int:
+        # Get corresponding Loguru level if it exists.
+        level = self._levels.get(record.levelname)
+        if level is None:
+            try:
+                level = logger.level(record.levelname).name
+            except ValueError:
+                level = record.levelno
+
+            self._levels[record.levelname] = level
+
+        return level
+
+
+def _is_uvicorn_access_record(record: logging.LogRecord) -> bool:
+    # uvicorn logs: '%s - "%s %s HTTP/%s" %d', client, method, path, HTTP version, status code
+    return (
+        record.name == "uvicorn.access" and isinstance(record.args, tuple) and len(record.args) == 5
+    )
+
 
-        # Find caller from where originated the logged message.
-        frame, depth = inspect.currentframe(), 0
-        while frame and (depth == 0 or frame.f_code.co_filename == logging.__file__):
-            frame = frame.f_back
-            depth += 1
+def _use_intercepted_location(record: loguru.Record):
+    intercepted_record = _intercepted_record.current
+
+    record["file"] = type(record["file"])(  # type: ignore[call-arg]
+        intercepted_record.filename, intercepted_record.pathname
+    )
+    record["function"] = intercepted_record.funcName
+    record["line"] = intercepted_record.lineno
+    record["module"] = intercepted_record.module
+    record["name"] = intercepted_record.name
 
-        logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
+
+def _use_dumped_record(record: loguru.Record):
+    record.update(_dumped_record.current)
 
 
 class Serializer:
     def __init__(self, colorize: bool):
-        self._indent: int | None = None
+        self._pretty_print = False
         self._sort_fields = False
+        self._json_encoder_type = JSONEncoderType.STDLIB
+        self._json_encoder = self._create_json_encoder()
         self._colorize = colorize
-        self._lexer = JsonLexer()
-        self._formatter = TerminalTrueColorFormatter(style="rrt")
+        self._json_colorizer = create_json_colorizer(JSONColorizerType.ANSI)
+        self._log_limiter: LogLimiter | None = None
+        self._redactor: Redactor | None = None
+        self._summarizing = threading.local()
+        # The formatted timestamp, except for the microseconds, for the second of the most recent
+        # record: (key, prefix, suffix)
+        self._timestamp_cache: tuple[tuple, str, str] = ((), "", "")
 
     def set_pretty_print(self, pretty_print_logs: bool):
         # A separate method to set this is needed as this option is not configured until after the
         # configuration file has been read, which is also after the logger has been imported.
-        self._indent = 4 if pretty_print_logs else None
+        self._pretty_print = pretty_print_logs
+        self._json_encoder = self._create_json_encoder()
 
     def set_sort_fields(self, sort_fields: bool):
         self._sort_fields = sort_fields
+        self._json_encoder = self._create_json_encoder()
+
+    def set_json_encoder(self, json_encoder_type: JSONEncoderType):
+        self._json_encoder_type = json_encoder_type
+        self._json_encoder = self._create_json_encoder()
+
+    def set_json_colorizer(self, json_colorizer_type: JSONColorizerType):
+        self._json_colorizer = create_json_colorizer(json_colorizer_type)
+
+    def set_log_limiter(self, log_limiter: LogLimiter | None):
+        self._log_limiter = log_limiter
+
+    def set_redactor(self, redactor: Redactor | None):
+        self._redactor = redactor
+
+    def _create_json_encoder(self) -> JSONEncoder:
+        return create_json_encoder(
+            self._json_encoder_type,
+            self._default_serializer,
+            pretty_print=self._pretty_print,
+            sort_keys=self._sort_fields,
+        )
 
     def __call__(self, record: loguru.Record):
+        # Rendering is deferred until a sink's format accesses "extra[serialized]" or
+        # "extra[colorized]". See _LazyRecordExtra for details.
+        extra = _LazyRecordExtra(
+            record["extra"],
+            self,
+            (
+                record["time"],
+                record["level"].name,
+                record["module"],
+                record["file"].path,
+                record["function"],
+                record["message"],
+            ),
+        )
+        record["extra"] = extra  # type: ignore[typeddict-item]
+
+        if self._log_limiter is not None and not getattr(self._summarizing, "active", False):
+            # The decision is made once per record, rather than in each sink's filter, so that
+            # every sink logs the same records.
+            extra.suppressed = not self._log_limiter.should_log(record)
+            self._log_suppression_summaries(self._log_limiter)
+
+    def _log_suppression_summaries(self, log_limiter: LogLimiter):
+        # Summaries are logged from within this patcher, so they must not be limited themselves
+        self._summarizing.active = True
+        try:
+            for summary in log_limiter.pop_summaries():
+                logger.bind(
+                    suppressed_records=summary.count,
+                    suppressed_call_site=summary.call_site,
+                    last_suppressed_message=summary.last_message,
+                ).log(summary.level.name, f"{summary.count} similar records suppressed")
+        finally:
+            self._summarizing.active = False
+
+    def _build_subset(self, record_fields: tuple, extra: dict[str, Any]) -> dict[str, Any]:
+        time, level, module, file, function, message = record_fields
+
         subset = {
-            "timestamp": record["time"].strftime("%Y-%m-%d %H:%M:%S:%f %z"),
-            "level": record["level"].name,
-            "module": record["module"],
-            "file": record["file"].path,
-            "function": record["function"],
-            "message": record["message"],
-            **record["extra"],
+            "timestamp": self._format_timestamp(time),
+            "level": level,
+            "module": module,
+            "file": file,
+            "function": function,
+            "message": message,
+            **extra,
         }
-        json_str = self._serialize_json(subset)
 
-        record["extra"]["serialized"] = json_str
-        record["extra"]["colorized"] = self._colorize_json(json_str) if self._colorize else json_str
+        if self._redactor is not None:
+            return self._redactor.redact(subset)
+
+        return subset
+
+    def _format_timestamp(self, time: datetime) -> str:
+        # Equivalent to time.strftime("%Y-%m-%d %H:%M:%S:%f %z"), but strftime() is slow, so
+        # everything except the microseconds is only formatted once per second.
+        key = (time.second, time.minute, time.hour, time.day, time.month, time.year, time.tzinfo)
+        cached_key, prefix, suffix = self._timestamp_cache
+        if key != cached_key:
+            prefix = time.strftime("%Y-%m-%d %H:%M:%S:")
+            suffix = time.strftime(" %z")
+            self._timestamp_cache = (key, prefix, suffix)
+
+        return prefix + "%06d" % time.microsecond + suffix
 
     def _colorize_json(self, json_str: str) -> str:
-        return highlight(json_str, self._lexer, self._formatter)
+        return self._json_colorizer.colorize(json_str)
 
     def _serialize_json(self, subset: dict[str, Any]) -> str:
-        return json.dumps(
-            subset,
-            indent=self._indent,
-            sort_keys=self._sort_fields,
-            default=self._default_serializer,
-        )
+        return self._json_encoder.encode(subset)
 
     @staticmethod
     def _default_serializer(obj: Any) -> str | dict[str, Any]:
         if isinstance(obj, ServiceKitBaseModel):
             return obj.to_json_dict()
 
+        if isinstance(obj, Mapping):
+            return dict(obj.items())
+
         return str(obj)
 
 
+class _LazyRecordExtra(dict):
+    """
+    The "extra" fields of a log record, which also render the record on demand
+
+    The "serialized" (JSON) and "colorized" (JSON with ANSI colors) representations of the record
+    are rendered the first time a sink's format accesses them, e.g. with "{extra[serialized]}", and
+    are then cached for any other sinks. A record that is only written to sinks that use
+    "serialized" is never colorized, and a record that no sink accepts is never rendered at all.
+    """
+
+    __slots__ = ("_serializer", "_record_fields", "_subset", "suppressed")
+
+    def __init__(self, extra: dict[str, Any], serializer: Serializer, record_fields: tuple):
+        super().__init__(extra)
+        self._serializer = serializer
+        # The fields are copied from the record, rather than keeping a reference to the record
+        # itself, to avoid a reference cycle between the record and its extra fields.
+        self._record_fields = record_fields
+        self._subset: dict[str, Any] | None = None
+        # Whether the record was suppressed by sampling or rate limiting
+        self.suppressed = False
+
+    def __missing__(self, key: str) -> str:
+        if key == "serialized":
+            value = self._serializer._serialize_json(self._get_subset())
+        elif key == "colorized":
+            if self._serializer._colorize:
+                value = self._serializer._colorize_json(self["serialized"])
+            else:
+                value = self["serialized"]
+        else:
+            raise KeyError(key)
+
+        self[key] = value
+        return value
+
+    def _get_subset(self) -> dict[str, Any]:
+        # The subset must be built before any rendered representations are cached in this dict.
+        if self._subset is None:
+            self._subset = self._serializer._build_subset(self._record_fields, self)
+
+        return self._subset
+
+
 io_stream = sys.stderr
 serializer = Serializer(io_stream.isatty())
 
@@ -99,6 +304,20 @@ serializer = Serializer(io_stream.isatty())
 # the importing module won't have access to the patched logger.
 logger = _logger.patch(serializer)
 
+# The record that InterceptHandler is currently emitting on this thread. The location of the record
+# is applied before the serializer runs, so that the serialized record contains it.
+_intercepted_record = threading.local()
+_intercepted_logger = _logger.patch(_use_intercepted_location).patch(serializer)
+
+_queued_sinks: dict[str, QueuedSink] = {}
+_flight_recorder: FlightRecorder | None = None
+_error_deduplicator: ErrorDeduplicator | None = None
+
+# The record that the flight recorder is currently dumping on this thread. It was already patched
+# by the serializer when it was logged, so it isn't patched (or limited) again.
+_dumped_record = threading.local()
+_dumped_logger = _logger.patch(_use_dumped_record)
+
 
 def configure_logger(
     log_level: LogLevel | int,
@@ -107,6 +326,27 @@ def configure_logger(
     log_file_prefix: str | None = None,
     sort_fields: bool = False,
     extra: Mapping[str, Any] = ImmutableMapping({}),
+    queue_size: int | None = None,
+    queue_overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+    json_encoder: JSONEncoderType = JSONEncoderType.STDLIB,
+    json_colorizer: JSONColorizerType = JSONColorizerType.ANSI,
+    sampling_rules: Sequence[LogSamplingRule] = (),
+    rate_limit: LogRateLimit | None = None,
+    suppression_summary_interval: float = 60.0,
+    structured_access_logs: bool = False,
+    log_file_max_size: int | None = None,
+    log_file_retention_count: int | None = None,
+    log_file_retention_age: timedelta | None = None,
+    log_file_compression: LogFileCompression | None = None,
+    log_file_index: bool = False,
+    log_file_buffer_size: int | None = None,
+    log_file_flush_interval: float = 1.0,
+    log_file_fsync_policy: FsyncPolicy = FsyncPolicy.NEVER,
+    log_aggregator_socket: Path | None = None,
+    flight_recorder_level: LogLevel | None = None,
+    flight_recorder_capacity: int = 100,
+    redaction_policy: RedactionPolicy | None = None,
+    error_deduplication_window: float | None = None,
 ):
     """
     Configures the service's structured logger
@@ -121,40 +361,321 @@ def configure_logger(
     :param sort_fields: Whether or not to sort the fields alphabetically in the log messages
                         (default: False)
     :param extra: A mapping containing any extra fields that should be bound to the logger.
+    :param queue_size: If set, records are added to a queue of this size and written to the sinks
+                       by a background thread, so that logging never blocks on I/O. If None (the
+                       default), records are written synchronously.
+    :param queue_overflow_policy: What to do with new records when the queue is full
+                                  (default: OverflowPolicy.BLOCK)
+    :param json_encoder: The JSON encoder used to serialize log records. The fast encoders don't
+                         produce exactly the same output as the standard library; see
+                         `JSONEncoderType` (default: JSONEncoderType.STDLIB)
+    :param json_colorizer: The colorizer used to add colors to log records written to a terminal
+                           (default: JSONColorizerType.ANSI)
+    :param sampling_rules: Rules that keep only one in every N matching records. Only the first
+                           rule that matches a record is applied. (default: no sampling)
+    :param rate_limit: An optional token bucket rate limit that is applied per call site or per
+                       message (default: None)
+    :param suppression_summary_interval: The minimum number of seconds between "N similar records
+                                         suppressed" summaries, which are logged for every call
+                                         site at which records were suppressed by sampling or
+                                         rate limiting. Summaries are logged along with the next
+                                         record after the interval has passed. (default: 60)
+    :param structured_access_logs: Whether to log uvicorn's access log records with "client",
+                                   "method", "path", and "status_code" fields instead of a formatted
+                                   message (default: False)
+    :param log_file_max_size: If set, a new log file is started once the current file reaches this
+                              size in bytes. Regardless, a new file is started every day at
+                              midnight. (default: None)
+    :param log_file_retention_count: If set, only this many rotated log files are kept
+                                     (default: None)
+    :param log_file_retention_age: If set, rotated log files that were last modified longer ago
+                                   than this are deleted (default: None)
+    :param log_file_compression: If set, rotated log files are compressed with this algorithm in a
+                                 background thread (default: None)
+    :param log_file_index: Whether to write an index next to each log file, which speeds up
+                           querying the log files with `service-kit logs` (default: False)
+    :param log_file_buffer_size: If set, records are buffered and written to the log file together
+                                 once this many bytes are buffered, or once
+                                 `log_file_flush_interval` has passed. If None, every record is
+                                 written as soon as it is logged. (default: None)
+    :param log_file_flush_interval: The maximum number of seconds that a buffered record waits
+                                    before it is written, and the interval of
+                                    FsyncPolicy.INTERVAL (default: 1.0)
+    :param log_file_fsync_policy: When records written to log files are forced to be persisted to
+                                  disk (default: FsyncPolicy.NEVER)
+    :param log_aggregator_socket: If set, records are sent to the LogAggregator listening on this
+                                  Unix socket (see start_log_aggregator()) instead of being written
+                                  to log files by this process. The log file parameters are then
+                                  ignored, except for `log_directory`, which must still be set to
+                                  log to files. (default: None)
+    :param flight_recorder_level: If set, the records of each request (identified by the
+                                  "request_id" field) that are at or above this level but below
+                                  `log_level` are kept in memory, and they are only written if a
+                                  record at or above ERROR is logged for the request. See
+                                  FlightRecorder. (default: None)
+    :param flight_recorder_capacity: The maximum number of records that are kept per request by the
+                                     flight recorder (default: 100)
+    :param redaction_policy: If set, secrets are redacted from all fields of log records with this
+                             policy when they're serialized. Redaction adds a few microseconds to
+                             every serialized record, so it's opt-in. (default: None)
+    :param error_deduplication_window: If set, log_basic_error() and log_structured_error() log the
+                                       traceback of each distinct error (see fingerprint_error())
+                                       only once per this many seconds. The other occurrences are
+                                       logged with an "error_fingerprint" and an
+                                       "error_occurrences" count instead. (default: None)
     """
+    global _flight_recorder, _error_deduplicator
+
     serializer.set_pretty_print(pretty_print_logs)
     serializer.set_sort_fields(sort_fields)
+    serializer.set_json_encoder(json_encoder)
+    serializer.set_json_colorizer(json_colorizer)
+    serializer.set_redactor(Redactor(redaction_policy) if redaction_policy is not None else None)
+    # Records below the log level are only kept by the flight recorder, so they are not limited
+    serializer.set_log_limiter(
+        LogLimiter(
+            sampling_rules, rate_limit, suppression_summary_interval, _get_level_no(log_level)
+        )
+        if sampling_rules or rate_limit is not None
+        else None
+    )
     logger.configure(extra=extra)
+    _error_deduplicator = (
+        ErrorDeduplicator(error_deduplication_window)
+        if error_deduplication_window is not None
+        else None
+    )
 
-    # Remove default logger before adding new handlers.
+    # Remove default logger before adding new handlers. This also writes any queued records.
     logger.remove()
+    _queued_sinks.clear()
+    _flight_recorder = None
+
+    # The flight recorder is added first, so that the records it dumps are written before the error
+    # that triggered the dump. The dumped records are below the log level, so the other sinks
+    # accept records from the flight recorder's level, and filter out the ones that weren't dumped.
+    log_level_no = _get_level_no(log_level)
+    sink_level: LogLevel | int = log_level
+    sink_filter: Callable[[loguru.Record], bool] = _is_not_suppressed
+    if flight_recorder_level is not None and _get_level_no(flight_recorder_level) < log_level_no:
+        sink_level = flight_recorder_level
+        sink_filter = functools.partial(_is_logged_or_dumped, log_level_no)
+        _flight_recorder = FlightRecorder(
+            _dump_recorded_messages, log_level_no, flight_recorder_capacity
+        )
+        logger.add(
+            _flight_recorder,
+            level=flight_recorder_level,
+            filter=_flight_recorder.filter,
+            format="{message}",
+        )
 
     logger.add(
-        io_stream,
-        level=log_level,
+        _queue_sink("stderr", io_stream, queue_size, queue_overflow_policy),
+        level=sink_level,
+        filter=sink_filter,
         backtrace=True,
         diagnose=False,  # For security purposes, this should be set to False in production
         format="{extra[colorized]}",
     )
 
     if log_directory is not None:
-        _create_log_directory(log_directory)
-
-        log_file_name_template = "{time}.log"
-        if log_file_prefix is not None:
-            log_file_name_template = f"{log_file_prefix}_{log_file_name_template}"
+        file_sink: AggregatingSink | FileSink
+        if log_aggregator_socket is not None:
+            file_sink = AggregatingSink(log_aggregator_socket)
+        else:
+            file_sink = _create_file_sink(
+                log_directory,
+                log_file_prefix,
+                log_file_max_size,
+                log_file_retention_count,
+                log_file_retention_age,
+                log_file_compression,
+                log_file_index,
+                log_file_buffer_size,
+                log_file_flush_interval,
+                log_file_fsync_policy,
+            )
 
         logger.add(
-            log_directory / log_file_name_template,
-            rotation="00:00",
-            level=log_level,
+            _queue_sink("file", file_sink, queue_size, queue_overflow_policy),
+            level=sink_level,
+            filter=sink_filter,
             backtrace=True,
             diagnose=False,  # For security purposes, this should be set to False in production
             format="{extra[serialized]}",
-            opener=lambda path, flags: os.open(path, flags, 0o600),
         )
 
-    intercept_uvicorn_loggers()
+    intercept_uvicorn_loggers(structured_access_logs)
+
+
+def start_log_aggregator(
+    socket_path: Path,
+    log_directory: Path,
+    log_file_prefix: str | None = None,
+    log_file_max_size: int | None = None,
+    log_file_retention_count: int | None = None,
+    log_file_retention_age: timedelta | None = None,
+    log_file_compression: LogFileCompression | None = None,
+    log_file_buffer_size: int | None = None,
+    log_file_flush_interval: float = 1.0,
+    log_file_fsync_policy: FsyncPolicy = FsyncPolicy.NEVER,
+) -> LogAggregator:
+    """
+    Start writing the log records of other processes to log files
+
+    Processes whose logger was configured with `log_aggregator_socket=socket_path` send their
+    records to the returned LogAggregator, which writes them to one stream of log files. This is
+    meant to be called by the process that starts several worker processes, e.g. uvicorn workers,
+    before it starts them.
+
+    :param socket_path: The path of the Unix socket to listen on
+    :param log_directory: The directory where log files will be stored. If the specified directory
+                          does not exist it will be created.
+    :param log_file_prefix: A string that will be prepended to any log files that are created
+                            (default: None)
+    :param log_file_max_size: See configure_logger()
+    :param log_file_retention_count: See configure_logger()
+    :param log_file_retention_age: See configure_logger()
+    :param log_file_compression: See configure_logger()
+    :param log_file_buffer_size: See configure_logger()
+    :param log_file_flush_interval: See configure_logger()
+    :param log_file_fsync_policy: See configure_logger(). Since the aggregated records are already
+                                  serialized, FsyncPolicy.CRITICAL only applies when files are
+                                  rotated or closed.
+    :return: The started LogAggregator. Call its `stop()` method once the worker processes have
+             exited.
+    """
+    log_aggregator = LogAggregator(
+        socket_path,
+        _create_file_sink(
+            log_directory,
+            log_file_prefix,
+            log_file_max_size,
+            log_file_retention_count,
+            log_file_retention_age,
+            log_file_compression,
+            False,
+            log_file_buffer_size,
+            log_file_flush_interval,
+            log_file_fsync_policy,
+        ),
+    )
+    log_aggregator.start()
+
+    return log_aggregator
+
+
+def _create_file_sink(
+    log_directory: Path,
+    log_file_prefix: str | None,
+    max_file_size: int | None,
+    retention_count: int | None,
+    retention_age: timedelta | None,
+    compression: LogFileCompression | None,
+    index: bool,
+    buffer_size: int | None,
+    flush_interval: float,
+    fsync_policy: FsyncPolicy,
+) -> FileSink:
+    _create_log_directory(log_directory)
+
+    return FileSink(
+        log_directory,
+        get_file_name_template(log_file_prefix),
+        max_file_size=max_file_size,
+        retention_count=retention_count,
+        retention_age=retention_age,
+        compression=compression,
+        index=index,
+        buffer_size=buffer_size,
+        flush_interval=flush_interval,
+        fsync_policy=fsync_policy,
+    )
+
+
+def discard_flight_recording(request_id: str):
+    """
+    Discard the records that the flight recorder kept for a request
+
+    This must be called when a request ends. It does nothing if the logger was not configured with
+    a `flight_recorder_level`.
+
+    :param request_id: The ID of the request
+    """
+    if _flight_recorder is not None:
+        _flight_recorder.discard(request_id)
+
+
+def count_error_occurrence(error: BaseException) -> tuple[str, int] | None:
+    """
+    Count an occurrence of an error in the current error deduplication window
+
+    This is used by the error logging functions, e.g. log_basic_error(), to decide whether to log
+    the error's traceback. The error is only fingerprinted if the logger was configured with an
+    `error_deduplication_window`.
+
+    :param error: The error that is being logged
+    :return: The error's fingerprint and the number of times that it occurred in the current
+             window, including this occurrence, or None if errors are not deduplicated
+    """
+    if _error_deduplicator is None:
+        return None
+
+    fingerprint = fingerprint_error(error)
+    return fingerprint, _error_deduplicator.count(fingerprint)
+
+
+def _dump_recorded_messages(messages: list[loguru.Message]):
+    # The records are logged again, rather than written to the sinks directly, so that loguru
+    # serializes them with the other records that are written to each sink
+    for message in messages:
+        record = message.record
+        # Marks the record as dumped, since it's written after records that were logged later
+        record["extra"]["flight_recorder"] = True
+
+        _dumped_record.current = record
+        try:
+            _dumped_logger.log(record["level"].no, record["message"])
+        finally:
+            _dumped_record.current = None
+
+
+def _get_level_no(level: LogLevel | int) -> int:
+    return level if isinstance(level, int) else logger.level(level).no
+
+
+def _is_not_suppressed(record: loguru.Record) -> bool:
+    return not record["extra"].suppressed  # type: ignore[attr-defined]
+
+
+def _is_logged_or_dumped(log_level_no: int, record: loguru.Record) -> bool:
+    if record["level"].no < log_level_no:
+        return record["extra"].get("flight_recorder", False)
+
+    return _is_not_suppressed(record)
+
+
+def _queue_sink(
+    name: str, sink: Any, queue_size: int | None, overflow_policy: OverflowPolicy
+) -> Any:
+    if queue_size is None:
+        return sink
+
+    queued_sink = QueuedSink(sink, queue_size, overflow_policy)
+    _queued_sinks[name] = queued_sink
+
+    return queued_sink
+
+
+def get_log_queue_statistics() -> dict[str, QueuedSinkStatistics]:
+    """
+    Get the statistics of the log queues
+
+    :return: A mapping of sink names ("stderr" and "file") to the statistics of their queues. The
+             mapping is empty unless the logger was configured with a `queue_size`.
+    """
+    return {name: queued_sink.statistics for name, queued_sink in _queued_sinks.items()}
 
 
 def _create_log_directory(log_directory: Path):
@@ -164,7 +685,7 @@ def _create_log_directory(log_directory: Path):
         raise ValueError(f"{log_directory} is not a directory")
 
 
-def intercept_uvicorn_loggers():
+def intercept_uvicorn_loggers(structured_access_logs: bool = False):
     """
     Configure uvicorn to use the correct logger
 
@@ -174,12 +695,16 @@ def intercept_uvicorn_loggers():
 
     Note: Calling this is unnecessary if the logger has been configured with
           configure_logger(), as it already calls this function.
-    """
-    with suppress(ImportError):
-        import uvicorn  # noqa: F401
 
-        intercept_preconfigured_loggers(
-            ("uvicorn", "uvicorn.access", "uvicorn.asgi", "uvicorn.error")
+    :param structured_access_logs: Whether to log uvicorn's access log records with "client",
+                                   "method", "path", and "status_code" fields instead of a formatted
+                                   message (default: False)
+    """
+    # uvicorn is only found, rather than imported, since importing it is slow
+    if importlib.util.find_spec("uvicorn") is not None:
+        _intercept_loggers(
+            ("uvicorn", "uvicorn.access", "uvicorn.asgi", "uvicorn.error"),
+            InterceptHandler(structured_access_logs),
         )
 
 
@@ -193,8 +718,10 @@ def intercept_preconfigured_loggers(logger_names: Iterable[str]):
 
     :param logger_names: An iterable of names of the loggers that must be intercepted
     """
-    intercept_handler = InterceptHandler()
+    _intercept_loggers(logger_names, InterceptHandler())
+
 
+def _intercept_loggers(logger_names: Iterable[str], intercept_handler: InterceptHandler):
     logging.basicConfig(handlers=[intercept_handler], level=0, force=True)
 
     for name in logger_names:
@@ -0,0 +1,94 @@
+import hashlib
+import threading
+import time
+from types import TracebackType
+from typing import Final
+
+# Bounds the memory used to count the occurrences of errors
+_MAX_FINGERPRINTS: Final[int] = 10000
+
+
+def fingerprint_error(error: BaseException) -> str:
+    """
+    Identify an error by its type and the code location at which it was raised
+
+    Errors of the same type that were raised through the same lines of code have the same
+    fingerprint, regardless of their messages. Computing a fingerprint only walks the error's
+    traceback, and is much cheaper than formatting the traceback, since no source lines are read.
+
+    :param error: The error to fingerprint
+    :return: A short hexadecimal fingerprint
+    """
+    error_type = type(error)
+    location = [f"{error_type.__module__}.{error_type.__qualname__}"]
+
+    tb: TracebackType | None = error.__traceback__
+    while tb is not None:
+        code = tb.tb_frame.f_code
+        location.append(f"{code.co_filename}:{code.co_name}:{tb.tb_lineno}")
+        tb = tb.tb_next
+
+    return hashlib.blake2b("\n".join(location).encode(), digest_size=8).hexdigest()
+
+
+class _Occurrences:
+    __slots__ = ("count", "window_end")
+
+    def __init__(self, window_end: float):
+        self.count = 0
+        self.window_end = window_end
+
+
+class ErrorDeduplicator:
+    """
+    Counts the occurrences of errors, so that each error's traceback is logged once per window
+
+    The first occurrence of an error (identified by its fingerprint, see fingerprint_error()) starts
+    a window. Occurrences of the same error within the window are counted, and are meant to be
+    logged without their traceback.
+
+    :param window: The length of the window, in seconds
+    """
+
+    def __init__(self, window: float):
+        if window <= 0:
+            raise ValueError("The window must be positive")
+
+        self._window = window
+        self._occurrences: dict[str, _Occurrences] = {}
+        self._lock = threading.Lock()
+
+    def count(self, fingerprint: str) -> int:
+        """
+        Count an occurrence of an error
+
+        :param fingerprint: The fingerprint of the error
+        :return: The number of occurrences of the error in the current window, including this one.
+                 If it's 1, this occurrence started a new window, and its traceback should be
+                 logged.
+        """
+        now = time.monotonic()
+        with self._lock:
+            occurrences = self._occurrences.get(fingerprint)
+            if occurrences is None or now >= occurrences.window_end:
+                if occurrences is None and len(self._occurrences) >= _MAX_FINGERPRINTS:
+                    self._evict_expired(now)
+
+                occurrences = _Occurrences(now + self._window)
+                self._occurrences[fingerprint] = occurrences
+
+            occurrences.count += 1
+            return occurrences.count
+
+    def _evict_expired(self, now: float):
+        expired = [
+            fingerprint
+            for fingerprint, occurrences in self._occurrences.items()
+            if now >= occurrences.window_end
+        ]
+        if not expired:
+            # Evict the least recently created window
+            expired = [next(iter(self._occurrences))]
+
+        for fingerprint in expired:
+            del self._occurrences[fingerprint]
@@ -1,9 +1,16 @@
+from __future__ import annotations
+
+import importlib.util
 import traceback
-from typing import Any
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any
 
 from service_kit.errors import StructuredError
 
-from . import LogLevel, logger
+from . import LogLevel, count_error_occurrence, fingerprint_error, logger
+
+if TYPE_CHECKING:
+    import psycopg
 
 
 def log_exception_group(
@@ -11,7 +18,31 @@ def log_exception_group(
     *,
     log_level: LogLevel = LogLevel.ERROR,
     message: str = "An unexpected error occurred",
+    aggregate: bool = False,
+    max_tracebacks: int = 3,
 ):
+    """
+    Log the errors of an exception group
+
+    By default, each of the group's top-level errors is logged in its own record. If `aggregate` is
+    True, the group is walked recursively, including nested groups, and a single record is logged.
+    Its "errors" field summarizes the group's errors by fingerprint (see fingerprint_error()), with
+    the type, count, and message of each distinct error, most frequent first. Only the tracebacks of
+    the `max_tracebacks` most frequent distinct errors are formatted, so that the cost and size of
+    the record depend on the number of distinct errors, rather than on the total number of errors.
+
+    :param group: An exception group to log
+    :param log_level: The log level to use (default: "ERROR")
+    :param message: The message to log (default: "An unexpected error occurred")
+    :param aggregate: Whether to log a single record that summarizes all of the group's errors
+                      (default: False)
+    :param max_tracebacks: The maximum number of distinct errors whose tracebacks are included in
+                           the aggregated record (default: 3)
+    """
+    if aggregate:
+        _log_aggregated_exception_group(group, log_level, message, max_tracebacks)
+        return
+
     for err in group.exceptions:
         if isinstance(err, StructuredError):
             log_structured_error(err, log_level=log_level, message=message)
@@ -39,7 +70,7 @@ def log_basic_error(
         message,
         error=str(error),
         error_type=error.__class__.__name__,
-        traceback=traceback.format_exc(),
+        **_get_traceback_fields(error),
         **kwargs,
     )
 
@@ -61,8 +92,9 @@ def log_structured_error(
     """
 
     # "message" is a preexisting, positional parameter in logger.error().
-    # Replacing error.structured_error["message"] with ["error"].
-    structured_error = error.structured_error
+    # Replacing error.structured_error["message"] with ["error"]. The structured error is read-only,
+    # so it's copied, but a shallow copy suffices, since the attributes' values aren't modified.
+    structured_error = dict(error.structured_error)
     structured_error["error"] = structured_error.pop("message", None)
 
     logger.log(
@@ -70,48 +102,84 @@ def log_structured_error(
         message,
         **structured_error,
         error_type=error.__class__.__name__,
-        traceback=traceback.format_exc(),
+        **_get_traceback_fields(error),
         **kwargs,
     )
 
 
-try:
-    import psycopg
+def _log_aggregated_exception_group(
+    group: BaseExceptionGroup, log_level: LogLevel, message: str, max_tracebacks: int
+):
+    summaries: dict[str, dict[str, Any]] = {}
+    exemplars: dict[str, BaseException] = {}
+    error_count = 0
+    for error in _walk_exception_group(group):
+        error_count += 1
+        fingerprint = fingerprint_error(error)
+        summary = summaries.get(fingerprint)
+        if summary is None:
+            summaries[fingerprint] = {
+                "error_type": error.__class__.__name__,
+                "error_fingerprint": fingerprint,
+                "count": 1,
+                "error": str(error),
+            }
+            exemplars[fingerprint] = error
+        else:
+            summary["count"] += 1
 
-    def log_postgres_error(err: psycopg.Error):
-        logger.error(
-            "A PostgreSQL error occurred",
-            postgres_error_message=str(err),
-            **_format_postgres_error_diagnostics(err),
+    errors = sorted(summaries.values(), key=lambda summary: summary["count"], reverse=True)
+    for summary in errors[:max_tracebacks]:
+        summary["traceback"] = "".join(
+            traceback.format_exception(exemplars[summary["error_fingerprint"]])
         )
 
-    def _format_postgres_error_diagnostics(err: psycopg.Error) -> dict[str, str]:
-        diagnostic_fields = {
-            "column_name": err.diag.column_name,
-            "constraint_name": err.diag.constraint_name,
-            "context": err.diag.context,
-            "datatype_name": err.diag.datatype_name,
-            "internal_position": err.diag.internal_position,
-            "internal_query": err.diag.internal_query,
-            "message_detail": err.diag.message_detail,
-            "message_hint": err.diag.message_hint,
-            "message_primary": err.diag.message_primary,
-            "schema_name": err.diag.schema_name,
-            "severity": err.diag.severity,
-            "severity_nonlocalized": err.diag.severity_nonlocalized,
-            "source_file": err.diag.source_file,
-            "source_function": err.diag.source_function,
-            "source_line": err.diag.source_line,
-            "sqlstate": err.diag.sqlstate,
-            "statement_position": err.diag.statement_position,
-            "table_name": err.diag.table_name,
-        }
-
-        return {k: v for k, v in diagnostic_fields.items() if v is not None}
-
-except ImportError:
-
-    def log_postgres_error(err):
+    logger.log(
+        log_level,
+        message,
+        error=str(group),
+        error_type=group.__class__.__name__,
+        error_count=error_count,
+        errors=errors,
+    )
+
+
+def _walk_exception_group(group: BaseExceptionGroup) -> Iterator[BaseException]:
+    # Iterative, rather than recursive, so that deeply nested groups can't exhaust the stack
+    stack = [iter(group.exceptions)]
+    while stack:
+        error = next(stack[-1], None)
+        if error is None:
+            stack.pop()
+        elif isinstance(error, BaseExceptionGroup):
+            stack.append(iter(error.exceptions))
+        else:
+            yield error
+
+
+def _get_traceback_fields(error: Exception) -> dict[str, Any]:
+    occurrence = count_error_occurrence(error)
+    if occurrence is None:
+        return {"traceback": traceback.format_exc()}
+
+    fingerprint, occurrences = occurrence
+
+    # The traceback is only formatted for the first occurrence of the error in the window
+    if occurrences == 1:
+        return {"error_fingerprint": fingerprint, "traceback": traceback.format_exc()}
+
+    return {"error_fingerprint": fingerprint, "error_occurrences": occurrences}
+
+
+def log_postgres_error(err: psycopg.Error):
+    """
+    Log a PostgreSQL error, along with its diagnostics
+
+    :param err: A psycopg error to log
+    """
+    # psycopg is never imported by this module, since importing it is slow. If it's not installed,
+    # there can't be a psycopg error to log, so this was called by mistake.
+    if importlib.util.find_spec("psycopg") is None:
         raise RuntimeError(
             "log_postrges_error() was called but psycopg could not be imported. Please ensure"
             "ServiceKit is installed with the [psycopg] extra:"
@@ -119,3 +187,34 @@ except ImportError:
             'git = "ssh://git@github.com/guardicode/service-kit.git", extras = ["psycopg"]'
             "}`"
         )
+
+    logger.error(
+        "A PostgreSQL error occurred",
+        postgres_error_message=str(err),
+        **_format_postgres_error_diagnostics(err),
+    )
+
+
+def _format_postgres_error_diagnostics(err: psycopg.Error) -> dict[str, str]:
+    diagnostic_fields = {
+        "column_name": err.diag.column_name,
+        "constraint_name": err.diag.constraint_name,
+        "context": err.diag.context,
+        "datatype_name": err.diag.datatype_name,
+        "internal_position": err.diag.internal_position,
+        "internal_query": err.diag.internal_query,
+        "message_detail": err.diag.message_detail,
+        "message_hint": err.diag.message_hint,
+        "message_primary": err.diag.message_primary,
+        "schema_name": err.diag.schema_name,
+        "severity": err.diag.severity,
+        "severity_nonlocalized": err.diag.severity_nonlocalized,
+        "source_file": err.diag.source_file,
+        "source_function": err.diag.source_function,
+        "source_line": err.diag.source_line,
+        "sqlstate": err.diag.sqlstate,
+        "statement_position": err.diag.statement_position,
+        "table_name": err.diag.table_name,
+    }
+
+    return {k: v for k, v in diagnostic_fields.items() if v is not None}
@@ -0,0 +1,436 @@
+import gzip
+import os
+import re
+import shutil
+import sys
+import threading
+import traceback
+from datetime import datetime, timedelta
+from enum import StrEnum
+from pathlib import Path
+from queue import SimpleQueue
+from typing import Any, BinaryIO, Callable, Final, TextIO
+
+import loguru
+
+from .log_index import INDEX_FILE_SUFFIX, LogSegmentIndexer, write_index
+
+FILE_NAME_TIME_FORMAT: Final[str] = "%Y-%m-%d_%H-%M-%S_%f"
+# Matches the times that FILE_NAME_TIME_FORMAT produces
+_FILE_NAME_TIME_PATTERN: Final[str] = r"\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2}_\d{6}"
+_TEMPORARY_FILE_SUFFIX: Final[str] = ".tmp"
+
+
+class LogFileCompression(StrEnum):
+    """
+    The algorithms that can be used to compress rotated log files
+    """
+
+    GZIP = "gzip"
+    ZSTD = "zstd"
+    """Requires the zstandard package"""
+
+
+_COMPRESSED_FILE_SUFFIXES: Final[dict[LogFileCompression, str]] = {
+    LogFileCompression.GZIP: ".gz",
+    LogFileCompression.ZSTD: ".zst",
+}
+
+# Records at or above ERROR are persisted immediately by FsyncPolicy.CRITICAL
+_CRITICAL_LEVEL_NO: Final[int] = 40
+
+
+class FsyncPolicy(StrEnum):
+    """
+    When a FileSink forces the records it has written to be persisted to disk with fsync()
+    """
+
+    NEVER = "never"
+    """Leave it to the operating system"""
+    INTERVAL = "interval"
+    """Every flush interval, and whenever a file is rotated or closed"""
+    CRITICAL = "critical"
+    """
+    After writing any record at or above ERROR or with a `security_risk`, and whenever a file is
+    rotated or closed
+    """
+
+
+class FileSink:
+    """
+    A sink that writes log messages to files in a directory
+
+    A new file is started every day at midnight, and optionally whenever the current file reaches a
+    maximum size. Files are created with 0o600 permissions.
+
+    Rotated files can be compressed, and old rotated files can be deleted. Both are done by a
+    background thread so that writing a record never waits for them. Only files whose names match
+    `file_name_template` are considered for retention.
+
+    Records can be buffered so that many records are written with one system call. Buffered records
+    are written by a background thread once `flush_interval` has passed, so that they are not held
+    back indefinitely when few records are logged. Records that FsyncPolicy.CRITICAL applies to
+    are written and persisted immediately, along with any records buffered before them.
+
+    Each file can also be indexed (see LogSegmentIndex), so that its records can be queried without
+    reading the whole file. The index of a file is written next to it, with the ".idx" suffix, once
+    the file is rotated or the sink is stopped.
+
+    .. note::
+
+        If several sinks write files that match the same template in the same directory, e.g. one
+        per uvicorn worker, `retention_count` applies to their files combined.
+
+    :param log_directory: The directory in which log files will be created
+    :param file_name_template: The template for log file names. "{time}" is replaced with the time
+                               at which the file was created.
+    :param max_file_size: If set, a new file is started once the current file reaches this size
+                          in bytes
+    :param retention_count: If set, only this many rotated files are kept
+    :param retention_age: If set, rotated files that were last modified longer ago than this are
+                          deleted
+    :param compression: If set, rotated files are compressed with this algorithm
+    :param index: Whether to write an index of each file
+    :param buffer_size: If set, records are buffered in memory and written together once this many
+                        bytes are buffered, or once `flush_interval` has passed. If None, every
+                        record is written and flushed as soon as it is received.
+    :param flush_interval: The maximum number of seconds that a buffered record waits before it is
+                           written, and the interval of FsyncPolicy.INTERVAL
+    :param fsync_policy: When records are forced to be persisted to disk
+    :raises ImportError: If `compression` is `LogFileCompression.ZSTD` and the zstandard package is
+                         not installed
+    """
+
+    def __init__(
+        self,
+        log_directory: Path,
+        file_name_template: str = "{time}.log",
+        max_file_size: int | None = None,
+        retention_count: int | None = None,
+        retention_age: timedelta | None = None,
+        compression: LogFileCompression | None = None,
+        index: bool = False,
+        buffer_size: int | None = None,
+        flush_interval: float = 1.0,
+        fsync_policy: FsyncPolicy = FsyncPolicy.NEVER,
+    ):
+        if flush_interval <= 0:
+            raise ValueError("The flush interval must be positive")
+
+        self._log_directory = log_directory
+        self._file_name_template = file_name_template
+        self._file_name_pattern = compile_file_name_pattern(file_name_template)
+        self._max_file_size = max_file_size
+        self._retention_count = retention_count
+        self._retention_age = retention_age
+        self._compress = _get_compressor(compression) if compression is not None else None
+        self._index = index
+        self._buffer_size = buffer_size
+        self._flush_interval = flush_interval
+        self._fsync_policy = fsync_policy
+
+        self._file: TextIO | None = None
+        self._file_size = 0
+        self._buffer: list[str] = []
+        self._buffered_size = 0
+        self._unsynced = False
+        # Guards the file and the buffer, which the flusher thread also writes
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._flusher: threading.Thread | None = None
+        self._indexer: LogSegmentIndexer | None = None
+        self._next_rotation = datetime.min
+
+        # Rotated files are queued along with their indexers
+        self._rotated_files: SimpleQueue[tuple[Path, LogSegmentIndexer | None] | None] = (
+            SimpleQueue()
+        )
+        self._processor: threading.Thread | None = None
+
+    @property
+    def path(self) -> Path | None:
+        """The path of the file that is currently being written"""
+        return Path(self._file.name) if self._file is not None else None
+
+    def write(self, message: str):
+        with self._lock:
+            now = datetime.now()
+            if now >= self._next_rotation or (
+                self._max_file_size is not None and self._file_size >= self._max_file_size
+            ):
+                self._rotate(now)
+
+            record = getattr(message, "record", None)
+            if self._indexer is not None and record is not None:
+                self._indexer.add(record, self._file_size)
+
+            message_size = len(message) if message.isascii() else len(message.encode())
+            self._file_size += message_size
+
+            if self._buffer_size is None:
+                self._file.write(message)  # type: ignore[union-attr]
+                self._unsynced = True
+            else:
+                self._buffer.append(message)
+                self._buffered_size += message_size
+                if self._buffered_size >= self._buffer_size:
+                    self._write_buffer()
+
+            if (
+                self._fsync_policy == FsyncPolicy.CRITICAL
+                and record is not None
+                and _is_critical(record)
+            ):
+                self._sync()
+
+    def flush(self):
+        # Buffered records are written by write() and the flusher thread
+        if self._buffer_size is not None:
+            return
+
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def stop(self):
+        """
+        Write any buffered records, close the current file, and wait for any rotated files to be
+        processed
+        """
+        if self._flusher is not None:
+            self._stopped.set()
+            self._flusher.join()
+            self._flusher = None
+
+        with self._lock:
+            current_file = self._close()
+            if current_file is not None and self._indexer is not None:
+                write_index(self._indexer.build(), get_index_path(current_file))
+                self._indexer = None
+
+        if self._processor is not None:
+            self._rotated_files.put(None)
+            self._processor.join()
+            self._processor = None
+
+    def _write_buffer(self):
+        if self._buffer:
+            self._file.write("".join(self._buffer))  # type: ignore[union-attr]
+            self._buffer.clear()
+            self._buffered_size = 0
+            self._unsynced = True
+
+        self._file.flush()  # type: ignore[union-attr]
+
+    def _sync(self):
+        self._write_buffer()
+        if self._unsynced:
+            os.fsync(self._file.fileno())  # type: ignore[union-attr]
+            self._unsynced = False
+
+    def _flush_periodically(self):
+        while not self._stopped.wait(self._flush_interval):
+            with self._lock:
+                if self._file is None:
+                    continue
+
+                try:
+                    if self._fsync_policy == FsyncPolicy.INTERVAL:
+                        self._sync()
+                    else:
+                        self._write_buffer()
+                except Exception:
+                    # Mirror loguru's behavior: a failing sink must not crash the application
+                    traceback.print_exc(file=sys.stderr)
+
+    def _close(self) -> Path | None:
+        if self._file is None:
+            return None
+
+        if self._fsync_policy == FsyncPolicy.NEVER:
+            self._write_buffer()
+        else:
+            self._sync()
+
+        path = self.path
+        self._file.close()
+        self._file = None
+
+        return path
+
+    def _rotate(self, now: datetime):
+        rotated_file = self._close()
+
+        file_name = self._file_name_template.format(time=now.strftime(FILE_NAME_TIME_FORMAT))
+        self._file = open(
+            self._log_directory / file_name,
+            "a",
+            encoding="utf8",
+            opener=lambda path, flags: os.open(path, flags, 0o600),
+        )
+        self._file_size = self._file.tell()
+        self._next_rotation = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+
+        rotated_indexer = self._indexer
+        self._indexer = LogSegmentIndexer() if self._index else None
+
+        if self._flusher is None and (
+            self._buffer_size is not None or self._fsync_policy == FsyncPolicy.INTERVAL
+        ):
+            self._stopped.clear()
+            self._flusher = threading.Thread(
+                target=self._flush_periodically, name="log-file-flusher", daemon=True
+            )
+            self._flusher.start()
+
+        if rotated_file is not None:
+            self._process_in_background(rotated_file, rotated_indexer)
+
+    def _process_in_background(self, rotated_file: Path, indexer: LogSegmentIndexer | None):
+        if (
+            indexer is None
+            and self._compress is None
+            and self._retention_count is None
+            and self._retention_age is None
+        ):
+            return
+
+        if self._processor is None:
+            self._processor = threading.Thread(
+                target=self._process_rotated_files, name="log-file-processor", daemon=True
+            )
+            self._processor.start()
+
+        self._rotated_files.put((rotated_file, indexer))
+
+    def _process_rotated_files(self):
+        while (rotated := self._rotated_files.get()) is not None:
+            rotated_file, indexer = rotated
+            try:
+                # The index is written first, so that a compressed file always has an index
+                if indexer is not None:
+                    write_index(indexer.build(), get_index_path(rotated_file))
+
+                if self._compress is not None:
+                    self._compress(rotated_file)
+
+                self._delete_expired_files(rotated_file)
+            except Exception:
+                # Mirror loguru's behavior: a failing sink must not crash the application
+                traceback.print_exc(file=sys.stderr)
+
+    def _delete_expired_files(self, rotated_file: Path):
+        # The names of files that match the template sort by the time at which they were created.
+        # Only files up to the one that was just rotated are considered, since newer files may
+        # still be written to or waiting to be compressed. Files whose names don't match the
+        # template exactly, such as other "*.log" files in the directory, are never deleted.
+        rotated_files = sorted(
+            (
+                path
+                for path in self._log_directory.iterdir()
+                if self._file_name_pattern.fullmatch(path.name)
+                and path.name[: len(rotated_file.name)] <= rotated_file.name
+            ),
+            reverse=True,
+        )
+
+        expired_files = []
+        if self._retention_count is not None:
+            expired_files.extend(rotated_files[self._retention_count :])
+            rotated_files = rotated_files[: self._retention_count]
+
+        if self._retention_age is not None:
+            oldest_allowed = (datetime.now() - self._retention_age).timestamp()
+            expired_files.extend(
+                path for path in rotated_files if path.stat().st_mtime < oldest_allowed
+            )
+
+        for path in expired_files:
+            path.unlink(missing_ok=True)
+            get_index_path(path).unlink(missing_ok=True)
+
+
+def get_file_name_template(prefix: str | None) -> str:
+    """
+    Get the template of the names of the log files that the service's logger writes
+
+    :param prefix: The prefix of the log files, if any
+    :return: The file name template, for FileSink's `file_name_template` parameter
+    """
+    if prefix is None:
+        return "{time}.log"
+
+    return f"{prefix}_{{time}}.log"
+
+
+def compile_file_name_pattern(file_name_template: str) -> re.Pattern[str]:
+    """
+    Compile a pattern that matches the names of the files that a FileSink writes
+
+    :param file_name_template: The FileSink's `file_name_template`
+    :return: A pattern that fully matches the names of the log files, whether or not they were
+             compressed, and no other files
+    """
+    prefix, _, suffix = file_name_template.partition("{time}")
+    compressed_suffixes = "|".join(re.escape(s) for s in _COMPRESSED_FILE_SUFFIXES.values())
+
+    return re.compile(
+        f"{re.escape(prefix)}{_FILE_NAME_TIME_PATTERN}{re.escape(suffix)}(?:{compressed_suffixes})?"
+    )
+
+
+def get_index_path(log_file: Path) -> Path:
+    """
+    Get the path of the index of a log file
+
+    A compressed log file shares its index with the original log file.
+
+    :param log_file: The path of a log file, which may be compressed
+    :return: The path of the index of the log file
+    """
+    for suffix in _COMPRESSED_FILE_SUFFIXES.values():
+        if log_file.name.endswith(suffix):
+            return log_file.with_name(log_file.name.removesuffix(suffix) + INDEX_FILE_SUFFIX)
+
+    return log_file.with_name(log_file.name + INDEX_FILE_SUFFIX)
+
+
+def _is_critical(record: "loguru.Record") -> bool:
+    return (
+        record["level"].no >= _CRITICAL_LEVEL_NO or record["extra"].get("security_risk") is not None
+    )
+
+
+def _get_compressor(compression: LogFileCompression) -> Callable[[Path], None]:
+    copy_compressed: Callable[[BinaryIO, BinaryIO], Any]
+    if compression == LogFileCompression.ZSTD:
+        import zstandard
+
+        compressor = zstandard.ZstdCompressor()
+        copy_compressed = compressor.copy_stream
+    else:
+        copy_compressed = _copy_gzipped
+
+    suffix = _COMPRESSED_FILE_SUFFIXES[compression]
+
+    def compress(path: Path):
+        compressed_path = path.with_name(path.name + suffix)
+        # The compressed file is written under a temporary name and then renamed, so that a
+        # partially compressed file is never mistaken for a complete one.
+        temporary_path = compressed_path.with_name(compressed_path.name + _TEMPORARY_FILE_SUFFIX)
+
+        with (
+            open(path, "rb") as source,
+            open(temporary_path, "wb", opener=lambda p, flags: os.open(p, flags, 0o600)) as target,
+        ):
+            copy_compressed(source, target)
+
+        os.replace(temporary_path, compressed_path)
+        path.unlink()
+
+    return compress
+
+
+def _copy_gzipped(source: BinaryIO, target: BinaryIO):
+    with gzip.GzipFile(fileobj=target, mode="wb") as gzip_file:
+        shutil.copyfileobj(source, gzip_file)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from typing import Final
+
+import loguru
+
+# Records at or above ERROR cause the records of their request to be dumped
+_DUMP_LEVEL_NO: Final[int] = 40
+
+
+class FlightRecorder:
+    """
+    Keeps the most recent low-level records of each request, and dumps them if the request fails
+
+    The FlightRecorder is a loguru sink that receives the records of each request (identified by
+    the "request_id" field) that are below the level of the other sinks, and keeps the most recent
+    ones in a bounded buffer per request. Recording a record is cheap: it's appended to a deque,
+    and it's only serialized if it's dumped. When a record at or above ERROR (and `threshold`) is
+    logged for a request, the recorded records of that request are passed to `dump`, so that they
+    can be written to the other sinks before the error. When a request ends, its records are
+    discarded.
+
+    :param dump: A callable that writes a request's recorded messages, in the order in which they
+                 were logged
+    :param threshold: The level number of the other sinks. Only records below it are recorded.
+    :param capacity: The maximum number of records that are kept per request. Once it's reached,
+                     the oldest record of the request is dropped.
+    :param max_requests: The maximum number of requests whose records are kept. Once it's reached,
+                         the records of the least recently active request are dropped.
+    """
+
+    def __init__(
+        self,
+        dump: Callable[[list[loguru.Message]], None],
+        threshold: int,
+        capacity: int = 100,
+        max_requests: int = 1000,
+    ):
+        if capacity < 1:
+            raise ValueError("The capacity must be at least 1")
+
+        self._dump = dump
+        self._threshold = threshold
+        self._dump_level_no = max(threshold, _DUMP_LEVEL_NO)
+        self._capacity = capacity
+        self._max_requests = max_requests
+
+        self._recordings: OrderedDict[str, deque[loguru.Message]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def filter(self, record: loguru.Record) -> bool:
+        """
+        Accept the records that must be recorded or that trigger a dump
+
+        This is meant to be passed to `logger.add()` along with the recorder.
+        """
+        level_no = record["level"].no
+        return (
+            (level_no < self._threshold or level_no >= self._dump_level_no)
+            and record["extra"].get("request_id") is not None
+            and not record["extra"].suppressed  # type: ignore[attr-defined]
+            # The records that it dumps are logged again
+            and not record["extra"].get("flight_recorder", False)
+        )
+
+    def write(self, message: loguru.Message):
+        record = message.record
+        request_id = str(record["extra"]["request_id"])
+
+        if record["level"].no >= self._dump_level_no:
+            with self._lock:
+                recording = self._recordings.pop(request_id, None)
+
+            if recording:
+                self._dump(list(recording))
+
+            return
+
+        with self._lock:
+            recording = self._recordings.get(request_id)
+            if recording is None:
+                if len(self._recordings) >= self._max_requests:
+                    self._recordings.popitem(last=False)
+
+                recording = deque(maxlen=self._capacity)
+                self._recordings[request_id] = recording
+            else:
+                self._recordings.move_to_end(request_id)
+
+            recording.append(message)
+
+    def discard(self, request_id: str):
+        """
+        Discard the records of a request
+
+        :param request_id: The ID of the request
+        """
+        with self._lock:
+            self._recordings.pop(request_id, None)
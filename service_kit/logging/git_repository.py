@@ -0,0 +1,444 @@
+import mmap
+import zlib
+from bisect import bisect_left
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Final
+
+# The pack object types, see https://git-scm.com/docs/pack-format
+_PACK_OBJECT_TYPES: Final[dict[int, str]] = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+_OFS_DELTA: Final[int] = 6
+_REF_DELTA: Final[int] = 7
+_OBJECT_ID_LENGTH: Final[int] = 20
+_PACK_INDEX_SIGNATURE: Final[bytes] = b"\377tOc"
+_PACK_INDEX_HEADER_SIZE: Final[int] = 8
+_PACK_INDEX_FANOUT_SIZE: Final[int] = 256 * 4
+# The number of bytes of a packed object that are decompressed at a time. Commits and tags are
+# usually smaller than this.
+_DECOMPRESSION_CHUNK_SIZE: Final[int] = 4096
+_MAX_SYMBOLIC_REF_DEPTH: Final[int] = 5
+
+
+class GitRepositoryError(Exception):
+    """
+    Raised if a git repository can't be read
+    """
+
+
+class GitRepository:
+    """
+    Reads commits, refs, and tags directly from a git repository's `.git` directory
+
+    Loose and packed refs, and loose and packed objects (including deltified ones) are supported,
+    as are linked worktrees. Only SHA-1 repositories with the "files" ref storage are supported;
+    for any other repository, a GitRepositoryError is raised, so that the caller can fall back to
+    running `git`.
+
+    The pack indexes are opened the first time that a packed object is read, and are kept open
+    until the repository is closed, either with `close()` or by using it as a context manager.
+
+    :param git_directory: The repository's `.git` directory
+    """
+
+    def __init__(self, git_directory: Path):
+        self._git_directory = git_directory
+        # A linked worktree has its own HEAD, but shares the refs and objects of the main worktree
+        commondir_file = git_directory / "commondir"
+        self._common_directory = (
+            git_directory / commondir_file.read_text().strip()
+            if commondir_file.is_file()
+            else git_directory
+        )
+        self._packed_refs: dict[str, tuple[str, str | None]] | None = None
+        self._packs: list[_Pack] | None = None
+
+    def __enter__(self) -> "GitRepository":
+        return self
+
+    def __exit__(self, _exc_type, _exc_value, _traceback):
+        self.close()
+
+    def close(self):
+        """
+        Close the repository's pack files
+        """
+        for pack in self._packs or []:
+            pack.close()
+        self._packs = None
+
+    @classmethod
+    def find(cls, path: Path) -> "GitRepository | None":
+        """
+        Find the git repository that contains a path
+
+        :param path: A path in the repository's worktree
+        :return: The repository, or None if the path isn't in a git repository
+        """
+        for directory in (path.absolute(), *path.absolute().parents):
+            git_path = directory / ".git"
+            if git_path.is_dir():
+                return cls(git_path)
+            if git_path.is_file():
+                # The .git file of a linked worktree or a submodule points to its git directory
+                gitdir = git_path.read_text().strip().removeprefix("gitdir:").strip()
+                return cls(directory / gitdir)
+
+        return None
+
+    def resolve_head(self) -> str:
+        """
+        Get the ID of the commit that HEAD points to
+
+        :raises GitRepositoryError: If HEAD doesn't point to a commit
+        :return: The commit ID
+        """
+        return self.resolve_ref("HEAD")
+
+    def resolve_ref(self, ref: str) -> str:
+        """
+        Get the object ID that a ref points to, following symbolic refs
+
+        :param ref: The full name of the ref, e.g. "HEAD" or "refs/heads/main"
+        :raises GitRepositoryError: If the ref doesn't exist
+        :return: The object ID
+        """
+        for _ in range(_MAX_SYMBOLIC_REF_DEPTH):
+            value = self._read_loose_ref(ref)
+            if value is None:
+                packed_ref = self._get_packed_refs().get(ref)
+                if packed_ref is None:
+                    raise GitRepositoryError(f'The ref "{ref}" does not exist')
+                value = packed_ref[0]
+
+            if not value.startswith("ref:"):
+                return _validate_object_id(value)
+            ref = value.removeprefix("ref:").strip()
+
+        raise GitRepositoryError(f'The symbolic ref "{ref}" is nested too deeply')
+
+    def get_parents(self, commit_id: str) -> list[str]:
+        """
+        Get the parents of a commit
+
+        :param commit_id: The ID of the commit
+        :raises GitRepositoryError: If the commit can't be read
+        :return: The IDs of the commit's parents, in order
+        """
+        object_type, content = self.read_object(commit_id)
+        if object_type != "commit":
+            raise GitRepositoryError(f"{commit_id} is a {object_type}, not a commit")
+
+        return [value.decode() for name, value in _iter_headers(content) if name == b"parent"]
+
+    def get_tags(self, commit_id: str) -> list[str]:
+        """
+        Get the tags that point to a commit, either directly or through annotated tags
+
+        Unlike `git tag --points-at`, tags of tags are followed until they reach a commit. Tags
+        whose objects can't be read, e.g. in a shallow clone, are skipped.
+
+        :param commit_id: The ID of the commit
+        :return: The names of the tags, sorted
+        """
+        tags = {
+            ref.removeprefix("refs/tags/"): target
+            for ref, target in self._get_packed_refs().items()
+            if ref.startswith("refs/tags/")
+        }
+        tags_directory = self._common_directory / "refs" / "tags"
+        for path in tags_directory.rglob("*"):
+            if path.is_file():
+                # A loose ref takes precedence over a packed ref with the same name
+                tags[path.relative_to(tags_directory).as_posix()] = (path.read_text().strip(), None)
+
+        return sorted(
+            name
+            for name, (object_id, peeled_object_id) in tags.items()
+            if object_id == commit_id
+            or (peeled_object_id or self._try_peel(object_id)) == commit_id
+        )
+
+    def read_object(self, object_id: str) -> tuple[str, bytes]:
+        """
+        Read an object from the repository's object database
+
+        :param object_id: The ID of the object
+        :raises GitRepositoryError: If the object doesn't exist or can't be read
+        :return: The type of the object (e.g. "commit"), and its content
+        """
+        object_id = _validate_object_id(object_id)
+
+        loose_object_path = self._common_directory / "objects" / object_id[:2] / object_id[2:]
+        try:
+            data = zlib.decompress(loose_object_path.read_bytes())
+        except FileNotFoundError:
+            return self._read_packed_object(bytes.fromhex(object_id))
+        except zlib.error as err:
+            raise GitRepositoryError(f"The object {object_id} is corrupt") from err
+
+        header, _, content = data.partition(b"\0")
+        object_type, _, _ = header.partition(b" ")
+
+        return object_type.decode(), content
+
+    def _read_loose_ref(self, ref: str) -> str | None:
+        # Refs outside refs/ (e.g. HEAD) belong to the worktree
+        directory = self._common_directory if ref.startswith("refs/") else self._git_directory
+        try:
+            return (directory / ref).read_text().strip()
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            return None
+
+    def _get_packed_refs(self) -> dict[str, tuple[str, str | None]]:
+        # Maps each packed ref to the object ID it points to and, if it's an annotated tag, the ID
+        # of the object that the tag points to
+        if self._packed_refs is not None:
+            return self._packed_refs
+
+        self._packed_refs = {}
+        try:
+            lines = (self._common_directory / "packed-refs").read_text().splitlines()
+        except FileNotFoundError:
+            return self._packed_refs
+
+        # If the refs are "fully-peeled", every annotated tag is followed by a "^<object ID>" line,
+        # so any ref without one points to the object itself
+        fully_peeled = bool(lines) and "fully-peeled" in lines[0].split()
+        ref = None
+        for line in lines:
+            if line.startswith("#") or not line:
+                continue
+            if line.startswith("^") and ref is not None:
+                self._packed_refs[ref] = (self._packed_refs[ref][0], line[1:])
+                continue
+
+            object_id, _, ref = line.partition(" ")
+            self._packed_refs[ref] = (object_id, object_id if fully_peeled else None)
+
+        return self._packed_refs
+
+    def _try_peel(self, object_id: str) -> str | None:
+        try:
+            return self._peel(object_id)
+        except GitRepositoryError:
+            return None
+
+    def _peel(self, object_id: str) -> str:
+        for _ in range(_MAX_SYMBOLIC_REF_DEPTH):
+            object_type, content = self.read_object(object_id)
+            if object_type != "tag":
+                return object_id
+            object_id = next(value.decode() for name, value in _iter_headers(content))
+
+        raise GitRepositoryError(f"The tag {object_id} is nested too deeply")
+
+    def _read_packed_object(self, object_id: bytes) -> tuple[str, bytes]:
+        for pack in self._get_packs():
+            offset = pack.find(object_id)
+            if offset is not None:
+                return self._read_pack_entry(pack.get_data(), offset)
+
+        raise GitRepositoryError(f"The object {object_id.hex()} does not exist")
+
+    def _get_packs(self) -> list["_Pack"]:
+        if self._packs is None:
+            pack_directory = self._common_directory / "objects" / "pack"
+            self._packs = [_Pack(path) for path in pack_directory.glob("*.idx")]
+
+        return self._packs
+
+    def _read_pack_entry(self, pack: mmap.mmap, entry_offset: int) -> tuple[str, bytes]:
+        # Each entry starts with its type and size, in a variable-length header
+        byte = pack[entry_offset]
+        entry_type = (byte >> 4) & 0b111
+        offset = entry_offset + 1
+        while byte & 0x80:
+            byte = pack[offset]
+            offset += 1
+
+        if entry_type == _OFS_DELTA:
+            # The delta's base is an earlier entry in the same pack, at a variable-length distance
+            byte = pack[offset]
+            offset += 1
+            distance = byte & 0x7F
+            while byte & 0x80:
+                byte = pack[offset]
+                offset += 1
+                distance = ((distance + 1) << 7) | (byte & 0x7F)
+
+            object_type, base = self._read_pack_entry(pack, entry_offset - distance)
+            return object_type, _apply_delta(base, _decompress(pack, offset))
+
+        if entry_type == _REF_DELTA:
+            base_id = pack[offset : offset + _OBJECT_ID_LENGTH]
+            object_type, base = self.read_object(base_id.hex())
+            return object_type, _apply_delta(base, _decompress(pack, offset + _OBJECT_ID_LENGTH))
+
+        if entry_type not in _PACK_OBJECT_TYPES:
+            raise GitRepositoryError(f"Unknown pack entry type {entry_type}")
+
+        return _PACK_OBJECT_TYPES[entry_type], _decompress(pack, offset)
+
+
+def _validate_object_id(object_id: str) -> str:
+    if len(object_id) != _OBJECT_ID_LENGTH * 2:
+        raise GitRepositoryError(f'"{object_id}" is not a SHA-1 object ID')
+
+    try:
+        bytes.fromhex(object_id)
+    except ValueError as err:
+        raise GitRepositoryError(f'"{object_id}" is not a SHA-1 object ID') from err
+
+    return object_id.lower()
+
+
+def _iter_headers(content: bytes) -> Iterator[tuple[bytes, bytes]]:
+    # The headers of commits and tags are "<name> <value>" lines, which end at the first empty line
+    for line in content.split(b"\n"):
+        if not line:
+            return
+        name, _, value = line.partition(b" ")
+        yield name, value
+
+
+class _Pack:
+    # A pack and its index, which are mapped into memory once and then searched for every packed
+    # object that is read. See the version 2 pack-*.idx format in
+    # https://git-scm.com/docs/pack-format
+
+    def __init__(self, pack_index_path: Path):
+        self._pack_path = pack_index_path.with_suffix(".pack")
+        self._index = _map_file(pack_index_path)
+        self._data: mmap.mmap | None = None
+
+        if self._index[:4] != _PACK_INDEX_SIGNATURE or _read_uint32(self._index, 4) != 2:
+            self._index.close()
+            raise GitRepositoryError(f"{pack_index_path} is not a version 2 pack index")
+
+        # The fanout table holds the number of objects whose first byte is <= each value
+        self._object_count = _read_uint32(self._index, _PACK_INDEX_HEADER_SIZE + 4 * 255)
+        ids_offset = _PACK_INDEX_HEADER_SIZE + _PACK_INDEX_FANOUT_SIZE
+        self._ids = _PackIndexIDs(self._index, ids_offset, self._object_count)
+        # The IDs are followed by a CRC32 and a 32-bit offset per object
+        self._offsets_offset = ids_offset + self._object_count * (_OBJECT_ID_LENGTH + 4)
+
+    def find(self, object_id: bytes) -> int | None:
+        # Returns the offset of the object's entry in the pack, or None if it isn't in the pack
+        first_byte = object_id[0]
+        start = 0
+        if first_byte > 0:
+            start = _read_uint32(self._index, _PACK_INDEX_HEADER_SIZE + 4 * (first_byte - 1))
+        end = _read_uint32(self._index, _PACK_INDEX_HEADER_SIZE + 4 * first_byte)
+
+        position = bisect_left(self._ids, object_id, start, end)
+        if position == end or self._ids[position] != object_id:
+            return None
+
+        # Offsets with the most significant bit set are indices into a table of 64-bit offsets
+        offset = _read_uint32(self._index, self._offsets_offset + 4 * position)
+        if offset & 0x80000000:
+            large_offsets_offset = self._offsets_offset + 4 * self._object_count
+            large_offset_position = large_offsets_offset + 8 * (offset & 0x7FFFFFFF)
+            offset = int.from_bytes(
+                self._index[large_offset_position : large_offset_position + 8], "big"
+            )
+
+        return offset
+
+    def get_data(self) -> mmap.mmap:
+        # The pack itself is only mapped once an object is read from it
+        if self._data is None:
+            self._data = _map_file(self._pack_path)
+
+        return self._data
+
+    def close(self):
+        self._index.close()
+        if self._data is not None:
+            self._data.close()
+
+
+def _map_file(path: Path) -> mmap.mmap:
+    with open(path, "rb") as file:
+        try:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as err:
+            # Empty files can't be mapped
+            raise GitRepositoryError(f"{path} is empty") from err
+
+
+class _PackIndexIDs:
+    # A read-only sequence of the sorted object IDs in a pack index, which can be binary searched
+    # without reading all of them
+
+    def __init__(self, pack_index: mmap.mmap, offset: int, object_count: int):
+        self._pack_index = pack_index
+        self._offset = offset
+        self._object_count = object_count
+
+    def __len__(self) -> int:
+        return self._object_count
+
+    def __getitem__(self, position: int) -> bytes:
+        start = self._offset + position * _OBJECT_ID_LENGTH
+        return self._pack_index[start : start + _OBJECT_ID_LENGTH]
+
+
+def _read_uint32(data: mmap.mmap, offset: int) -> int:
+    return int.from_bytes(data[offset : offset + 4], "big")
+
+
+def _decompress(pack: mmap.mmap, offset: int) -> bytes:
+    # The compressed size of an entry isn't stored, so it's decompressed until the stream ends
+    decompressor = zlib.decompressobj()
+    chunks = []
+    try:
+        while not decompressor.eof:
+            if offset >= len(pack):
+                raise GitRepositoryError("A pack entry is truncated")
+            chunks.append(
+                decompressor.decompress(pack[offset : offset + _DECOMPRESSION_CHUNK_SIZE])
+            )
+            offset += _DECOMPRESSION_CHUNK_SIZE
+    except zlib.error as err:
+        raise GitRepositoryError("A pack entry is corrupt") from err
+
+    return b"".join(chunks)
+
+
+def _apply_delta(base: bytes, delta: bytes) -> bytes:
+    # See https://git-scm.com/docs/pack-format#_deltified_representation
+    position = 0
+    # The delta starts with the sizes of the base and of the result, which aren't needed
+    for _ in range(2):
+        while delta[position] & 0x80:
+            position += 1
+        position += 1
+
+    result = bytearray()
+    while position < len(delta):
+        instruction = delta[position]
+        position += 1
+
+        if instruction & 0x80:
+            # Copy a range of the base. Bits 0-3 select which bytes of the offset follow, and bits
+            # 4-6 select which bytes of the size follow.
+            copy_offset = 0
+            for i in range(4):
+                if instruction & (1 << i):
+                    copy_offset |= delta[position] << (8 * i)
+                    position += 1
+            copy_size = 0
+            for i in range(3):
+                if instruction & (1 << (4 + i)):
+                    copy_size |= delta[position] << (8 * i)
+                    position += 1
+            result += base[copy_offset : copy_offset + (copy_size or 0x10000)]
+        elif instruction:
+            # Insert the next `instruction` bytes of the delta
+            result += delta[position : position + instruction]
+            position += instruction
+        else:
+            raise GitRepositoryError("A delta contains a reserved instruction")
+
+    return bytes(result)
@@ -0,0 +1,101 @@
+import re
+from abc import ABC, abstractmethod
+from enum import StrEnum
+from typing import Final
+
+
+class JSONColorizerType(StrEnum):
+    """
+    The colorizers that can be used to add ANSI colors to serialized log records
+    """
+
+    ANSI = "ansi"
+    """A fast, built-in colorizer"""
+    PYGMENTS = "pygments"
+    """A colorizer that uses pygments' JSON lexer"""
+
+
+class JSONColorizer(ABC):
+    """
+    Adds ANSI terminal colors to a JSON string
+    """
+
+    @abstractmethod
+    def colorize(self, json_str: str) -> str:
+        pass
+
+
+# The colors of pygments' "rrt" style, which ANSIJSONColorizer replicates
+_DEFAULT_COLOR: Final[str] = "\x1b[38;2;221;221;221m"
+_STRING_COLOR: Final[str] = "\x1b[38;2;135;206;235m"
+_NUMBER_COLOR: Final[str] = "\x1b[38;2;255;0;255m"
+_CONSTANT_COLOR: Final[str] = "\x1b[38;2;255;0;0m"
+_RESET_COLOR: Final[str] = "\x1b[39m"
+
+_STRING: Final[str] = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_NUMBER: Final[str] = r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?"
+# Every string, number, and constant in a JSON document is preceded by one of "{[:," and optional
+# whitespace. Matching from these characters ensures that every string is consumed by a match,
+# so the search never resumes inside of a string. Object keys are matched (with their values if
+# possible) so that they are not mistaken for string values.
+_TOKEN: Final[re.Pattern] = re.compile(
+    rf"([{{,]\s*{_STRING}\s*:\s*|[\[:,]\s*)"
+    rf"(?:({_STRING})(?!\s*:)|({_NUMBER})|(true|false|null))"
+    rf"|[{{,]\s*{_STRING}\s*:"
+)
+_VALUE_COLORS: Final[tuple[str, ...]] = (_STRING_COLOR, _NUMBER_COLOR, _CONSTANT_COLOR)
+
+
+class ANSIJSONColorizer(JSONColorizer):
+    """
+    A colorizer that produces the same colors as pygments' JSON lexer with the "rrt" style
+
+    The colors are added with a single regular expression substitution over the JSON string, which
+    is an order of magnitude faster than pygments.
+    """
+
+    def colorize(self, json_str: str) -> str:
+        return (
+            _DEFAULT_COLOR
+            + _TOKEN.sub(ANSIJSONColorizer._colorize_value, json_str)
+            + _RESET_COLOR
+            + "\n"
+        )
+
+    @staticmethod
+    def _colorize_value(match: re.Match) -> str:
+        group = match.lastindex
+        if group is None:
+            # An object key that is followed by an object or array
+            return match.group(0)
+
+        return match.group(1) + _VALUE_COLORS[group - 2] + match.group(group) + _DEFAULT_COLOR
+
+
+class PygmentsJSONColorizer(JSONColorizer):
+    def __init__(self):
+        from pygments import highlight
+        from pygments.formatters import TerminalTrueColorFormatter
+        from pygments.lexers import JsonLexer
+
+        self._highlight = highlight
+        self._lexer = JsonLexer()
+        self._formatter = TerminalTrueColorFormatter(style="rrt")
+
+    def colorize(self, json_str: str) -> str:
+        return self._highlight(json_str, self._lexer, self._formatter)
+
+
+_COLORIZERS: Final[dict[JSONColorizerType, type[JSONColorizer]]] = {
+    JSONColorizerType.ANSI: ANSIJSONColorizer,
+    JSONColorizerType.PYGMENTS: PygmentsJSONColorizer,
+}
+
+
+def create_json_colorizer(colorizer_type: JSONColorizerType) -> JSONColorizer:
+    """
+    Create a JSON colorizer
+
+    :param colorizer_type: The type of colorizer to create
+    """
+    return _COLORIZERS[colorizer_type]()
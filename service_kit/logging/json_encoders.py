@@ -0,0 +1,180 @@
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from enum import StrEnum
+from typing import Any, Final
+
+_INDENT: Final[int] = 4
+
+
+class JSONEncoderType(StrEnum):
+    """
+    The JSON encoders that can be used to serialize log records
+
+    .. note::
+
+        The fast encoders (orjson and msgspec) are optional and must be selected explicitly. Their
+        output is valid JSON with the same fields, but it is not identical to the output of the
+        standard library encoder:
+
+        - Compact output from the fast encoders does not contain spaces after separators.
+        - The fast encoders write non-ASCII characters as UTF-8 rather than as `\\uXXXX` escapes.
+        - The fast encoders serialize `Enum` members (other than `StrEnum` and `IntEnum` members)
+          by value and NaN/infinity as `null`.
+        - msgspec serializes `datetime`, `date`, `time`, and dataclass objects as ISO 8601 strings
+          or objects instead of with `str()`, `bytes` as base64, and sets as arrays.
+
+        If a fast encoder fails to serialize a record (e.g. because an integer is too large), the
+        record is serialized with the standard library instead.
+    """
+
+    AUTO = "auto"
+    """Use orjson if it is installed, else the standard library"""
+    ORJSON = "orjson"
+    MSGSPEC = "msgspec"
+    STDLIB = "stdlib"
+
+
+class JSONEncoder(ABC):
+    """
+    Encodes the fields of a log record as a JSON string
+
+    :param default: A function that is called to convert objects that can't otherwise be serialized
+    :param pretty_print: Whether or not to indent the JSON output
+    :param sort_keys: Whether or not to sort the keys of the JSON output
+    """
+
+    def __init__(
+        self, default: Callable[[Any], Any], pretty_print: bool = False, sort_keys: bool = False
+    ):
+        self._default = default
+        self._pretty_print = pretty_print
+        self._sort_keys = sort_keys
+
+    @abstractmethod
+    def encode(self, obj: dict[str, Any]) -> str:
+        pass
+
+
+class StdlibJSONEncoder(JSONEncoder):
+    def encode(self, obj: dict[str, Any]) -> str:
+        return json.dumps(
+            obj,
+            indent=_INDENT if self._pretty_print else None,
+            sort_keys=self._sort_keys,
+            default=self._default,
+        )
+
+
+class _FastJSONEncoder(JSONEncoder):
+    def __init__(
+        self, default: Callable[[Any], Any], pretty_print: bool = False, sort_keys: bool = False
+    ):
+        super().__init__(default, pretty_print, sort_keys)
+        self._fallback_encoder = StdlibJSONEncoder(default, pretty_print, sort_keys)
+
+    def encode(self, obj: dict[str, Any]) -> str:
+        try:
+            return self._encode(obj)
+        except (TypeError, ValueError, OverflowError):
+            return self._fallback_encoder.encode(obj)
+
+    @abstractmethod
+    def _encode(self, obj: dict[str, Any]) -> str:
+        pass
+
+
+class OrjsonJSONEncoder(_FastJSONEncoder):
+    def __init__(
+        self, default: Callable[[Any], Any], pretty_print: bool = False, sort_keys: bool = False
+    ):
+        import orjson
+
+        super().__init__(default, pretty_print, sort_keys)
+        self._dumps = orjson.dumps
+
+        # Datetimes and dataclasses are passed to `default` so that they're serialized with str(),
+        # like the standard library encoder does.
+        self._option = (
+            orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+        if pretty_print:
+            self._option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            self._option |= orjson.OPT_SORT_KEYS
+
+    def _encode(self, obj: dict[str, Any]) -> str:
+        json_str = self._dumps(obj, default=self._default, option=self._option).decode()
+
+        if self._pretty_print:
+            return _double_indentation(json_str)
+
+        return json_str
+
+
+class MsgspecJSONEncoder(_FastJSONEncoder):
+    def __init__(
+        self, default: Callable[[Any], Any], pretty_print: bool = False, sort_keys: bool = False
+    ):
+        import msgspec
+
+        super().__init__(default, pretty_print, sort_keys)
+        self._encoder = msgspec.json.Encoder(
+            enc_hook=default, order="sorted" if sort_keys else None
+        )
+        self._format = msgspec.json.format
+
+    def _encode(self, obj: dict[str, Any]) -> str:
+        json_bytes = self._encoder.encode(obj)
+
+        if self._pretty_print:
+            json_bytes = self._format(json_bytes, indent=_INDENT)
+
+        return json_bytes.decode()
+
+
+def _double_indentation(json_str: str) -> str:
+    # orjson only supports an indentation of 2 spaces. The indentation is replaced one level at a
+    # time, starting from the deepest level, with NUL placeholders. NUL characters are always
+    # escaped inside of JSON strings, so the placeholders can't be confused with the content.
+    depth = 1
+    while "\n" + "  " * depth in json_str:
+        depth += 1
+
+    for level in range(depth - 1, 0, -1):
+        json_str = json_str.replace("\n" + "  " * level, "\n" + "\0" * level)
+
+    return json_str.replace("\0", " " * _INDENT)
+
+
+_ENCODERS: Final[dict[JSONEncoderType, type[JSONEncoder]]] = {
+    JSONEncoderType.ORJSON: OrjsonJSONEncoder,
+    JSONEncoderType.MSGSPEC: MsgspecJSONEncoder,
+    JSONEncoderType.STDLIB: StdlibJSONEncoder,
+}
+
+
+def create_json_encoder(
+    encoder_type: JSONEncoderType,
+    default: Callable[[Any], Any],
+    pretty_print: bool = False,
+    sort_keys: bool = False,
+) -> JSONEncoder:
+    """
+    Create a JSON encoder
+
+    :param encoder_type: The type of encoder to create
+    :param default: A function that is called to convert objects that can't otherwise be serialized
+    :param pretty_print: Whether or not to indent the JSON output
+    :param sort_keys: Whether or not to sort the keys of the JSON output
+    :raises ImportError: If the library required by the encoder is not installed
+    """
+    if encoder_type != JSONEncoderType.AUTO:
+        return _ENCODERS[encoder_type](default, pretty_print, sort_keys)
+
+    try:
+        return OrjsonJSONEncoder(default, pretty_print, sort_keys)
+    except ImportError:
+        return StdlibJSONEncoder(default, pretty_print, sort_keys)
@@ -0,0 +1,276 @@
+import os
+import selectors
+import socket
+import stat
+import struct
+import sys
+import threading
+import traceback
+from pathlib import Path
+from typing import Any, Final, Protocol
+
+# Each record is sent as its length in bytes, followed by the UTF-8 encoded record
+_LENGTH_PREFIX: Final[struct.Struct] = struct.Struct("!I")
+_RECEIVE_SIZE: Final[int] = 256 * 1024
+# AggregatingSink sends its buffered records once they reach this size, even if it wasn't flushed
+_MAX_SEND_BUFFER_SIZE: Final[int] = 256 * 1024
+
+
+class _Writable(Protocol):
+    def write(self, message: str) -> Any: ...
+
+
+class LogAggregator:
+    """
+    Receives log records from AggregatingSinks in other processes and writes them to a single sink
+
+    When several processes, e.g. uvicorn workers, write log files to the same directory, each one
+    writes its own files. Instead, the processes can send their records to one LogAggregator over a
+    Unix socket, so that the records of all processes are written to one stream of log files by one
+    writer.
+
+    Records are received and written by a background thread. All records that have been received
+    are written at once, and then the sink is flushed if it has a `flush()` method. The records of
+    each process are written in the order in which they were logged, and the records of different
+    processes are written in the order in which they were received.
+
+    .. note::
+
+        AggregatingSinks only send the serialized records, so records written by a LogAggregator
+        to a FileSink are not indexed.
+
+    :param socket_path: The path of the Unix socket to listen on. The socket is created with 0o600
+                        permissions, replacing any stale socket at the same path.
+    :param sink: The sink to write records to. It must have a `write()` method. If it has `flush()`
+                 or `stop()` methods, they will be called as well.
+    """
+
+    def __init__(self, socket_path: Path, sink: _Writable):
+        self._socket_path = socket_path
+        self._sink = sink
+
+        self._selector = selectors.DefaultSelector()
+        self._server: socket.socket | None = None
+        # Used to wake the background thread up when the aggregator is stopped
+        self._wakeup_receiver, self._wakeup_sender = socket.socketpair()
+        self._buffers: dict[socket.socket, bytearray] = {}
+        self._stopped = False
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        """
+        Start listening on the socket and writing the records that are received
+        """
+        if self._thread is not None:
+            raise RuntimeError("The log aggregator has already been started")
+
+        _remove_stale_socket(self._socket_path)
+
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # The socket is created with the process's umask, so it's restricted while it's bound, to
+        # prevent other users from connecting before its permissions are set. The umask is
+        # process-wide, but it's only restricted for as long as bind() takes.
+        umask = os.umask(0o177)
+        try:
+            self._server.bind(str(self._socket_path))
+        finally:
+            os.umask(umask)
+        os.chmod(self._socket_path, 0o600)
+        self._server.listen()
+        self._server.setblocking(False)
+
+        self._selector.register(self._server, selectors.EVENT_READ)
+        self._selector.register(self._wakeup_receiver, selectors.EVENT_READ)
+
+        self._thread = threading.Thread(
+            target=self._aggregate_records, name="log-aggregator", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """
+        Write all records that have already been received, and stop listening on the socket
+        """
+        if self._thread is not None:
+            self._stopped = True
+            self._wakeup_sender.send(b"\0")
+            self._thread.join()
+            self._thread = None
+
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            self._socket_path.unlink(missing_ok=True)
+
+        self._selector.close()
+        self._wakeup_receiver.close()
+        self._wakeup_sender.close()
+
+        if callable(getattr(self._sink, "stop", None)):
+            self._sink.stop()  # type: ignore[attr-defined]
+
+    def _aggregate_records(self):
+        while not self._stopped:
+            self._receive_and_write(timeout=None)
+
+        # Records that were sent before the aggregator was stopped may not have been received yet
+        while self._receive_and_write(timeout=0):
+            pass
+
+        for connection in list(self._buffers):
+            self._disconnect(connection)
+
+    def _receive_and_write(self, timeout: float | None) -> bool:
+        # Returns False if nothing was received
+        records: list[str] = []
+        received = False
+
+        for key, _ in self._selector.select(timeout):
+            sock = key.fileobj
+            if sock is self._server:
+                self._accept()
+            elif sock is self._wakeup_receiver:
+                self._wakeup_receiver.recv(_RECEIVE_SIZE)
+            else:
+                received |= self._receive(sock, records)  # type: ignore[arg-type]
+
+        if records:
+            self._write(records)
+
+        return received
+
+    def _accept(self):
+        try:
+            connection, _ = self._server.accept()  # type: ignore[union-attr]
+        except BlockingIOError:
+            return
+
+        connection.setblocking(False)
+        self._buffers[connection] = bytearray()
+        self._selector.register(connection, selectors.EVENT_READ)
+
+    def _receive(self, connection: socket.socket, records: list[str]) -> bool:
+        try:
+            data = connection.recv(_RECEIVE_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return False
+        except OSError:
+            data = b""
+
+        if not data:
+            self._disconnect(connection)
+            return False
+
+        buffer = self._buffers[connection]
+        buffer += data
+
+        start = 0
+        while len(buffer) - start >= _LENGTH_PREFIX.size:
+            (length,) = _LENGTH_PREFIX.unpack_from(buffer, start)
+            end = start + _LENGTH_PREFIX.size + length
+            if end > len(buffer):
+                break
+
+            records.append(buffer[start + _LENGTH_PREFIX.size : end].decode("utf8"))
+            start = end
+
+        del buffer[:start]
+
+        return True
+
+    def _disconnect(self, connection: socket.socket):
+        self._selector.unregister(connection)
+        connection.close()
+        # Any partially received record is discarded
+        del self._buffers[connection]
+
+    def _write(self, records: list[str]):
+        try:
+            for record in records:
+                self._sink.write(record)
+
+            if callable(getattr(self._sink, "flush", None)):
+                self._sink.flush()  # type: ignore[attr-defined]
+        except Exception:
+            # Mirror loguru's behavior: a failing sink must not crash the application
+            traceback.print_exc(file=sys.stderr)
+
+
+class AggregatingSink:
+    """
+    A sink that sends log records to a LogAggregator in another process
+
+    Records are buffered and sent when the sink is flushed, which loguru does after every record.
+    When the sink is wrapped by a QueuedSink, all records that were queued are sent at once.
+
+    If the LogAggregator can't be reached, the records are dropped, an error is printed to stderr,
+    and the sink reconnects the next time it is flushed.
+
+    :param socket_path: The path of the Unix socket that the LogAggregator is listening on
+    """
+
+    def __init__(self, socket_path: Path):
+        self._socket_path = socket_path
+        self._socket: socket.socket | None = None
+        self._buffer = bytearray()
+        self._connection_failed = False
+        # Guards the buffer and the socket, since records may be written from several threads
+        self._lock = threading.Lock()
+
+    def write(self, message: str):
+        record = message.encode("utf8")
+        with self._lock:
+            self._buffer += _LENGTH_PREFIX.pack(len(record))
+            self._buffer += record
+
+            if len(self._buffer) >= _MAX_SEND_BUFFER_SIZE:
+                self._send()
+
+    def flush(self):
+        with self._lock:
+            self._send()
+
+    def stop(self):
+        """
+        Send any buffered records and close the connection
+        """
+        with self._lock:
+            self._send()
+            self._close()
+
+    def _send(self):
+        if not self._buffer:
+            return
+
+        try:
+            if self._socket is None:
+                self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self._socket.connect(str(self._socket_path))
+
+            self._socket.sendall(self._buffer)
+            self._connection_failed = False
+        except OSError:
+            self._close()
+            # Only the first of consecutive failures is reported, to avoid flooding stderr
+            if not self._connection_failed:
+                self._connection_failed = True
+                traceback.print_exc(file=sys.stderr)
+        finally:
+            self._buffer.clear()
+
+    def _close(self):
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+
+def _remove_stale_socket(socket_path: Path):
+    try:
+        mode = socket_path.lstat().st_mode
+    except FileNotFoundError:
+        return
+
+    if not stat.S_ISSOCK(mode):
+        raise ValueError(f"{socket_path} exists and is not a socket")
+
+    socket_path.unlink()
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Final
+
+import loguru
+
+from service_kit import ServiceKitBaseModel
+
+INDEX_FILE_SUFFIX: Final[str] = ".idx"
+INDEXED_FIELDS: Final[tuple[str, ...]] = ("request_id", "error_type")
+
+# The offsets of records at or above WARNING are indexed, since they are rare enough to be worth it
+_MIN_INDEXED_LEVEL_NO: Final[int] = 30
+# The offset of the first record of every minute is indexed, so that queries for a time range can
+# seek to it
+_TIME_CHECKPOINT_INTERVAL: Final[float] = 60.0
+
+
+class LogSegmentIndex(ServiceKitBaseModel):
+    """
+    An index of the records in a log file (segment)
+
+    All offsets are byte offsets of the start of a record in the uncompressed log file.
+    """
+
+    record_count: int = 0
+    start_time: float | None = None
+    """The POSIX timestamp of the first record"""
+    end_time: float | None = None
+    """The POSIX timestamp of the last record"""
+    level_counts: dict[str, int] = {}
+    """The number of records of each level"""
+    level_offsets: dict[str, list[int]] = {}
+    """The offsets of the records of each level at or above WARNING"""
+    time_offsets: list[tuple[float, int]] = []
+    """The POSIX timestamp and offset of the first record of every minute"""
+    field_offsets: dict[str, dict[str, list[int]]] = {}
+    """The offsets of the records with each value of each of the INDEXED_FIELDS"""
+
+
+class LogSegmentIndexer:
+    """
+    Builds the index of a log file as records are written to it
+    """
+
+    def __init__(self):
+        self._record_count = 0
+        self._start_time: float | None = None
+        self._end_time: float | None = None
+        self._next_time_checkpoint = float("-inf")
+        self._level_counts: dict[str, int] = {}
+        self._level_offsets: dict[str, list[int]] = {}
+        self._time_offsets: list[tuple[float, int]] = []
+        self._field_offsets: dict[str, dict[str, list[int]]] = {
+            field: {} for field in INDEXED_FIELDS
+        }
+
+    def add(self, record: loguru.Record, offset: int):
+        """
+        Add a record to the index
+
+        :param record: The record
+        :param offset: The byte offset at which the record was written
+        """
+        timestamp = record["time"].timestamp()
+        if self._start_time is None:
+            self._start_time = timestamp
+        self._end_time = timestamp
+
+        if timestamp >= self._next_time_checkpoint:
+            self._time_offsets.append((timestamp, offset))
+            self._next_time_checkpoint = timestamp + _TIME_CHECKPOINT_INTERVAL
+
+        level = record["level"]
+        self._level_counts[level.name] = self._level_counts.get(level.name, 0) + 1
+        if level.no >= _MIN_INDEXED_LEVEL_NO:
+            self._level_offsets.setdefault(level.name, []).append(offset)
+
+        extra = record["extra"]
+        for field, offsets in self._field_offsets.items():
+            value = extra.get(field)
+            if value is not None:
+                offsets.setdefault(str(value), []).append(offset)
+
+        self._record_count += 1
+
+    def build(self) -> LogSegmentIndex:
+        return LogSegmentIndex(
+            record_count=self._record_count,
+            start_time=self._start_time,
+            end_time=self._end_time,
+            level_counts=self._level_counts,
+            level_offsets=self._level_offsets,
+            time_offsets=self._time_offsets,
+            field_offsets=self._field_offsets,
+        )
+
+
+def write_index(index: LogSegmentIndex, path: Path):
+    """
+    Write a log segment index to a file
+
+    :param index: The index to write
+    :param path: The path of the index file
+    """
+    temporary_path = path.with_name(path.name + ".tmp")
+    with open(
+        temporary_path, "w", encoding="utf8", opener=lambda p, flags: os.open(p, flags, 0o600)
+    ) as index_file:
+        json.dump(index.to_json_dict(), index_file, separators=(",", ":"))
+
+    os.replace(temporary_path, path)
+
+
+def read_index(path: Path) -> LogSegmentIndex | None:
+    """
+    Read a log segment index from a file
+
+    :param path: The path of the index file
+    :return: The index, or None if the file doesn't exist
+    """
+    try:
+        with open(path, encoding="utf8") as index_file:
+            return LogSegmentIndex(**json.load(index_file))
+    except FileNotFoundError:
+        return None
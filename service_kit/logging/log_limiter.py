@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Hashable, Sequence
+from enum import StrEnum
+from itertools import count
+from typing import Final
+
+import loguru
+from pydantic import PositiveFloat, PositiveInt
+
+from service_kit import ServiceKitBaseModel
+
+from . import LogLevel
+
+# Bounds the memory used by rate limits that are keyed by message
+_MAX_RATE_LIMIT_KEYS: Final[int] = 10000
+
+
+class RateLimitKey(StrEnum):
+    """
+    Which log records share a rate limit
+    """
+
+    CALL_SITE = "call_site"
+    """Records that are logged from the same line of code"""
+    MESSAGE = "message"
+    """Records that have the same message"""
+
+
+class LogSamplingRule(ServiceKitBaseModel):
+    """
+    Keeps only one in every `keep_one_in` log records that match the rule
+
+    A record matches the rule if it matches all of the criteria that are set. If no criteria are
+    set, the rule matches all records.
+    """
+
+    level: LogLevel | None = None
+    """The level of the records that the rule applies to"""
+    message: str | None = None
+    """The message of the records that the rule applies to"""
+    keep_one_in: PositiveInt
+    """Only the first of every `keep_one_in` matching records is logged"""
+
+
+class LogRateLimit(ServiceKitBaseModel):
+    """
+    A token bucket rate limit for log records
+
+    Each key (see RateLimitKey) has its own bucket, which holds up to `burst` tokens and is refilled
+    at `records_per_second`. A record is logged only if a token can be taken from its bucket.
+    """
+
+    records_per_second: PositiveFloat
+    """The sustained number of records per second that are logged for each key"""
+    burst: PositiveInt = 10
+    """The number of records that can be logged at once for each key"""
+    key: RateLimitKey = RateLimitKey.CALL_SITE
+    """Which records share a rate limit"""
+
+
+class SuppressedRecords:
+    """
+    The log records that were suppressed at a single call site since the last summary
+    """
+
+    __slots__ = ("call_site", "count", "level", "last_message")
+
+    def __init__(self, call_site: str, level: loguru.RecordLevel):
+        self.call_site = call_site
+        self.count = 0
+        self.level = level
+        self.last_message = ""
+
+
+class _TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class LogLimiter:
+    """
+    Decides which log records are suppressed by sampling and rate limiting
+
+    Sampling is applied first, so records that are sampled out do not count toward a rate limit.
+
+    :param sampling_rules: The sampling rules. Only the first rule that matches a record is applied.
+    :param rate_limit: An optional rate limit
+    :param summary_interval: The minimum number of seconds between summaries of suppressed records
+    :param min_level_no: Records below this level number are never suppressed or counted, since no
+                         sink writes them, e.g. records that are only kept by the flight recorder
+                         (default: 0)
+    """
+
+    def __init__(
+        self,
+        sampling_rules: Sequence[LogSamplingRule] = (),
+        rate_limit: LogRateLimit | None = None,
+        summary_interval: float = 60.0,
+        min_level_no: int = 0,
+    ):
+        self._sampling_rules = tuple((rule, count()) for rule in sampling_rules)
+        self._rate_limit = rate_limit
+        self._summary_interval = summary_interval
+        self._min_level_no = min_level_no
+
+        self._buckets: dict[Hashable, _TokenBucket] = {}
+        self._suppressed: dict[str, SuppressedRecords] = {}
+        self._next_summary = time.monotonic() + summary_interval
+        self._lock = threading.Lock()
+
+    def should_log(self, record: loguru.Record) -> bool:
+        """
+        Decide whether a record should be logged, and count it if it is suppressed
+
+        :param record: The record to decide on
+        :return: False if the record is suppressed, True otherwise
+        """
+        if record["level"].no < self._min_level_no:
+            return True
+
+        with self._lock:
+            if self._is_sampled_out(record) or self._is_rate_limited(record):
+                self._count_suppressed(record)
+                return False
+
+        return True
+
+    def pop_summaries(self) -> list[SuppressedRecords]:
+        """
+        Get the records that were suppressed since the last summary
+
+        :return: The suppressed records, grouped by call site, if at least `summary_interval`
+                 seconds have passed since the last summary. Otherwise, an empty list.
+        """
+        now = time.monotonic()
+        if now < self._next_summary:
+            return []
+
+        with self._lock:
+            if now < self._next_summary:
+                return []
+
+            self._next_summary = now + self._summary_interval
+            summaries = list(self._suppressed.values())
+            self._suppressed.clear()
+
+        return summaries
+
+    def _is_sampled_out(self, record: loguru.Record) -> bool:
+        for rule, counter in self._sampling_rules:
+            if rule.level is not None and record["level"].name != rule.level:
+                continue
+            if rule.message is not None and record["message"] != rule.message:
+                continue
+
+            return next(counter) % rule.keep_one_in != 0
+
+        return False
+
+    def _is_rate_limited(self, record: loguru.Record) -> bool:
+        if self._rate_limit is None:
+            return False
+
+        key: Hashable
+        if self._rate_limit.key == RateLimitKey.CALL_SITE:
+            key = _get_call_site(record)
+        else:
+            key = record["message"]
+
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= _MAX_RATE_LIMIT_KEYS:
+                # Evict the least recently created bucket
+                del self._buckets[next(iter(self._buckets))]
+
+            bucket = _TokenBucket(self._rate_limit.burst, now)
+            self._buckets[key] = bucket
+        else:
+            bucket.tokens = min(
+                self._rate_limit.burst,
+                bucket.tokens + (now - bucket.updated) * self._rate_limit.records_per_second,
+            )
+            bucket.updated = now
+
+        if bucket.tokens < 1:
+            return True
+
+        bucket.tokens -= 1
+        return False
+
+    def _count_suppressed(self, record: loguru.Record):
+        call_site = _get_call_site(record)
+
+        suppressed = self._suppressed.get(call_site)
+        if suppressed is None:
+            suppressed = SuppressedRecords(call_site, record["level"])
+            self._suppressed[call_site] = suppressed
+        elif record["level"].no > suppressed.level.no:
+            suppressed.level = record["level"]
+
+        suppressed.count += 1
+        suppressed.last_message = record["message"]
+
+
+def _get_call_site(record: loguru.Record) -> str:
+    # Identifies the line of code that logged a record, both for rate limits and for summaries
+    return f"{record['name']}:{record['function']}:{record['line']}"
@@ -0,0 +1,267 @@
+import gzip
+import json
+from collections.abc import Iterable, Iterator
+from contextlib import AbstractContextManager
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Annotated, Any, BinaryIO, Final
+
+from pydantic import AfterValidator
+
+from service_kit import ServiceKitBaseModel
+
+from . import LogLevel
+from .file_sink import compile_file_name_pattern, get_file_name_template, get_index_path
+from .log_index import INDEXED_FIELDS, LogSegmentIndex, read_index
+
+_TIMESTAMP_FORMAT: Final[str] = "%Y-%m-%d %H:%M:%S:%f %z"
+_LEVEL_NUMBERS: Final[dict[str, int]] = {
+    LogLevel.TRACE: 5,
+    LogLevel.DEBUG: 10,
+    LogLevel.INFO: 20,
+    LogLevel.SUCCESS: 25,
+    LogLevel.WARNING: 30,
+    LogLevel.ERROR: 40,
+    LogLevel.CRITICAL: 50,
+}
+# The lowest level whose records have their offsets indexed (see LogSegmentIndex.level_offsets)
+_MIN_INDEXED_LEVEL: Final[LogLevel] = LogLevel.WARNING
+
+
+def _to_aware_time(time: datetime | None) -> datetime | None:
+    # Log records have timezone-aware timestamps, which can't be compared with naive times
+    if time is not None and time.tzinfo is None:
+        return time.astimezone()
+
+    return time
+
+
+class LogQuery(ServiceKitBaseModel):
+    """
+    Criteria that log records must match. Only the criteria that are set are applied.
+    """
+
+    request_id: str | None = None
+    error_type: str | None = None
+    min_level: LogLevel | None = None
+    """Only records at or above this level match"""
+    since: Annotated[datetime | None, AfterValidator(_to_aware_time)] = None
+    """Only records that were logged at or after this time match. Naive times are local."""
+    until: Annotated[datetime | None, AfterValidator(_to_aware_time)] = None
+    """Only records that were logged before this time match. Naive times are local."""
+
+
+def query_logs(log_directory: Path, query: LogQuery, prefix: str | None = None) -> Iterator[str]:
+    """
+    Find the log records that match a query
+
+    Log files are read in the order in which they were created. Files that were written with an
+    index are only read at the offsets of records that may match the query, or skipped entirely if
+    none of their records can match. Compressed files are decompressed as they are read.
+
+    .. note::
+        A file's index is only written when the file is rotated or the sink is stopped, so the
+        file that is currently being written is always scanned in full.
+
+    :param log_directory: The directory that contains the log files
+    :param query: The criteria that records must match
+    :param prefix: The prefix of the log files to read, if they were written with a prefix
+    :return: The matching records, as JSON strings
+    """
+    for log_file in _find_log_files(log_directory, prefix):
+        index = read_index(get_index_path(log_file))
+        if index is None:
+            yield from _scan(log_file, query)
+        else:
+            yield from _query_segment(log_file, index, query)
+
+
+def _find_log_files(log_directory: Path, prefix: str | None) -> list[Path]:
+    file_name_pattern = compile_file_name_pattern(get_file_name_template(prefix))
+    log_files = [
+        path
+        for path in log_directory.iterdir()
+        if file_name_pattern.fullmatch(path.name) and path.is_file()
+    ]
+
+    # After the prefix, file names start with the time at which the file was created
+    return sorted(log_files, key=lambda path: path.name)
+
+
+def _query_segment(log_file: Path, index: LogSegmentIndex, query: LogQuery) -> Iterator[str]:
+    if not _may_contain_matches(index, query):
+        return
+
+    offsets = _get_candidate_offsets(index, query)
+    if offsets is None:
+        yield from _scan(log_file, query, _get_start_offset(index, query))
+    else:
+        yield from _read_at_offsets(log_file, offsets, query)
+
+
+def _may_contain_matches(index: LogSegmentIndex, query: LogQuery) -> bool:
+    if index.record_count == 0 or index.start_time is None or index.end_time is None:
+        return False
+
+    if query.since is not None and index.end_time < query.since.timestamp():
+        return False
+
+    if query.until is not None and index.start_time >= query.until.timestamp():
+        return False
+
+    if query.min_level is not None and not any(
+        _is_at_or_above(level, query.min_level) for level in index.level_counts
+    ):
+        return False
+
+    for field, value in _get_indexed_criteria(query):
+        if value not in index.field_offsets.get(field, {}):
+            return False
+
+    return True
+
+
+def _get_candidate_offsets(index: LogSegmentIndex, query: LogQuery) -> list[int] | None:
+    # Returns None if the offsets of the records that may match the query are not indexed
+    candidates: set[int] | None = None
+
+    for field, value in _get_indexed_criteria(query):
+        offsets = set(index.field_offsets[field][value])
+        candidates = offsets if candidates is None else candidates & offsets
+
+    if query.min_level is not None and _is_at_or_above(query.min_level, _MIN_INDEXED_LEVEL):
+        offsets = {
+            offset
+            for level, level_offsets in index.level_offsets.items()
+            if _is_at_or_above(level, query.min_level)
+            for offset in level_offsets
+        }
+        candidates = offsets if candidates is None else candidates & offsets
+
+    return sorted(candidates) if candidates is not None else None
+
+
+def _get_indexed_criteria(query: LogQuery) -> Iterator[tuple[str, str]]:
+    for field in INDEXED_FIELDS:
+        value = getattr(query, field)
+        if value is not None:
+            yield field, value
+
+
+def _get_start_offset(index: LogSegmentIndex, query: LogQuery) -> int:
+    if query.since is None:
+        return 0
+
+    # Records are written in chronological order, so any record at or after `since` comes after
+    # the last checkpoint before it
+    since = query.since.timestamp()
+    start_offset = 0
+    for timestamp, offset in index.time_offsets:
+        if timestamp > since:
+            break
+        start_offset = offset
+
+    return start_offset
+
+
+def _scan(log_file: Path, query: LogQuery, start_offset: int = 0) -> Iterator[str]:
+    with _open_log_file(log_file) as file:
+        if start_offset:
+            file.seek(start_offset)
+
+        yield from _filter_records(_read_records(file), query)
+
+
+def _read_at_offsets(log_file: Path, offsets: Iterable[int], query: LogQuery) -> Iterator[str]:
+    with _open_log_file(log_file) as file:
+        for offset in offsets:
+            # Compressed files can only be read forward, so offsets must be sorted
+            file.seek(offset)
+            yield from _filter_records(islice(_read_records(file), 1), query)
+
+
+def _read_records(file: BinaryIO) -> Iterator[bytes]:
+    # Records are either written on a single line or pretty-printed, in which case they start with
+    # a "{" line and end with a "}" line. Any other lines, e.g. tracebacks, are yielded as they are.
+    record_lines: list[bytes] = []
+    for line in file:
+        stripped_line = line.rstrip(b"\r\n")
+        if record_lines:
+            record_lines.append(line)
+            if stripped_line == b"}":
+                yield b"".join(record_lines)
+                record_lines = []
+        elif stripped_line == b"{":
+            record_lines.append(line)
+        else:
+            yield line
+
+
+def _filter_records(records: Iterable[bytes], query: LogQuery) -> Iterator[str]:
+    # Records that don't contain the values of the indexed criteria are skipped without parsing them
+    # if the values don't need to be escaped in JSON
+    required_values = tuple(
+        value.encode()
+        for _, value in _get_indexed_criteria(query)
+        if value.isascii() and json.dumps(value)[1:-1] == value
+    )
+
+    for record_bytes in records:
+        if not all(value in record_bytes for value in required_values):
+            continue
+
+        text = record_bytes.decode("utf8").rstrip("\r\n")
+        if not text:
+            continue
+
+        try:
+            record = json.loads(text)
+        except json.JSONDecodeError:
+            # Lines that are not records, e.g. tracebacks, are skipped
+            continue
+
+        if isinstance(record, dict) and _matches(record, query):
+            yield text
+
+
+def _matches(record: dict[str, Any], query: LogQuery) -> bool:
+    for field, value in _get_indexed_criteria(query):
+        if str(record.get(field)) != value:
+            return False
+
+    if query.min_level is not None and not _is_at_or_above(
+        record.get("level", ""), query.min_level
+    ):
+        return False
+
+    if query.since is not None or query.until is not None:
+        try:
+            timestamp = datetime.strptime(record["timestamp"], _TIMESTAMP_FORMAT)
+        except (KeyError, ValueError):
+            return False
+
+        if query.since is not None and timestamp < query.since:
+            return False
+        if query.until is not None and timestamp >= query.until:
+            return False
+
+    return True
+
+
+def _is_at_or_above(level: str, min_level: str) -> bool:
+    # Unknown (custom) levels are always considered to match
+    level_no = _LEVEL_NUMBERS.get(level)
+    return level_no is None or level_no >= _LEVEL_NUMBERS[min_level]
+
+
+def _open_log_file(log_file: Path) -> AbstractContextManager[BinaryIO]:
+    if log_file.name.endswith(".gz"):
+        return gzip.open(log_file, "rb")  # type: ignore[return-value]
+
+    if log_file.name.endswith(".zst"):
+        import zstandard
+
+        return zstandard.open(log_file, "rb")  # type: ignore[return-value]
+
+    return open(log_file, "rb")
@@ -0,0 +1,186 @@
+import heapq
+import sys
+import threading
+import traceback
+from collections import deque
+from enum import StrEnum
+from itertools import count
+from typing import Any, Final, Protocol
+
+from service_kit import ServiceKitBaseModel
+
+# Records below INFO are the first to be dropped by OverflowPolicy.DROP_DEBUG_FIRST
+_LOW_PRIORITY_THRESHOLD: Final[int] = 20
+
+
+class OverflowPolicy(StrEnum):
+    """
+    What a QueuedSink does with a new record when its queue is full
+    """
+
+    BLOCK = "block"
+    """Wait until the writer thread makes room in the queue"""
+    DROP_NEWEST = "drop_newest"
+    """Drop the new record"""
+    DROP_DEBUG_FIRST = "drop_debug_first"
+    """
+    Drop the new record if it is below INFO. Otherwise, drop the oldest queued record that is below
+    INFO, or wait if there is none.
+    """
+
+
+class QueuedSinkStatistics(ServiceKitBaseModel):
+    queued: int
+    """The number of records that have been added to the queue"""
+    dropped: int
+    """The number of records that have been dropped because the queue was full"""
+    written: int
+    """The number of records that have been written to the sink"""
+
+
+class _Writable(Protocol):
+    def write(self, message: str) -> Any: ...
+
+
+class QueuedSink:
+    """
+    A sink that moves writes to another sink off of the logging thread
+
+    Records are added to a bounded in-memory queue which is drained by a writer thread. The writer
+    thread writes all records that are queued at once, and then flushes the wrapped sink if it has a
+    `flush()` method.
+
+    :param sink: The sink to write records to. It must have a `write()` method. If it has `flush()`
+                 or `stop()` methods, they will be called as well.
+    :param max_size: The maximum number of records that can be waiting in the queue
+    :param overflow_policy: What to do with new records when the queue is full
+    """
+
+    def __init__(
+        self,
+        sink: _Writable,
+        max_size: int = 10000,
+        overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+    ):
+        if max_size < 1:
+            raise ValueError("The maximum queue size must be at least 1")
+
+        self._sink = sink
+        self._max_size = max_size
+        self._overflow_policy = overflow_policy
+
+        # Records are split by priority so that OverflowPolicy.DROP_DEBUG_FIRST can drop the oldest
+        # low priority record in constant time. The sequence numbers preserve the original order.
+        self._records: deque[tuple[int, str]] = deque()
+        self._low_priority_records: deque[tuple[int, str]] = deque()
+        self._sequence = count()
+        self._condition = threading.Condition()
+        self._stopped = False
+
+        self._queued = 0
+        self._dropped = 0
+        self._written = 0
+
+        self._writer = threading.Thread(target=self._write_records, name="log-writer", daemon=True)
+        self._writer.start()
+
+    @property
+    def statistics(self) -> QueuedSinkStatistics:
+        with self._condition:
+            return QueuedSinkStatistics(
+                queued=self._queued, dropped=self._dropped, written=self._written
+            )
+
+    def write(self, message: str):
+        is_low_priority = self._is_low_priority(message)
+
+        with self._condition:
+            if self._size() >= self._max_size and not self._make_room(is_low_priority):
+                self._dropped += 1
+                return
+
+            queue = self._low_priority_records if is_low_priority else self._records
+            queue.append((next(self._sequence), message))
+            self._queued += 1
+            self._condition.notify_all()
+
+    def stop(self):
+        """
+        Write all queued records and stop the writer thread
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+        self._writer.join()
+
+        if callable(getattr(self._sink, "stop", None)):
+            self._sink.stop()  # type: ignore[attr-defined]
+
+    def _is_low_priority(self, message: str) -> bool:
+        if self._overflow_policy != OverflowPolicy.DROP_DEBUG_FIRST:
+            return False
+
+        record = getattr(message, "record", None)
+        if record is None:
+            return False
+
+        return record["level"].no < _LOW_PRIORITY_THRESHOLD
+
+    def _size(self) -> int:
+        return len(self._records) + len(self._low_priority_records)
+
+    def _make_room(self, is_low_priority: bool) -> bool:
+        # Returns False if the new record should be dropped
+        if self._overflow_policy == OverflowPolicy.DROP_NEWEST:
+            return False
+
+        if self._overflow_policy == OverflowPolicy.DROP_DEBUG_FIRST:
+            if is_low_priority:
+                return False
+
+            if self._low_priority_records:
+                self._low_priority_records.popleft()
+                self._dropped += 1
+                return True
+
+        self._condition.wait_for(lambda: self._size() < self._max_size or self._stopped)
+        return True
+
+    def _write_records(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._size() > 0 or self._stopped)
+                if self._size() == 0:
+                    return
+
+                records = self._take_all_records()
+                self._condition.notify_all()
+
+            try:
+                for message in records:
+                    self._sink.write(message)
+
+                if callable(getattr(self._sink, "flush", None)):
+                    self._sink.flush()  # type: ignore[attr-defined]
+            except Exception:
+                # Mirror loguru's behavior: a failing sink must not crash the application
+                traceback.print_exc(file=sys.stderr)
+
+            with self._condition:
+                self._written += len(records)
+
+    def _take_all_records(self) -> list[str]:
+        if not self._low_priority_records:
+            records = [message for _, message in self._records]
+        elif not self._records:
+            records = [message for _, message in self._low_priority_records]
+        else:
+            records = [
+                message for _, message in heapq.merge(self._records, self._low_priority_records)
+            ]
+
+        self._records.clear()
+        self._low_priority_records.clear()
+
+        return records
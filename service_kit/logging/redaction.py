@@ -0,0 +1,208 @@
+import re
+from collections.abc import Iterable, Mapping
+from typing import Any, Final
+
+from pydantic import PositiveInt
+
+from service_kit import ServiceKitBaseModel
+
+DEFAULT_REDACTED_KEYS: Final[frozenset[str]] = frozenset(
+    {
+        "access_token",
+        "api_key",
+        "apikey",
+        "authorization",
+        "client_secret",
+        "cookie",
+        "passwd",
+        "password",
+        "private_key",
+        "proxy-authorization",
+        "refresh_token",
+        "secret",
+        "set-cookie",
+        "token",
+        "x-api-key",
+    }
+)
+_SCALAR_TYPES: Final[frozenset[type]] = frozenset({int, float, bool, type(None)})
+# The types that are never redacted if the policy has no value patterns
+_UNREDACTED_TYPES: Final[frozenset[type]] = _SCALAR_TYPES | {str}
+# Bounds the memory used to cache which keys are sensitive
+_MAX_CACHED_KEYS: Final[int] = 10000
+
+
+class RedactionPolicy(ServiceKitBaseModel):
+    """
+    Which fields of log records are redacted
+
+    The policy is applied to all fields of a record, including the fields of nested mappings,
+    sequences, and ServiceKitBaseModels.
+    """
+
+    keys: frozenset[str] = DEFAULT_REDACTED_KEYS
+    """The (case-insensitive) keys whose values are redacted"""
+    key_patterns: tuple[str, ...] = ()
+    """Regular expressions that are searched for in keys. Matching keys' values are redacted."""
+    value_patterns: tuple[str, ...] = ()
+    """Regular expressions whose matches in string values are redacted"""
+    max_depth: PositiveInt = 8
+    """
+    Mappings and sequences that are nested more deeply than this are redacted as a whole. The value
+    of a record's field has a depth of 1.
+    """
+    replacement: str = "********"
+    """The string that redacted values are replaced with"""
+
+
+class Redactor:
+    """
+    Applies a RedactionPolicy to log records
+
+    The policy's patterns are compiled once, and whether a key is sensitive is cached, so that
+    redacting a record is a single pass over its fields. Mappings and sequences are only copied if
+    some of their contents are redacted, so the logged objects are never modified. A Redactor can
+    be used by several threads at once.
+
+    :param policy: The policy to apply
+    """
+
+    def __init__(self, policy: RedactionPolicy):
+        self._keys = frozenset(key.lower() for key in policy.keys)
+        self._key_pattern = _compile_patterns(policy.key_patterns, re.IGNORECASE)
+        self._value_pattern = _compile_patterns(policy.value_patterns)
+        self._max_depth = policy.max_depth
+        self._replacement = policy.replacement
+
+        # The keys that have been seen, and which of them are sensitive. The keys of a mapping are
+        # checked against these with set operations, rather than one by one. The sets are never
+        # modified, but replaced together, so that other threads always see a consistent pair.
+        self._key_cache: tuple[frozenset[Any], frozenset[Any]] = (frozenset(), frozenset())
+
+    def redact(self, fields: dict[str, Any]) -> dict[str, Any]:
+        """
+        Redact the fields of a log record
+
+        :param fields: The fields of the log record
+        :return: The redacted fields, or `fields` itself if nothing was redacted
+        """
+        return self._redact_mapping(fields, 0)  # type: ignore[return-value]
+
+    def _redact(self, value: Any, depth: int) -> Any:
+        # The exact types of the most common values are checked first, since isinstance() is
+        # comparatively slow, especially for pydantic models
+        value_type = type(value)
+        if value_type is str:
+            return self._redact_string(value)
+
+        if value_type in _SCALAR_TYPES:
+            return value
+
+        if value_type is dict:
+            return self._redact_mapping(value, depth + 1)
+
+        if value_type is list or value_type is tuple:
+            return self._redact_sequence(value, depth + 1)
+
+        if isinstance(value, str):
+            return self._redact_string(value)
+
+        if isinstance(value, ServiceKitBaseModel):
+            value = value.to_json_dict()
+
+        if isinstance(value, dict):
+            return self._redact_mapping(value, depth + 1)
+
+        if isinstance(value, (list, tuple)):
+            return self._redact_sequence(value, depth + 1)
+
+        if isinstance(value, Mapping):
+            # E.g. HTTP headers, which are only converted if the record is serialized
+            return self._redact_mapping(dict(value.items()), depth + 1)
+
+        return value
+
+    def _redact_mapping(self, mapping: dict, depth: int) -> dict | str:
+        if depth > self._max_depth:
+            return self._replacement
+
+        keys = mapping.keys()
+        seen_keys, cached_sensitive_keys = self._key_cache
+        if not seen_keys.issuperset(keys):
+            seen_keys, cached_sensitive_keys = self._learn_keys(keys)
+
+        redacted = None
+        sensitive_keys = keys & cached_sensitive_keys
+        if sensitive_keys:
+            redacted = dict(mapping)
+            for key in sensitive_keys:
+                redacted[key] = self._replacement
+
+        # This is the hot loop, so the most common values (strings and scalars) are skipped without
+        # calling any other methods
+        skipped_types = _SCALAR_TYPES if self._value_pattern is not None else _UNREDACTED_TYPES
+        for key, value in mapping.items():
+            if type(value) in skipped_types or key in sensitive_keys:
+                continue
+
+            redacted_value = self._redact(value, depth)
+            if redacted_value is not value:
+                if redacted is None:
+                    redacted = dict(mapping)
+                redacted[key] = redacted_value
+
+        return mapping if redacted is None else redacted
+
+    def _redact_sequence(self, sequence: list | tuple, depth: int) -> list | tuple | str:
+        if depth > self._max_depth:
+            return self._replacement
+
+        redacted = None
+        for i, value in enumerate(sequence):
+            redacted_value = self._redact(value, depth)
+            if redacted_value is not value:
+                if redacted is None:
+                    redacted = list(sequence)
+                redacted[i] = redacted_value
+
+        return sequence if redacted is None else redacted
+
+    def _redact_string(self, value: str) -> str:
+        if self._value_pattern is None:
+            return value
+
+        redacted_value, count = self._value_pattern.subn(self._replacement, value)
+        return redacted_value if count else value
+
+    def _learn_keys(self, keys: Iterable[Any]) -> tuple[frozenset[Any], frozenset[Any]]:
+        # Returns the new cache, which includes all of the keys. If another thread replaces the
+        # cache at the same time, some keys may have to be learned again, but no key is ever
+        # missing from the sets that the caller uses.
+        seen_keys, sensitive_keys = self._key_cache
+        if len(seen_keys) >= _MAX_CACHED_KEYS:
+            seen_keys, sensitive_keys = frozenset(), frozenset()
+
+        new_keys = frozenset(keys) - seen_keys
+        new_sensitive_keys = {
+            key
+            for key in new_keys
+            if isinstance(key, str)
+            and (
+                key.lower() in self._keys
+                or (self._key_pattern is not None and self._key_pattern.search(key) is not None)
+            )
+        }
+
+        key_cache = (seen_keys | new_keys, sensitive_keys | new_sensitive_keys)
+        self._key_cache = key_cache
+
+        return key_cache
+
+
+def _compile_patterns(patterns: Iterable[str], flags: int = 0) -> re.Pattern | None:
+    patterns = tuple(patterns)
+    if not patterns:
+        return None
+
+    # A single alternation is searched in one pass, rather than searching for each pattern
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), flags)
@@ -5,31 +5,63 @@ import warnings
 from pathlib import Path
 from typing import Final
 
-import yaml
+from service_kit import ServiceKitBaseModel
 
 from . import logger
+from .git_repository import GitRepository, GitRepositoryError
 
 GIT: Final[str | None] = shutil.which("git")
+UNKNOWN: Final[str] = "UNKNOWN"
 
 
-def log_startup_information(git_status_yaml_path: Path | None = None):
+class GitStatus(ServiceKitBaseModel):
+    """
+    The status of a git repository
+    """
+
+    commit: str
+    """The ID of the commit that HEAD points to"""
+    parents: list[str]
+    """The IDs of the commit's parents"""
+    status: str
+    """Whether the worktree is "clean" or "dirty", or "UNKNOWN" """
+    tags: list[str]
+    """The tags that point to the commit"""
+
+
+UNKNOWN_GIT_STATUS: Final[GitStatus] = GitStatus(
+    commit=UNKNOWN, parents=[UNKNOWN], status=UNKNOWN, tags=[]
+)
+
+
+def log_startup_information(
+    git_status_yaml_path: Path | None = None,
+    prefer_git_status_yaml: bool = False,
+    check_worktree: bool = False,
+):
     log_python_version()
-    log_git_status(git_status_yaml_path)
+    log_git_status(git_status_yaml_path, prefer_git_status_yaml, check_worktree)
 
 
 def log_python_version():
     logger.info("Python version", version=sys.version)
 
 
-def log_git_status(git_status_yaml_path: Path | None = None):
+def log_git_status(
+    git_status_yaml_path: Path | None = None,
+    prefer_git_status_yaml: bool = False,
+    check_worktree: bool = False,
+):
     """
     Log the status of the current git repository
 
     Logs the commit ID, parent commit IDs, repository status (clean or dirty), and any tags
-    associated with the current HEAD at the INFO level. Optionally, this function accepts a path
-    to a YAML file. If, and only if, the current directory is not a git repository, or the `git`
-    command is not available, the status can be read from the YAML file instead. Note, however,
-    that this function cannot guarantee the accuracy of the information in the YAML file.
+    associated with the current HEAD at the INFO level. The commit, its parents, and its tags are
+    read directly from the `.git` directory (see `get_git_status()`). Optionally, this function
+    accepts a path to a YAML file. If the current directory is not a git repository, or it can't be
+    read, or `git` is not installed and the file exists, the status is read from the YAML file
+    instead. Note, however, that this function cannot guarantee the accuracy of the information in
+    the YAML file.
 
     Example YAML file:
         commit: "3db2b4fbc9db2635b4ae6411496132f6d985426e"
@@ -39,45 +71,123 @@ def log_git_status(git_status_yaml_path: Path | None = None):
         tags:
         - test-tag
 
+    .. note::
+        The status of the worktree is "UNKNOWN" unless `check_worktree` is set, since checking it
+        runs `git diff-index`, which can be slow in large repositories. To log it without reading
+        the repository at startup at all, write the YAML file when the service is built, with
+        `write_git_status_yaml()` or `service-kit git-status`, and set `prefer_git_status_yaml`.
+
     :param git_status_yaml_path: Optional path to a YAML file containing git status information.
+    :param prefer_git_status_yaml: Whether to read the status from the YAML file whenever it
+                                   exists, instead of from the git repository (default: False)
+    :param check_worktree: Whether to check if the worktree is clean with `git diff-index`
+                           (default: False)
     """
-    if GIT is None:
-        logger.warning("Command `git` not found")
-        commit_id, parents, status, tags = _read_yaml_file(git_status_yaml_path)
-    elif not _pwd_in_git_repository():
-        logger.warning("Failed to identify a git repository")
-        commit_id, parents, status, tags = _read_yaml_file(git_status_yaml_path)
+    if (
+        (prefer_git_status_yaml or GIT is None)
+        and git_status_yaml_path is not None
+        and git_status_yaml_path.is_file()
+    ):
+        git_status = _read_yaml_file(git_status_yaml_path)
+    elif (repository_git_status := get_git_status(check_worktree=check_worktree)) is not None:
+        git_status = repository_git_status
     else:
-        commit_id = _get_commit_id()
-        parents = _get_parents()
-        status = _get_repository_status()
-        tags = _get_tags()
+        logger.warning("Failed to identify a git repository")
+        git_status = _read_yaml_file(git_status_yaml_path)
 
     logger.info(
         "Identified the currently running code",
-        commit=commit_id,
-        parents=parents,
-        status=status,
-        tags=tags,
+        commit=git_status.commit,
+        parents=git_status.parents,
+        status=git_status.status,
+        tags=git_status.tags,
     )
 
 
-def _read_yaml_file(
-    git_status_yaml_path: Path | None,
-) -> tuple[str, list[str], str, list[str]]:
-    unknown_git_status: tuple[str, list[str], str, list[str]] = (
-        "UNKNOWN",
-        ["UNKNOWN"],
-        "UNKNOWN",
-        [],
+def get_git_status(
+    repository_path: Path | None = None, check_worktree: bool = False
+) -> GitStatus | None:
+    """
+    Get the status of a git repository
+
+    The commit that HEAD points to, its parents, and its tags are read directly from the `.git`
+    directory, without running `git`. If the repository can't be read directly (e.g. it uses
+    SHA-256 object IDs), `git` is run instead, if it's installed.
+
+    :param repository_path: A path in the repository's worktree (default: the current directory)
+    :param check_worktree: Whether to check if the worktree is clean with `git diff-index`. If
+                           not, or if `git` is not installed, the status is "UNKNOWN".
+                           (default: False)
+    :return: The status of the repository, or None if the path is not in a git repository, or
+             the repository can't be read
+    """
+    repository_path = repository_path or Path.cwd()
+    repository = GitRepository.find(repository_path)
+    if repository is None:
+        return None
+
+    try:
+        with repository:
+            commit_id = repository.resolve_head()
+            parents = repository.get_parents(commit_id)
+            tags = repository.get_tags(commit_id)
+    except (GitRepositoryError, OSError) as err:
+        if GIT is None:
+            logger.warning("Failed to read the git repository", error=str(err))
+            return None
+
+        logger.debug("Failed to read the git repository, running git instead", error=str(err))
+        commit_id = _get_commit_id(repository_path)
+        parents = _get_parents(repository_path)
+        tags = _get_tags(repository_path)
+
+    status = (
+        _get_repository_status(repository_path) if check_worktree and GIT is not None else UNKNOWN
     )
 
+    return GitStatus(commit=commit_id, parents=parents, status=status, tags=tags)
+
+
+def write_git_status_yaml(
+    git_status_yaml_path: Path, repository_path: Path | None = None
+) -> GitStatus:
+    """
+    Write the status of a git repository to a YAML file
+
+    This is meant to be run when a service is built, so that `log_git_status()` can read the
+    status from the file at startup instead of from the repository. Unlike at startup, the
+    worktree is checked, so the file records whether it was clean.
+
+    :param git_status_yaml_path: The path of the YAML file to write
+    :param repository_path: A path in the repository's worktree (default: the current directory)
+    :raises GitRepositoryError: If the path is not in a git repository, or it can't be read
+    :return: The status that was written
+    """
+    git_status = get_git_status(repository_path, check_worktree=True)
+    if git_status is None:
+        raise GitRepositoryError(
+            f"{repository_path or Path.cwd()} is not in a git repository that can be read"
+        )
+
+    # PyYAML is only imported if it's needed, since importing it is slow
+    import yaml
+
+    with open(git_status_yaml_path, "w") as f:
+        yaml.safe_dump(git_status.to_dict(), f, sort_keys=False)
+
+    return git_status
+
+
+def _read_yaml_file(git_status_yaml_path: Path | None) -> GitStatus:
     if git_status_yaml_path is None:
         logger.info("No git status YAML file provided")
-        return unknown_git_status
+        return UNKNOWN_GIT_STATUS
     else:
         logger.info("Attempting to retrieve the git status from a file")
 
+    # PyYAML is only imported if it's needed, since importing it is slow
+    import yaml
+
     try:
         with open(git_status_yaml_path, "r") as f:
             git_status = yaml.safe_load(f)
@@ -92,60 +202,51 @@ def _read_yaml_file(
                 DeprecationWarning,
             )
 
-        return (
-            git_status["commit"],
-            git_status.get("parents", ["UNKNOWN"]),
-            git_status["status"],
-            git_status["tags"],
+        return GitStatus(
+            commit=git_status["commit"],
+            parents=git_status.get("parents", [UNKNOWN]),
+            status=git_status["status"],
+            tags=git_status["tags"],
         )
     except FileNotFoundError:
         logger.warning(
             "The provided git status YAML file does not exist.", path=git_status_yaml_path
         )
-        return unknown_git_status
+        return UNKNOWN_GIT_STATUS
     except KeyError as err:
         logger.warning(
             "The provided git status YAML file is missing a required field.",
             path=git_status_yaml_path,
             field=str(err),
         )
-        return unknown_git_status
+        return UNKNOWN_GIT_STATUS
     except Exception as err:
         logger.warning(
             "Failed to read git status from YAML file",
             path=git_status_yaml_path,
             error=str(err),
         )
-        return unknown_git_status
+        return UNKNOWN_GIT_STATUS
 
 
-def _pwd_in_git_repository() -> bool:
-    try:
-        subprocess.run(
-            [GIT, "rev-parse", "--is-inside-work-tree"],  # type: ignore[list-item]
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-
-        return True
-    except subprocess.CalledProcessError:
-        return False
-
-
-def _get_commit_id():
+def _get_commit_id(repository_path: Path) -> str:
     process = subprocess.run(
-        [GIT, "rev-parse", "HEAD"], check=True, stdout=subprocess.PIPE, text=True  # type: ignore[list-item]  # noqa: E501
+        [GIT, "rev-parse", "HEAD"],  # type: ignore[list-item]
+        check=True,
+        stdout=subprocess.PIPE,
+        text=True,
+        cwd=repository_path,
     )
     return process.stdout.strip()
 
 
-def _get_parents():
+def _get_parents(repository_path: Path) -> list[str]:
     process = subprocess.run(
-        [GIT, "rev-list", "--parents", "-n", "1", "HEAD"],  # type: ignore[list-item]  # noqa: E501
+        [GIT, "rev-list", "--parents", "-n", "1", "HEAD"],  # type: ignore[list-item]
         check=True,
         stdout=subprocess.PIPE,
         text=True,
+        cwd=repository_path,
     )
     commits = process.stdout.strip().split()
 
@@ -155,22 +256,27 @@ def _get_parents():
     return parents
 
 
-def _get_repository_status():
+def _get_repository_status(repository_path: Path) -> str:
     try:
         subprocess.run(
             [GIT, "diff-index", "--quiet", "HEAD"],  # type: ignore[list-item]
             check=True,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
+            cwd=repository_path,
         )
         return "clean"
     except subprocess.CalledProcessError:
         return "dirty"
 
 
-def _get_tags():
+def _get_tags(repository_path: Path) -> list[str]:
     process = subprocess.run(
-        [GIT, "tag", "--points-at", "HEAD"], check=True, stdout=subprocess.PIPE, text=True  # type: ignore[list-item]  # noqa: E501
+        [GIT, "tag", "--points-at", "HEAD"],  # type: ignore[list-item]
+        check=True,
+        stdout=subprocess.PIPE,
+        text=True,
+        cwd=repository_path,
     )
     tags = process.stdout.strip().split("\n")
 
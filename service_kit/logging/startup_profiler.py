@@ -0,0 +1,129 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from service_kit.errors import StructuredError
+
+from . import logger
+
+
+class StartupBudgetExceededError(StructuredError):
+    """
+    Raised if a service takes longer than its startup budget to become ready
+    """
+
+
+class StartupProfiler:
+    """
+    Records how long each phase of a service's startup takes
+
+    The timeline starts when the profiler is created. The module-level `startup_profiler` is
+    created when `service_kit.logging` is first imported, which is typically shortly after the
+    process starts. Phases are recorded either by wrapping them with `phase()`, or by calling
+    `mark()` once they've ended. When the service is ready to accept requests, `finish()` logs a
+    single "Startup profile" record with the duration of each phase and the time to ready.
+
+    `finish()` resets the profiler, so that the startup can be profiled again if the service's
+    lifespan runs again in the same process. The timeline of the next startup starts when its first
+    phase starts.
+
+    Example:
+
+    .. code-block:: python
+
+        startup_profiler.mark("import")
+
+        async def setup(app: FastAPI) -> ServiceConfiguration:
+            with startup_profiler.phase("load_configuration"):
+                config = load_configuration()
+            with startup_profiler.phase("bootstrap_logging"):
+                await bootstrap_logging(app, config)
+
+            startup_profiler.finish(config.startup_time_budget)
+            return config
+    """
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._last_phase_end = self._start
+        self._phases: list[dict[str, Any]] = []
+        self._finished = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Record a phase of the startup
+
+        :param name: The name of the phase
+        """
+        start = time.perf_counter()
+        self._restart_if_finished(start)
+        try:
+            yield
+        finally:
+            self._record(name, start, time.perf_counter())
+
+    def mark(self, name: str):
+        """
+        Record a phase of the startup that started when the previous phase ended
+
+        This is useful for phases that can't be wrapped with `phase()`, e.g. importing the
+        service's modules.
+
+        :param name: The name of the phase, which has just ended
+        """
+        end = time.perf_counter()
+        self._restart_if_finished(end)
+        self._record(name, self._last_phase_end, end)
+
+    def finish(self, budget: float | None = None) -> dict[str, Any]:
+        """
+        Log the startup profile, once the service is ready to accept requests
+
+        :param budget: If set, the maximum number of seconds that the startup may take. If the
+                       time to ready exceeds it, the profile is logged as an error, and a
+                       StartupBudgetExceededError is raised, so that the service fails fast.
+                       (default: None)
+        :raises StartupBudgetExceededError: If the time to ready exceeds the budget
+        :return: The startup profile
+        """
+        end = time.perf_counter()
+        self._restart_if_finished(end)
+        time_to_ready = end - self._start
+        profile: dict[str, Any] = {
+            "phases": self._phases,
+            "time_to_ready_seconds": round(time_to_ready, 6),
+        }
+        self._phases = []
+        self._finished = True
+
+        if budget is None or time_to_ready <= budget:
+            logger.info("Startup profile", **profile)
+            return profile
+
+        logger.error("Startup profile", **profile, startup_time_budget_seconds=budget)
+        raise StartupBudgetExceededError(
+            "The service took longer than its startup budget to become ready",
+            time_to_ready_seconds=profile["time_to_ready_seconds"],
+            startup_time_budget_seconds=budget,
+        )
+
+    def _restart_if_finished(self, now: float):
+        if self._finished:
+            self._start = now
+            self._last_phase_end = now
+            self._finished = False
+
+    def _record(self, name: str, start: float, end: float):
+        self._phases.append(
+            {
+                "name": name,
+                "started_at_seconds": round(start - self._start, 6),
+                "duration_seconds": round(end - start, 6),
+            }
+        )
+        self._last_phase_end = max(self._last_phase_end, end)
+
+
+startup_profiler = StartupProfiler()
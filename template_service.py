@@ -15,7 +15,7 @@ from service_kit.api import (
     register_timeout_error_handler,
 )
 from service_kit.configuration import ServiceConfiguration
-from service_kit.logging import logger
+from service_kit.logging import logger, startup_profiler
 
 PROJECT_NAME: Final[str] = "{{ project_name }}"
 API_VERSION: Final[str] = "0.1.0"
@@ -60,12 +60,18 @@ async def setup(_app: FastAPI) -> ServiceConfiguration:
     global _some_dependency
 
     # Uvicorn forks the process, so we need to reload the configuration here.
-    config = load_configuration()
+    with startup_profiler.phase("load_configuration"):
+        config = load_configuration()
     logger.critical(config)
-    await bootstrap_logging(_app, config)
+    with startup_profiler.phase("bootstrap_logging"):
+        await bootstrap_logging(_app, config)
 
-    _some_dependency = None
-    ...
+    with startup_profiler.phase("initialize_dependencies"):
+        _some_dependency = None
+        ...
+
+    # Logs how long each phase took. Uvicorn starts accepting requests once setup() returns.
+    startup_profiler.finish(config.startup_time_budget)
 
     return config
 
@@ -134,6 +140,10 @@ async def example(
 {% endif %}
 
 
+# The time from the first import of Service-Kit until the service's module was imported
+startup_profiler.mark("import")
+
+
 def main():
     launch_uvicorn(PROJECT_NAME, ENTRYPOINT, load_configuration())
 
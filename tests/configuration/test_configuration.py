@@ -1,4 +1,5 @@
 from collections.abc import Sequence
+from datetime import timedelta
 from ipaddress import IPv4Address
 from pathlib import Path
 from typing import Final, TypeAlias
@@ -7,8 +8,22 @@ import pytest
 from pydantic import ValidationError
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-from service_kit.configuration import ListConfigurationType, ServiceConfiguration
-from service_kit.logging import LogLevel
+from service_kit.configuration import (
+    EventLoop,
+    HTTPProtocol,
+    ListConfigurationType,
+    ServiceConfiguration,
+)
+from service_kit.logging import (
+    FsyncPolicy,
+    JSONEncoderType,
+    LogFileCompression,
+    LogLevel,
+    LogRateLimit,
+    LogSamplingRule,
+    OverflowPolicy,
+    RateLimitKey,
+)
 
 
 @pytest.mark.parametrize("generic_type, expected", ((int, (1, 2, 3)), (str, ("1", "2", "3"))))
@@ -106,12 +121,40 @@ def test_config_defaults():
     assert config.bind_address == IPv4Address("127.0.0.1")
     assert config.debug is False
     assert config.enable_hot_reload is False
+    assert config.log_aggregator_socket is None
     assert config.log_directory is None
+    assert config.log_error_deduplication_window is None
+    assert config.log_file_buffer_size is None
+    assert config.log_file_compression is None
+    assert config.log_file_flush_interval == 1.0
+    assert config.log_file_fsync_policy == FsyncPolicy.NEVER
+    assert config.log_file_index is False
+    assert config.log_file_max_size is None
+    assert config.log_file_retention_age is None
+    assert config.log_file_retention_count is None
+    assert config.log_flight_recorder_capacity == 100
+    assert config.log_flight_recorder_level is None
+    assert config.log_json_encoder == JSONEncoderType.STDLIB
     assert config.log_level == LogLevel.INFO
+    assert config.log_queue_overflow_policy == OverflowPolicy.BLOCK
+    assert config.log_queue_size is None
+    assert config.log_rate_limit is None
+    assert config.log_redaction_policy is None
+    assert config.log_sampling_rules == ()
+    assert config.log_suppression_summary_interval == 60.0
     assert config.port == 8080
     assert config.pretty_print_logs is True
+    assert config.server_backlog == 2048
+    assert config.server_event_loop == EventLoop.AUTO
+    assert config.server_http_protocol == HTTPProtocol.AUTO
+    assert config.server_keep_alive_timeout == 5
+    assert config.server_limit_concurrency is None
+    assert config.server_reuse_port is False
     assert config.ssl_certfile is None
     assert config.ssl_keyfile is None
+    assert config.startup_time_budget is None
+    assert config.structured_access_logs is False
+    assert config.workers == 1
 
 
 def test_custom_values(tmp_path: Path):
@@ -138,3 +181,32 @@ def test_tolerates_extras(tmp_path: Path):
     # This test validates that the ServiceConfiguration constructor does not
     # raise an error when it receives an unexpected (extra) parameter.
     ServiceConfiguration(extra_field="value")  # type: ignore [call-arg]
+
+
+def test_log_limits_from_environment(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv(
+        "LOG_SAMPLING_RULES", '[{"level": "DEBUG", "keep_one_in": 10}, {"keep_one_in": 2}]'
+    )
+    monkeypatch.setenv("LOG_RATE_LIMIT", '{"records_per_second": 5, "key": "message"}')
+
+    config = ServiceConfiguration()
+
+    assert config.log_sampling_rules == (
+        LogSamplingRule(level=LogLevel.DEBUG, keep_one_in=10),
+        LogSamplingRule(keep_one_in=2),
+    )
+    assert config.log_rate_limit == LogRateLimit(
+        records_per_second=5, burst=10, key=RateLimitKey.MESSAGE
+    )
+
+
+def test_log_file_rotation_from_environment(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("LOG_FILE_MAX_SIZE", "100MiB")
+    monkeypatch.setenv("LOG_FILE_RETENTION_AGE", "P7D")
+    monkeypatch.setenv("LOG_FILE_COMPRESSION", "gzip")
+
+    config = ServiceConfiguration()
+
+    assert config.log_file_max_size == 100 * 1024 * 1024
+    assert config.log_file_retention_age == timedelta(days=7)
+    assert config.log_file_compression == LogFileCompression.GZIP
@@ -0,0 +1,117 @@
+import io
+import json
+from collections.abc import Iterator
+
+import pytest
+
+from service_kit import StructuredError
+from service_kit.logging import (
+    ErrorDeduplicator,
+    configure_logger,
+    fingerprint_error,
+    log_basic_error,
+    log_structured_error,
+)
+
+
+class _TestStructuredError(StructuredError):
+    pass
+
+
+@pytest.fixture
+def io_stream(monkeypatch: pytest.MonkeyPatch) -> io.StringIO:
+    stream = io.StringIO()
+    monkeypatch.setattr("service_kit.logging._logger.io_stream", stream)
+
+    return stream
+
+
+@pytest.fixture(autouse=True)
+def reset_logger() -> Iterator[None]:
+    yield
+    configure_logger(log_level=50000, log_directory=None, pretty_print_logs=False)
+
+
+def _raise(error: Exception) -> Exception:
+    try:
+        raise error
+    except Exception as err:
+        return err
+
+
+def _raise_elsewhere(error: Exception) -> Exception:
+    try:
+        raise error
+    except Exception as err:
+        return err
+
+
+def test_fingerprint_error():
+    errors = [_raise(ValueError(str(i))) for i in range(2)]
+    other_location = _raise_elsewhere(ValueError("0"))
+
+    assert fingerprint_error(errors[0]) == fingerprint_error(errors[1])
+    assert fingerprint_error(errors[0]) != fingerprint_error(other_location)
+    assert fingerprint_error(errors[0]) != fingerprint_error(_raise(TypeError("0")))
+
+
+def test_error_deduplicator(monkeypatch: pytest.MonkeyPatch):
+    now = 1000.0
+    monkeypatch.setattr("time.monotonic", lambda: now)
+    deduplicator = ErrorDeduplicator(window=10)
+
+    counts = [deduplicator.count("a"), deduplicator.count("a"), deduplicator.count("b")]
+    now += 10
+    counts.append(deduplicator.count("a"))
+
+    assert counts == [1, 2, 1, 1]
+
+
+def test_error_deduplicator__invalid_window():
+    with pytest.raises(ValueError):
+        ErrorDeduplicator(window=0)
+
+
+def _log_errors(count: int):
+    for i in range(count):
+        try:
+            raise ValueError(f"Invalid value {i}")
+        except ValueError as err:
+            log_basic_error(err)
+
+        try:
+            raise _TestStructuredError(f"Invalid value {i}", i=i)
+        except _TestStructuredError as err:
+            log_structured_error(err)
+
+
+def test_tracebacks_are_deduplicated(io_stream: io.StringIO):
+    configure_logger(
+        log_level=0, log_directory=None, pretty_print_logs=False, error_deduplication_window=60
+    )
+
+    _log_errors(3)
+
+    records = [json.loads(line) for line in io_stream.getvalue().splitlines()]
+    assert [("traceback" in record, record["error_occurrences"]) for record in records[2:]] == [
+        (False, 2),
+        (False, 2),
+        (False, 3),
+        (False, 3),
+    ]
+    assert "ValueError: Invalid value 0" in records[0]["traceback"]
+    assert "_TestStructuredError" in records[1]["traceback"]
+    assert records[2]["error"] == "Invalid value 1"
+    assert records[2]["error_fingerprint"] == records[0]["error_fingerprint"]
+    assert records[3]["error_fingerprint"] == records[1]["error_fingerprint"]
+    assert records[0]["error_fingerprint"] != records[1]["error_fingerprint"]
+
+
+def test_tracebacks_are_not_deduplicated_by_default(io_stream: io.StringIO):
+    configure_logger(log_level=0, log_directory=None, pretty_print_logs=False)
+
+    _log_errors(2)
+
+    records = [json.loads(line) for line in io_stream.getvalue().splitlines()]
+    assert all("traceback" in record for record in records)
+    assert not any("error_fingerprint" in record for record in records)
@@ -0,0 +1,69 @@
+import io
+import json
+from collections.abc import Iterator
+
+import pytest
+
+from service_kit.logging import configure_logger, log_exception_group
+
+
+@pytest.fixture
+def io_stream(monkeypatch: pytest.MonkeyPatch) -> io.StringIO:
+    stream = io.StringIO()
+    monkeypatch.setattr("service_kit.logging._logger.io_stream", stream)
+    configure_logger(log_level=0, log_directory=None, pretty_print_logs=False)
+
+    return stream
+
+
+@pytest.fixture(autouse=True)
+def reset_logger() -> Iterator[None]:
+    yield
+    configure_logger(log_level=50000, log_directory=None, pretty_print_logs=False)
+
+
+def _fail(i: int):
+    if i % 3 == 0:
+        raise KeyError(i)
+
+    raise ValueError(f"Invalid value {i}")
+
+
+def _create_exception_group() -> ExceptionGroup:
+    errors: list[Exception] = []
+    for i in range(10):
+        try:
+            _fail(i)
+        except Exception as err:
+            errors.append(err)
+
+    nested = ExceptionGroup("Nested", [errors[0], ExceptionGroup("Deeply nested", errors[1:3])])
+    return ExceptionGroup("Tasks failed", [nested, *errors[3:]])
+
+
+def _read_records(text: str) -> list[dict]:
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def test_log_exception_group(io_stream: io.StringIO):
+    log_exception_group(_create_exception_group())
+
+    records = _read_records(io_stream.getvalue())
+    assert [record["error_type"] for record in records] == ["ExceptionGroup"] + [
+        "KeyError" if i % 3 == 0 else "ValueError" for i in range(3, 10)
+    ]
+
+
+def test_log_exception_group__aggregate(io_stream: io.StringIO):
+    log_exception_group(_create_exception_group(), aggregate=True, max_tracebacks=1)
+
+    (record,) = _read_records(io_stream.getvalue())
+    assert record["error_type"] == "ExceptionGroup"
+    assert record["error_count"] == 10
+    assert [(error["error_type"], error["count"]) for error in record["errors"]] == [
+        ("ValueError", 6),
+        ("KeyError", 4),
+    ]
+    assert record["errors"][0]["error"] == "Invalid value 1"
+    assert "ValueError: Invalid value 1" in record["errors"][0]["traceback"]
+    assert "traceback" not in record["errors"][1]
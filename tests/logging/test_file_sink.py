@@ -0,0 +1,220 @@
+import gzip
+import os
+import time
+from datetime import timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from service_kit.logging import FileSink, FsyncPolicy, LogFileCompression, SecurityRisk
+
+MESSAGE = "0123456789\n"
+
+
+class Message(str):
+    # Imitates loguru's Message, which is a str with a `record` attribute
+    record: dict
+
+
+def _message(level_no: int, **extra) -> Message:
+    message = Message(MESSAGE)
+    message.record = {"level": SimpleNamespace(no=level_no), "extra": extra}
+    return message
+
+
+@pytest.fixture
+def mock_fsync(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    mock_fsync = MagicMock()
+    monkeypatch.setattr(os, "fsync", mock_fsync)
+
+    return mock_fsync
+
+
+def _write_files(file_sink: FileSink, count: int) -> list[Path]:
+    # Writes enough messages to fill `count` files of 2 messages each
+    paths = []
+    for _ in range(count):
+        file_sink.write(MESSAGE)
+        paths.append(file_sink.path)
+        file_sink.write(MESSAGE)
+
+    file_sink.stop()
+
+    return paths  # type: ignore[return-value]
+
+
+def test_rotation_by_size(tmp_path: Path):
+    file_sink = FileSink(tmp_path, max_file_size=2 * len(MESSAGE))
+
+    paths = _write_files(file_sink, 3)
+
+    assert len(set(paths)) == 3
+    assert sorted(tmp_path.iterdir()) == paths
+    for path in paths:
+        assert path.read_text() == MESSAGE * 2
+
+
+def test_no_rotation_by_size(tmp_path: Path):
+    file_sink = FileSink(tmp_path)
+
+    _write_files(file_sink, 3)
+
+    (path,) = tmp_path.iterdir()
+    assert path.read_text() == MESSAGE * 6
+
+
+def test_gzip_compression(tmp_path: Path):
+    file_sink = FileSink(
+        tmp_path, max_file_size=2 * len(MESSAGE), compression=LogFileCompression.GZIP
+    )
+
+    paths = _write_files(file_sink, 3)
+
+    assert sorted(tmp_path.iterdir()) == [
+        paths[0].with_name(paths[0].name + ".gz"),
+        paths[1].with_name(paths[1].name + ".gz"),
+        paths[2],
+    ]
+    for path in sorted(tmp_path.iterdir())[:2]:
+        assert gzip.decompress(path.read_bytes()).decode() == MESSAGE * 2
+        assert path.stat().st_mode & 0o777 == 0o600
+
+
+def test_zstd_compression(tmp_path: Path):
+    zstandard = pytest.importorskip("zstandard")
+    file_sink = FileSink(
+        tmp_path, max_file_size=2 * len(MESSAGE), compression=LogFileCompression.ZSTD
+    )
+
+    paths = _write_files(file_sink, 2)
+
+    compressed_path = paths[0].with_name(paths[0].name + ".zst")
+    assert sorted(tmp_path.iterdir()) == [compressed_path, paths[1]]
+    with compressed_path.open("rb") as compressed_file:
+        reader = zstandard.ZstdDecompressor().stream_reader(compressed_file)
+        assert reader.read().decode() == MESSAGE * 2
+
+
+def test_retention_count(tmp_path: Path):
+    file_sink = FileSink(
+        tmp_path,
+        "prefix_{time}.log",
+        max_file_size=2 * len(MESSAGE),
+        retention_count=2,
+        compression=LogFileCompression.GZIP,
+    )
+    unrelated_file = tmp_path / "unrelated.log"
+    unrelated_file.touch()
+
+    paths = _write_files(file_sink, 5)
+
+    assert sorted(tmp_path.iterdir()) == [
+        paths[2].with_name(paths[2].name + ".gz"),
+        paths[3].with_name(paths[3].name + ".gz"),
+        paths[4],
+        unrelated_file,
+    ]
+
+
+def test_retention_count__without_prefix(tmp_path: Path):
+    file_sink = FileSink(tmp_path, max_file_size=2 * len(MESSAGE), retention_count=1)
+    unrelated_files = [tmp_path / "other.log", tmp_path / "2000-01-01.log"]
+    for unrelated_file in unrelated_files:
+        unrelated_file.touch()
+
+    paths = _write_files(file_sink, 3)
+
+    assert sorted(tmp_path.iterdir()) == sorted([paths[1], paths[2], *unrelated_files])
+
+
+def test_retention_age(tmp_path: Path):
+    expired_file = tmp_path / "2000-01-01_00-00-00_000000.log"
+    expired_file.touch()
+    old_time = time.time() - timedelta(days=8).total_seconds()
+    os.utime(expired_file, (old_time, old_time))
+    file_sink = FileSink(tmp_path, max_file_size=2 * len(MESSAGE), retention_age=timedelta(days=7))
+
+    paths = _write_files(file_sink, 2)
+
+    assert sorted(tmp_path.iterdir()) == paths
+
+
+def test_buffered_records_are_written_together(tmp_path: Path):
+    file_sink = FileSink(tmp_path, buffer_size=3 * len(MESSAGE), flush_interval=60)
+
+    for _ in range(2):
+        file_sink.write(MESSAGE)
+        file_sink.flush()
+    path = file_sink.path
+    assert path.read_text() == ""  # type: ignore[union-attr]
+
+    file_sink.write(MESSAGE)
+    file_sink.write(MESSAGE)
+    assert path.read_text() == MESSAGE * 3  # type: ignore[union-attr]
+
+    file_sink.stop()
+    assert path.read_text() == MESSAGE * 4  # type: ignore[union-attr]
+
+
+def test_buffered_records_are_written_after_flush_interval(tmp_path: Path):
+    file_sink = FileSink(tmp_path, buffer_size=1024 * 1024, flush_interval=0.01)
+
+    file_sink.write(MESSAGE)
+    path = file_sink.path
+
+    deadline = time.monotonic() + 5
+    while path.read_text() != MESSAGE and time.monotonic() < deadline:  # type: ignore[union-attr]
+        time.sleep(0.01)
+
+    assert path.read_text() == MESSAGE  # type: ignore[union-attr]
+    file_sink.stop()
+
+
+def test_fsync_policy_never(tmp_path: Path, mock_fsync: MagicMock):
+    file_sink = FileSink(tmp_path, max_file_size=2 * len(MESSAGE))
+
+    file_sink.write(_message(50))
+    _write_files(file_sink, 2)
+
+    mock_fsync.assert_not_called()
+
+
+@pytest.mark.parametrize("buffer_size", [None, 1024 * 1024])
+def test_fsync_policy_critical(tmp_path: Path, mock_fsync: MagicMock, buffer_size: int | None):
+    file_sink = FileSink(
+        tmp_path, buffer_size=buffer_size, flush_interval=60, fsync_policy=FsyncPolicy.CRITICAL
+    )
+
+    file_sink.write(_message(20))
+    file_sink.write(MESSAGE)
+    mock_fsync.assert_not_called()
+
+    file_sink.write(_message(40))
+    # Buffered records that were written before the critical record are persisted with it
+    assert file_sink.path.read_text() == MESSAGE * 3  # type: ignore[union-attr]
+    assert mock_fsync.call_count == 1
+
+    file_sink.write(_message(20, security_risk=SecurityRisk.LOW))
+    assert mock_fsync.call_count == 2
+
+    file_sink.stop()
+    # Nothing was written since the last fsync
+    assert mock_fsync.call_count == 2
+
+
+def test_fsync_policy_interval(tmp_path: Path, mock_fsync: MagicMock):
+    file_sink = FileSink(
+        tmp_path, buffer_size=1024 * 1024, flush_interval=0.01, fsync_policy=FsyncPolicy.INTERVAL
+    )
+
+    file_sink.write(MESSAGE)
+
+    deadline = time.monotonic() + 5
+    while not mock_fsync.called and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert file_sink.path.read_text() == MESSAGE  # type: ignore[union-attr]
+    assert mock_fsync.call_count == 1
+    file_sink.stop()
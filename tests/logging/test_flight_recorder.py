@@ -0,0 +1,152 @@
+import io
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from service_kit.logging import (
+    FlightRecorder,
+    LogLevel,
+    configure_logger,
+    discard_flight_recording,
+    log_basic_error,
+    logger,
+)
+
+
+@pytest.fixture
+def io_stream(monkeypatch: pytest.MonkeyPatch) -> io.StringIO:
+    stream = io.StringIO()
+    monkeypatch.setattr("service_kit.logging._logger.io_stream", stream)
+
+    return stream
+
+
+@pytest.fixture(autouse=True)
+def reset_logger() -> Iterator[None]:
+    yield
+    configure_logger(log_level=50000, log_directory=None, pretty_print_logs=False)
+
+
+def _read_records(text: str) -> list[dict]:
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def _handle_request(request_id: str, fail: bool):
+    with logger.contextualize(request_id=request_id):
+        logger.debug("Querying the database", attempt=1)
+        logger.info("Request received")
+        logger.trace("Too verbose")
+        if fail:
+            try:
+                raise ValueError("Invalid value")
+            except ValueError as err:
+                log_basic_error(err)
+
+        discard_flight_recording(request_id)
+
+
+def test_records_are_dumped_on_error(tmp_path: Path, io_stream: io.StringIO):
+    configure_logger(
+        LogLevel.INFO, tmp_path, pretty_print_logs=False, flight_recorder_level=LogLevel.DEBUG
+    )
+
+    _handle_request("ok", fail=False)
+    _handle_request("failed", fail=True)
+    logger.debug("Not part of a request", request_id=None)
+    configure_logger(log_level=50000, log_directory=None, pretty_print_logs=False)
+
+    (log_file,) = tmp_path.glob("*.log")
+    for records in (_read_records(io_stream.getvalue()), _read_records(log_file.read_text())):
+        assert [(record["request_id"], record["message"]) for record in records] == [
+            ("ok", "Request received"),
+            ("failed", "Request received"),
+            ("failed", "Querying the database"),
+            ("failed", "An unexpected error occurred"),
+        ]
+        assert "flight_recorder" not in records[1]
+        assert records[2]["flight_recorder"] is True
+        assert records[2]["attempt"] == 1
+
+
+def test_dumped_records_are_logged_through_loguru(io_stream: io.StringIO):
+    configure_logger(
+        LogLevel.INFO, None, pretty_print_logs=False, flight_recorder_level=LogLevel.DEBUG
+    )
+    dumped_records = []
+    logger.add(
+        lambda message: dumped_records.append(message.record),
+        level=LogLevel.DEBUG,
+        filter=lambda record: record["extra"].get("flight_recorder", False),
+    )
+
+    _handle_request("failed", fail=True)
+
+    (dumped_record,) = dumped_records
+    assert dumped_record["level"].name == LogLevel.DEBUG
+    assert dumped_record["message"] == "Querying the database"
+    assert dumped_record["function"] == "_handle_request"
+    assert dumped_record["extra"]["request_id"] == "failed"
+
+
+def test_records_are_discarded_when_request_ends(io_stream: io.StringIO):
+    configure_logger(
+        LogLevel.INFO, None, pretty_print_logs=False, flight_recorder_level=LogLevel.DEBUG
+    )
+
+    _handle_request("ok", fail=False)
+    with logger.contextualize(request_id="ok"):
+        logger.error("Logged after the request ended")
+
+    assert [record["message"] for record in _read_records(io_stream.getvalue())] == [
+        "Request received",
+        "Logged after the request ended",
+    ]
+
+
+def test_flight_recorder_at_or_above_log_level(io_stream: io.StringIO):
+    configure_logger(
+        LogLevel.DEBUG, None, pretty_print_logs=False, flight_recorder_level=LogLevel.DEBUG
+    )
+
+    _handle_request("failed", fail=True)
+
+    assert [record["message"] for record in _read_records(io_stream.getvalue())] == [
+        "Querying the database",
+        "Request received",
+        "An unexpected error occurred",
+    ]
+
+
+def _message(request_id: str, level_no: int, text: str) -> MagicMock:
+    message = MagicMock()
+    message.record = {
+        "level": MagicMock(no=level_no),
+        "extra": {"request_id": request_id},
+        "message": text,
+    }
+
+    return message
+
+
+def test_capacity_and_max_requests():
+    dumped: list[list[str]] = []
+    flight_recorder = FlightRecorder(
+        lambda messages: dumped.append([message.record["message"] for message in messages]),
+        threshold=20,
+        capacity=2,
+        max_requests=2,
+    )
+
+    for text in ("1", "2", "3"):
+        flight_recorder.write(_message("a", 10, text))
+    flight_recorder.write(_message("b", 10, "4"))
+    flight_recorder.write(_message("a", 10, "5"))
+    # Request "b" is the least recently active
+    flight_recorder.write(_message("c", 10, "6"))
+    for request_id in ("a", "b", "c"):
+        flight_recorder.write(_message(request_id, 40, "error"))
+
+    assert dumped == [["3", "5"], ["6"]]
@@ -0,0 +1,257 @@
+import json
+import os
+import shutil
+import subprocess
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from service_kit.cli import main
+from service_kit.logging import (
+    GitRepository,
+    GitRepositoryError,
+    GitStatus,
+    get_git_status,
+    log_git_status,
+    logger,
+    write_git_status_yaml,
+)
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+GIT_ENVIRONMENT = {
+    **os.environ,
+    "GIT_AUTHOR_NAME": "Test",
+    "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "Test",
+    "GIT_COMMITTER_EMAIL": "test@example.com",
+    "GIT_CONFIG_NOSYSTEM": "1",
+}
+
+
+def _git(repository_path: Path, *args: str) -> str:
+    process = subprocess.run(
+        ["git", *args],
+        check=True,
+        stdout=subprocess.PIPE,
+        text=True,
+        cwd=repository_path,
+        env=GIT_ENVIRONMENT,
+    )
+    return process.stdout.strip()
+
+
+def _commit(repository_path: Path, file_name: str, content: str):
+    with open(repository_path / file_name, "a") as f:
+        f.write(content)
+    _git(repository_path, "add", file_name)
+    _git(repository_path, "commit", "--quiet", "--message", f"Change {file_name}")
+
+
+@pytest.fixture
+def repository_path(tmp_path: Path) -> Path:
+    repository_path = tmp_path / "repository"
+    repository_path.mkdir()
+    _git(repository_path, "init", "--quiet", "--initial-branch=main")
+
+    for i in range(20):
+        _commit(repository_path, "file.txt", f"line {i}\n" * 100)
+    _git(repository_path, "tag", "lightweight", "HEAD~1")
+    _git(repository_path, "tag", "--annotate", "--message", "Annotated", "annotated", "HEAD~1")
+    _git(repository_path, "switch", "--quiet", "--create", "feature", "HEAD~2")
+    _commit(repository_path, "feature.txt", "feature\n")
+    _git(repository_path, "switch", "--quiet", "main")
+    _git(repository_path, "merge", "--quiet", "--no-edit", "feature")
+    _git(repository_path, "tag", "--annotate", "--message", "Release", "v1.0.0")
+
+    return repository_path
+
+
+@pytest.fixture
+def captured_logs() -> Iterator[list[dict]]:
+    captured: list[dict] = []
+    handler_id = logger.add(
+        lambda message: captured.append(json.loads(message)),
+        format="{extra[serialized]}",
+        level=0,
+    )
+
+    yield captured
+
+    logger.remove(handler_id)
+
+
+def _assert_matches_git(repository: GitRepository, repository_path: Path):
+    assert repository.resolve_head() == _git(repository_path, "rev-parse", "HEAD")
+
+    for commit_id in _git(repository_path, "rev-list", "--all").split():
+        parents = _git(repository_path, "rev-list", "--parents", "-n", "1", commit_id).split()[1:]
+        tags = _git(repository_path, "tag", "--points-at", commit_id).split()
+        assert repository.get_parents(commit_id) == parents
+        assert repository.get_tags(commit_id) == sorted(tags)
+
+
+def test_loose_refs_and_objects(repository_path: Path):
+    repository = GitRepository.find(repository_path / "subdirectory")
+
+    assert repository is not None
+    _assert_matches_git(repository, repository_path)
+
+
+def test_packed_refs_and_objects(repository_path: Path):
+    # Aggressive packing also deltifies some of the objects
+    _git(repository_path, "gc", "--quiet", "--aggressive", "--prune=now")
+    assert not list((repository_path / ".git" / "refs" / "tags").iterdir())
+    repository = GitRepository.find(repository_path)
+
+    assert repository is not None
+    _assert_matches_git(repository, repository_path)
+    objects = _git(repository_path, "cat-file", "--batch-all-objects", "--batch-check")
+    for line in objects.splitlines():
+        object_id, object_type, _ = line.split()
+        expected_content = subprocess.run(
+            ["git", "cat-file", object_type, object_id],
+            check=True,
+            stdout=subprocess.PIPE,
+            cwd=repository_path,
+        ).stdout
+        assert repository.read_object(object_id) == (object_type, expected_content)
+
+
+def test_pack_indexes_are_opened_once(repository_path: Path, monkeypatch: pytest.MonkeyPatch):
+    _git(repository_path, "gc", "--quiet", "--prune=now")
+    _git(repository_path, "tag", "--annotate", "--message", "Loose", "loose", "HEAD~1")
+    pack_index_globs = []
+    glob = Path.glob
+
+    def record_glob(path: Path, pattern: str):
+        pack_index_globs.append(pattern)
+        return glob(path, pattern)
+
+    monkeypatch.setattr(Path, "glob", record_glob)
+
+    with GitRepository(repository_path / ".git") as repository:
+        _assert_matches_git(repository, repository_path)
+
+    assert pack_index_globs == ["*.idx"]
+
+
+def test_tags_with_missing_targets_are_skipped(repository_path: Path):
+    # Simulates a shallow clone, which may have tags of commits that weren't fetched
+    _commit(repository_path, "file.txt", "Not fetched\n")
+    _git(repository_path, "tag", "--annotate", "--message", "Missing", "missing", "HEAD")
+    missing_commit_id = _git(repository_path, "rev-parse", "HEAD")
+    _git(repository_path, "reset", "--quiet", "--hard", "HEAD~1")
+    (repository_path / ".git" / "objects" / missing_commit_id[:2] / missing_commit_id[2:]).unlink()
+    repository = GitRepository.find(repository_path)
+
+    assert repository is not None
+    assert repository.get_tags(repository.resolve_head()) == ["v1.0.0"]
+
+
+def test_linked_worktree(repository_path: Path, tmp_path: Path):
+    worktree_path = tmp_path / "worktree"
+    _git(repository_path, "worktree", "add", "--quiet", str(worktree_path), "lightweight")
+    repository = GitRepository.find(worktree_path)
+
+    assert repository is not None
+    assert repository.resolve_head() == _git(worktree_path, "rev-parse", "HEAD")
+    assert repository.get_tags(repository.resolve_head()) == ["annotated", "lightweight"]
+
+
+def test_not_a_repository(tmp_path: Path):
+    assert GitRepository.find(tmp_path) is None
+
+
+def test_missing_object(repository_path: Path):
+    repository = GitRepository.find(repository_path)
+
+    assert repository is not None
+    with pytest.raises(GitRepositoryError):
+        repository.read_object("0" * 40)
+
+
+def test_get_git_status(repository_path: Path):
+    (repository_path / "file.txt").write_text("changed\n")
+
+    git_status = get_git_status(repository_path, check_worktree=True)
+
+    assert git_status == GitStatus(
+        commit=_git(repository_path, "rev-parse", "HEAD"),
+        parents=_git(repository_path, "rev-list", "--parents", "-n", "1", "HEAD").split()[1:],
+        status="dirty",
+        tags=["v1.0.0"],
+    )
+
+
+def test_get_git_status__worktree_is_not_checked_by_default(
+    repository_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    commit_id = _git(repository_path, "rev-parse", "HEAD")
+    monkeypatch.setattr("subprocess.run", None)
+
+    git_status = get_git_status(repository_path)
+
+    assert git_status is not None
+    assert git_status.commit == commit_id
+    assert git_status.status == "UNKNOWN"
+
+
+def test_write_git_status_yaml(repository_path: Path, tmp_path: Path):
+    git_status_yaml_path = tmp_path / "git_status.yaml"
+
+    main(["git-status", str(git_status_yaml_path), "--repository", str(repository_path)])
+
+    assert git_status_yaml_path.read_text().startswith(
+        f"commit: {_git(repository_path, 'rev-parse', 'HEAD')}\n"
+    )
+
+
+def test_write_git_status_yaml__not_a_repository(tmp_path: Path):
+    with pytest.raises(GitRepositoryError):
+        write_git_status_yaml(tmp_path / "git_status.yaml", tmp_path)
+
+
+def test_log_git_status__prefer_git_status_yaml(
+    repository_path: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    captured_logs: list[dict],
+):
+    git_status_yaml_path = tmp_path / "git_status.yaml"
+    git_status = write_git_status_yaml(git_status_yaml_path, repository_path)
+    _commit(repository_path, "file.txt", "After the build\n")
+    monkeypatch.chdir(repository_path)
+    # Neither git nor the repository may be used
+    monkeypatch.setattr("service_kit.logging.startup.GitRepository.find", None)
+    monkeypatch.setattr("subprocess.run", None)
+
+    log_git_status(git_status_yaml_path, prefer_git_status_yaml=True)
+
+    git_status_log = next(
+        log for log in captured_logs if log["message"] == "Identified the currently running code"
+    )
+    assert git_status_log["commit"] == git_status.commit
+    assert git_status_log["parents"] == git_status.parents
+    assert git_status_log["status"] == "clean"
+    assert git_status_log["tags"] == ["v1.0.0"]
+
+
+def test_log_git_status__git_is_not_installed(
+    repository_path: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    captured_logs: list[dict],
+):
+    git_status_yaml_path = tmp_path / "git_status.yaml"
+    write_git_status_yaml(git_status_yaml_path, repository_path)
+    monkeypatch.chdir(repository_path)
+    monkeypatch.setattr("service_kit.logging.startup.GIT", None)
+
+    log_git_status(git_status_yaml_path)
+
+    git_status_log = next(
+        log for log in captured_logs if log["message"] == "Identified the currently running code"
+    )
+    assert git_status_log["status"] == "clean"
@@ -0,0 +1,62 @@
+import json
+import re
+
+import pytest
+
+from service_kit.logging import JSONColorizerType, create_json_colorizer
+
+ANSI_ESCAPE_PATTERN = re.compile(r"\x1b\[[0-9;]*m")
+
+RECORDS = [
+    {},
+    {"message": "Hello, world!"},
+    {
+        "timestamp": "2024-01-01 00:00:00:000000 +0000",
+        "level": "INFO",
+        "message": 'A message with "quotes", colons: and {braces} [brackets]',
+        "escaped": 'a \\ b \\" c \\',
+        "request_id": "c6f8c2b3-7a0a-4e5f-9d60-2d7f4b1e0f51",
+        "status_code": 200,
+        "elapsed": -1.5e-3,
+        "success": True,
+        "error": None,
+        "retried": False,
+        "headers": {"host": "localhost", "accept": ["*/*", 1, None]},
+        "empty": {"object": {}, "array": []},
+        "nested": [[1, 2], {"a": [True, {"b": "c"}]}, "d"],
+        "unicode": "é中",
+    },
+]
+
+
+def _colors_by_character(colorized: str) -> list[tuple[str, str]]:
+    # Pygments and the ANSI colorizer may place escape codes around whitespace differently, so
+    # compare the color in which each non-whitespace character is displayed.
+    colors: list[tuple[str, str]] = []
+    color = ""
+    position = 0
+    for match in ANSI_ESCAPE_PATTERN.finditer(colorized):
+        colors.extend((c, color) for c in colorized[position : match.start()] if not c.isspace())
+        color = match.group(0)
+        position = match.end()
+    colors.extend((c, color) for c in colorized[position:] if not c.isspace())
+
+    return colors
+
+
+@pytest.mark.parametrize("record", RECORDS)
+@pytest.mark.parametrize(
+    "dumps_kwargs",
+    [{}, {"indent": 4}, {"separators": (",", ":")}],
+    ids=["compact", "pretty", "dense"],
+)
+def test_ansi_colorizer_matches_pygments(record, dumps_kwargs):
+    json_str = json.dumps(record, **dumps_kwargs)
+    ansi_colorizer = create_json_colorizer(JSONColorizerType.ANSI)
+    pygments_colorizer = create_json_colorizer(JSONColorizerType.PYGMENTS)
+
+    ansi_colorized = ansi_colorizer.colorize(json_str)
+    pygments_colorized = pygments_colorizer.colorize(json_str)
+
+    assert ANSI_ESCAPE_PATTERN.sub("", ansi_colorized) == json_str + "\n"
+    assert _colors_by_character(ansi_colorized) == _colors_by_character(pygments_colorized)
@@ -0,0 +1,113 @@
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Final
+
+import pytest
+
+from service_kit import ServiceKitBaseModel
+from service_kit.logging import JSONEncoderType, LogLevel, create_json_encoder
+from service_kit.logging.json_encoders import OrjsonJSONEncoder, StdlibJSONEncoder
+
+
+class Model(ServiceKitBaseModel):
+    name: str
+    path: Path
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, ServiceKitBaseModel):
+        return obj.to_json_dict()
+
+    return str(obj)
+
+
+RECORD: Final[dict[str, Any]] = {
+    "timestamp": "2026-10-17 12:00:00:000000 +0000",
+    "level": LogLevel.INFO,
+    "message": "Request received",
+    "request_id": "01J9Z3Y5Z7",
+    "query_parameters": {"b": "2", "a": "1"},
+    "source": {"host": "127.0.0.1", "port": 54321},
+    "tags": [],
+    "empty": {},
+    "model": Model(name="name", path=Path("/tmp")),
+    "time": datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc),
+    "count": 3,
+    "ratio": 0.5,
+    "flag": None,
+}
+
+
+def _fast_encoder_types() -> list[JSONEncoderType]:
+    encoder_types = []
+    for encoder_type in (JSONEncoderType.ORJSON, JSONEncoderType.MSGSPEC):
+        try:
+            create_json_encoder(encoder_type, _default)
+            encoder_types.append(encoder_type)
+        except ImportError:
+            pass
+
+    return encoder_types
+
+
+@pytest.fixture(params=_fast_encoder_types())
+def fast_encoder_type(request) -> JSONEncoderType:
+    return request.param
+
+
+@pytest.mark.parametrize("sort_keys", [True, False])
+def test_same_fields_as_stdlib(fast_encoder_type: JSONEncoderType, sort_keys: bool):
+    record = RECORD.copy()
+    if fast_encoder_type == JSONEncoderType.MSGSPEC:
+        # msgspec serializes datetimes natively
+        del record["time"]
+    stdlib_encoder = StdlibJSONEncoder(_default, sort_keys=sort_keys)
+    fast_encoder = create_json_encoder(fast_encoder_type, _default, sort_keys=sort_keys)
+
+    stdlib_fields = json.loads(stdlib_encoder.encode(record))
+    fast_fields = json.loads(fast_encoder.encode(record))
+
+    assert fast_fields == stdlib_fields
+    assert list(fast_fields.keys()) == list(stdlib_fields.keys())
+
+
+def test_pretty_print_same_as_stdlib(fast_encoder_type: JSONEncoderType):
+    record = RECORD.copy()
+    del record["time"]
+    stdlib_encoder = StdlibJSONEncoder(_default, pretty_print=True)
+    fast_encoder = create_json_encoder(fast_encoder_type, _default, pretty_print=True)
+
+    assert fast_encoder.encode(record) == stdlib_encoder.encode(record)
+
+
+def test_falls_back_to_stdlib(fast_encoder_type: JSONEncoderType):
+    record = {"big_number": 2**100}
+    fast_encoder = create_json_encoder(fast_encoder_type, _default)
+
+    assert json.loads(fast_encoder.encode(record)) == record
+
+
+def test_stdlib():
+    encoder = create_json_encoder(JSONEncoderType.STDLIB, _default)
+
+    assert encoder.encode({"a": 1, "model": RECORD["model"]}) == (
+        '{"a": 1, "model": {"name": "name", "path": "/tmp"}}'
+    )
+
+
+def test_auto_uses_orjson():
+    pytest.importorskip("orjson")
+
+    encoder = create_json_encoder(JSONEncoderType.AUTO, _default)
+
+    assert isinstance(encoder, OrjsonJSONEncoder)
+
+
+def test_auto_does_not_use_msgspec(monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+
+    encoder = create_json_encoder(JSONEncoderType.AUTO, _default)
+
+    assert isinstance(encoder, StdlibJSONEncoder)
@@ -0,0 +1,198 @@
+import json
+import multiprocessing
+import os
+import socket
+import stat
+import threading
+from pathlib import Path
+
+import pytest
+
+from service_kit.logging import (
+    AggregatingSink,
+    LogAggregator,
+    LogLevel,
+    configure_logger,
+    logger,
+    start_log_aggregator,
+)
+
+RECORDS_PER_WORKER = 100
+
+
+class ListSink:
+    def __init__(self):
+        self.messages: list[str] = []
+        self.flushes = 0
+        self.stopped = False
+
+    def write(self, message: str):
+        self.messages.append(message)
+
+    def flush(self):
+        self.flushes += 1
+
+    def stop(self):
+        self.stopped = True
+
+
+@pytest.fixture
+def socket_path(tmp_path: Path) -> Path:
+    return tmp_path / "log.sock"
+
+
+def test_records_are_written_in_order(socket_path: Path):
+    sink = ListSink()
+    log_aggregator = LogAggregator(socket_path, sink)
+    log_aggregator.start()
+
+    aggregating_sinks = [AggregatingSink(socket_path) for _ in range(2)]
+    for i in range(10):
+        for worker, aggregating_sink in enumerate(aggregating_sinks):
+            aggregating_sink.write(f'{{\n  "worker": {worker},\n  "ünïcode": {i}\n}}\n')
+        aggregating_sinks[0].flush()
+
+    for aggregating_sink in aggregating_sinks:
+        aggregating_sink.stop()
+    log_aggregator.stop()
+
+    records = [json.loads(message) for message in sink.messages]
+    assert len(records) == 20
+    for worker in range(2):
+        assert [record["ünïcode"] for record in records if record["worker"] == worker] == list(
+            range(10)
+        )
+    assert sink.flushes < len(records)
+    assert sink.stopped
+    assert not socket_path.exists()
+
+
+def test_unreachable_aggregator(socket_path: Path, capsys):
+    aggregating_sink = AggregatingSink(socket_path)
+
+    aggregating_sink.write("lost\n")
+    aggregating_sink.flush()
+    aggregating_sink.write("also lost\n")
+    aggregating_sink.flush()
+
+    sink = ListSink()
+    log_aggregator = LogAggregator(socket_path, sink)
+    log_aggregator.start()
+    aggregating_sink.write("received\n")
+    aggregating_sink.stop()
+    log_aggregator.stop()
+
+    assert sink.messages == ["received\n"]
+    assert capsys.readouterr().err.count("Traceback") == 1
+
+
+def test_stale_socket_is_replaced(socket_path: Path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale_socket:
+        stale_socket.bind(str(socket_path))
+
+    sink = ListSink()
+    log_aggregator = LogAggregator(socket_path, sink)
+    log_aggregator.start()
+    aggregating_sink = AggregatingSink(socket_path)
+    aggregating_sink.write("received\n")
+    aggregating_sink.stop()
+    log_aggregator.stop()
+
+    assert sink.messages == ["received\n"]
+
+
+def test_records_written_from_several_threads(socket_path: Path):
+    sink = ListSink()
+    log_aggregator = LogAggregator(socket_path, sink)
+    log_aggregator.start()
+    aggregating_sink = AggregatingSink(socket_path)
+
+    def write_records(thread_number: int):
+        for i in range(RECORDS_PER_WORKER):
+            aggregating_sink.write(json.dumps({"thread": thread_number, "i": i}) + "\n")
+            aggregating_sink.flush()
+
+    threads = [threading.Thread(target=write_records, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    aggregating_sink.stop()
+    log_aggregator.stop()
+
+    records = [json.loads(message) for message in sink.messages]
+    assert len(records) == 4 * RECORDS_PER_WORKER
+    for thread_number in range(4):
+        assert [record["i"] for record in records if record["thread"] == thread_number] == list(
+            range(RECORDS_PER_WORKER)
+        )
+
+
+def test_socket_is_only_accessible_by_its_owner_once_bound(
+    socket_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    modes_when_bound = []
+    chmod = os.chmod
+
+    def record_mode(path, mode):
+        modes_when_bound.append(stat.S_IMODE(os.stat(path).st_mode))
+        chmod(path, mode)
+
+    monkeypatch.setattr("os.chmod", record_mode)
+    umask = os.umask(0o022)
+    try:
+        log_aggregator = LogAggregator(socket_path, ListSink())
+        log_aggregator.start()
+        mode = stat.S_IMODE(socket_path.stat().st_mode)
+        log_aggregator.stop()
+    finally:
+        os.umask(umask)
+
+    assert modes_when_bound == [0o600]
+    assert mode == 0o600
+
+
+def test_socket_path_is_not_a_socket(socket_path: Path):
+    socket_path.touch()
+
+    with pytest.raises(ValueError):
+        LogAggregator(socket_path, ListSink()).start()
+
+
+def _log_from_worker(worker: int, log_directory: Path, socket_path: Path):
+    configure_logger(
+        LogLevel.INFO, log_directory, pretty_print_logs=False, log_aggregator_socket=socket_path
+    )
+
+    for i in range(RECORDS_PER_WORKER):
+        logger.info("Worker record", worker=worker, i=i)
+
+    # Reconfiguring the logger stops the aggregating sink, which sends any buffered records
+    configure_logger(log_level=50000, log_directory=None, pretty_print_logs=False)
+
+
+def test_records_of_all_processes_are_written_to_one_file(tmp_path: Path, socket_path: Path):
+    log_directory = tmp_path / "logs"
+    log_aggregator = start_log_aggregator(socket_path, log_directory)
+
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=_log_from_worker, args=(worker, log_directory, socket_path))
+        for worker in range(2)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    log_aggregator.stop()
+
+    log_files = list(log_directory.glob("*.log"))
+    assert len(log_files) == 1
+
+    records = [json.loads(line) for line in log_files[0].read_text().splitlines()]
+    assert all(worker.exitcode == 0 for worker in workers)
+    for worker_number in range(2):
+        assert [record["i"] for record in records if record["worker"] == worker_number] == list(
+            range(RECORDS_PER_WORKER)
+        )
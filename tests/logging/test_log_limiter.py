@@ -0,0 +1,137 @@
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from service_kit.logging import LogLevel, LogLimiter, LogRateLimit, LogSamplingRule, RateLimitKey
+
+LEVEL_NUMBERS = {LogLevel.DEBUG: 10, LogLevel.INFO: 20, LogLevel.ERROR: 40}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake_clock = FakeClock()
+    monkeypatch.setattr("service_kit.logging.log_limiter.time.monotonic", fake_clock)
+
+    return fake_clock
+
+
+def make_record(
+    level: LogLevel = LogLevel.INFO, message: str = "message", line: int = 1
+) -> dict[str, Any]:
+    return {
+        "level": SimpleNamespace(name=str(level), no=LEVEL_NUMBERS[level]),
+        "message": message,
+        "file": SimpleNamespace(path="/app/module.py"),
+        "name": "module",
+        "function": "function",
+        "line": line,
+    }
+
+
+def count_logged(log_limiter: LogLimiter, records: list[dict[str, Any]]) -> int:
+    return sum(log_limiter.should_log(record) for record in records)  # type: ignore[arg-type]
+
+
+def test_no_limits():
+    log_limiter = LogLimiter()
+
+    assert count_logged(log_limiter, [make_record()] * 100) == 100
+
+
+def test_sampling_rule_by_level():
+    log_limiter = LogLimiter(sampling_rules=[LogSamplingRule(level=LogLevel.DEBUG, keep_one_in=10)])
+
+    assert count_logged(log_limiter, [make_record(LogLevel.DEBUG)] * 100) == 10
+    assert count_logged(log_limiter, [make_record(LogLevel.INFO)] * 100) == 100
+
+
+def test_sampling_rule_by_message():
+    log_limiter = LogLimiter(sampling_rules=[LogSamplingRule(message="noisy", keep_one_in=4)])
+
+    assert count_logged(log_limiter, [make_record(message="noisy")] * 100) == 25
+    assert count_logged(log_limiter, [make_record(message="quiet")] * 100) == 100
+
+
+def test_only_first_matching_sampling_rule_is_applied():
+    log_limiter = LogLimiter(
+        sampling_rules=[
+            LogSamplingRule(message="noisy", keep_one_in=2),
+            LogSamplingRule(keep_one_in=10),
+        ]
+    )
+
+    assert count_logged(log_limiter, [make_record(message="noisy")] * 100) == 50
+    assert count_logged(log_limiter, [make_record(message="quiet")] * 100) == 10
+
+
+def test_rate_limit_per_call_site(clock: FakeClock):
+    log_limiter = LogLimiter(rate_limit=LogRateLimit(records_per_second=2, burst=5))
+
+    assert count_logged(log_limiter, [make_record(line=1)] * 100) == 5
+    assert count_logged(log_limiter, [make_record(line=2)] * 100) == 5
+
+    clock.now += 1.5
+    assert count_logged(log_limiter, [make_record(line=1)] * 100) == 3
+
+
+def test_rate_limit_per_message(clock: FakeClock):
+    log_limiter = LogLimiter(
+        rate_limit=LogRateLimit(records_per_second=1, burst=1, key=RateLimitKey.MESSAGE)
+    )
+    records = [make_record(message="a", line=1), make_record(message="a", line=2)]
+
+    assert count_logged(log_limiter, records) == 1
+    assert count_logged(log_limiter, [make_record(message="b")]) == 1
+
+
+def test_sampled_out_records_do_not_count_toward_rate_limit(clock: FakeClock):
+    log_limiter = LogLimiter(
+        sampling_rules=[LogSamplingRule(keep_one_in=2)],
+        rate_limit=LogRateLimit(records_per_second=1, burst=5),
+    )
+
+    assert count_logged(log_limiter, [make_record()] * 100) == 5
+
+
+def test_summaries(clock: FakeClock):
+    log_limiter = LogLimiter(sampling_rules=[LogSamplingRule(keep_one_in=10)], summary_interval=60)
+    count_logged(log_limiter, [make_record(LogLevel.INFO, message="first", line=1)] * 10)
+    count_logged(log_limiter, [make_record(LogLevel.ERROR, message="last", line=1)] * 10)
+    count_logged(log_limiter, [make_record(line=2)] * 10)
+
+    assert log_limiter.pop_summaries() == []
+
+    clock.now += 60
+    summaries = sorted(log_limiter.pop_summaries(), key=lambda summary: summary.call_site)
+
+    assert [summary.call_site for summary in summaries] == [
+        "module:function:1",
+        "module:function:2",
+    ]
+    assert [summary.count for summary in summaries] == [18, 9]
+    assert summaries[0].level.name == LogLevel.ERROR
+    assert summaries[0].last_message == "last"
+    assert log_limiter.pop_summaries() == []
+
+
+def test_records_below_min_level_are_not_limited(clock: FakeClock):
+    log_limiter = LogLimiter(
+        sampling_rules=[LogSamplingRule(keep_one_in=10)],
+        rate_limit=LogRateLimit(records_per_second=1, burst=5),
+        min_level_no=LEVEL_NUMBERS[LogLevel.INFO],
+    )
+
+    assert count_logged(log_limiter, [make_record(LogLevel.DEBUG)] * 100) == 100
+    assert count_logged(log_limiter, [make_record(LogLevel.INFO)] * 100) == 5
+
+    clock.now += 60
+    assert [summary.count for summary in log_limiter.pop_summaries()] == [95]
@@ -0,0 +1,151 @@
+import json
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from service_kit.logging import (
+    LogFileCompression,
+    LogLevel,
+    LogQuery,
+    configure_logger,
+    log_basic_error,
+    logger,
+    query_logs,
+)
+from service_kit.logging.file_sink import get_index_path
+from service_kit.logging.log_index import read_index
+
+WriteLogs = Callable[..., None]
+
+
+@pytest.fixture
+def write_logs(tmp_path: Path) -> WriteLogs:
+    def _write_logs(**kwargs):
+        configure_logger(
+            LogLevel.DEBUG, tmp_path, log_file_max_size=2000, log_file_index=True, **kwargs
+        )
+
+        for i in range(20):
+            with logger.contextualize(request_id=f"request-{i}"):
+                logger.debug("Request received")
+                if i % 5 == 0:
+                    try:
+                        raise ValueError("Invalid value")
+                    except ValueError as err:
+                        log_basic_error(err)
+                logger.info("Sending response")
+
+        # Reconfiguring the logger stops the file sink, which writes the index of the last file
+        configure_logger(log_level=50000, log_directory=None, pretty_print_logs=False)
+
+    return _write_logs
+
+
+def _query(log_directory: Path, **kwargs) -> list[dict]:
+    return [json.loads(record) for record in query_logs(log_directory, LogQuery(**kwargs))]
+
+
+@pytest.mark.parametrize("pretty_print_logs", [True, False])
+@pytest.mark.parametrize("log_file_compression", [None, LogFileCompression.GZIP])
+def test_query_by_request_id(
+    tmp_path: Path,
+    write_logs: WriteLogs,
+    pretty_print_logs: bool,
+    log_file_compression: LogFileCompression | None,
+):
+    write_logs(pretty_print_logs=pretty_print_logs, log_file_compression=log_file_compression)
+
+    records = _query(tmp_path, request_id="request-15")
+
+    assert [record["message"] for record in records] == [
+        "Request received",
+        "An unexpected error occurred",
+        "Sending response",
+    ]
+    assert all(record["request_id"] == "request-15" for record in records)
+    assert len(list(tmp_path.glob("*.idx"))) > 1
+
+
+def test_query_by_error_type_and_level(tmp_path: Path, write_logs: WriteLogs):
+    write_logs(pretty_print_logs=False)
+
+    errors = _query(tmp_path, error_type="ValueError")
+    warnings_and_above = _query(tmp_path, min_level=LogLevel.WARNING)
+    no_errors = _query(tmp_path, error_type="ValueError", request_id="request-1")
+
+    assert [record["request_id"] for record in errors] == [f"request-{i}" for i in (0, 5, 10, 15)]
+    assert warnings_and_above == errors
+    assert no_errors == []
+
+
+def test_query_by_time(tmp_path: Path, write_logs: WriteLogs):
+    write_logs(pretty_print_logs=False)
+    all_records = _query(tmp_path)
+    timestamps = [
+        datetime.strptime(record["timestamp"], "%Y-%m-%d %H:%M:%S:%f %z") for record in all_records
+    ]
+
+    since, until = timestamps[10], timestamps[20]
+
+    records = _query(tmp_path, since=since, until=until)
+
+    assert len(all_records) == 44
+    assert records == [
+        record for record, timestamp in zip(all_records, timestamps) if since <= timestamp < until
+    ]
+    assert _query(tmp_path, since=timestamps[-1] + timedelta(seconds=1)) == []
+
+
+def test_query_by_naive_time(tmp_path: Path, write_logs: WriteLogs):
+    write_logs(pretty_print_logs=False)
+    all_records = _query(tmp_path)
+    since = datetime.strptime(all_records[10]["timestamp"], "%Y-%m-%d %H:%M:%S:%f %z")
+
+    records = _query(tmp_path, since=since.astimezone().replace(tzinfo=None))
+
+    assert records == all_records[10:]
+
+
+def test_query_without_index(tmp_path: Path, write_logs: WriteLogs):
+    write_logs(pretty_print_logs=True)
+    for index_file in tmp_path.glob("*.idx"):
+        index_file.unlink()
+
+    records = _query(tmp_path, request_id="request-5", min_level=LogLevel.INFO)
+
+    assert [record["message"] for record in records] == [
+        "An unexpected error occurred",
+        "Sending response",
+    ]
+
+
+def test_query_only_reads_the_log_files_with_the_prefix(tmp_path: Path, write_logs: WriteLogs):
+    write_logs(pretty_print_logs=False)
+    other_record = json.dumps({"message": "Other service", "request_id": "request-15"})
+    (tmp_path / "other_2026-10-17_12-00-00_000000.log").write_text(other_record + "\n")
+    (tmp_path / "notes.log").write_text(other_record + "\n")
+
+    records = _query(tmp_path, request_id="request-15")
+    other_records = [
+        json.loads(record)
+        for record in query_logs(tmp_path, LogQuery(request_id="request-15"), prefix="other")
+    ]
+
+    assert "Other service" not in [record["message"] for record in records]
+    assert [record["message"] for record in other_records] == ["Other service"]
+
+
+def test_index_offsets(tmp_path: Path, write_logs: WriteLogs):
+    write_logs(pretty_print_logs=False)
+
+    for log_file in tmp_path.glob("*.log"):
+        index = read_index(get_index_path(log_file))
+        assert index is not None
+
+        contents = log_file.read_bytes()
+        for value, offsets in index.field_offsets["request_id"].items():
+            for offset in offsets:
+                record = json.loads(contents[offset:].split(b"\n", 1)[0])
+                assert record["request_id"] == value
@@ -1,6 +1,24 @@
+import io
 import json
+import logging
+import time
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import MagicMock
 
-from service_kit.logging import configure_logger, logger
+import pytest
+
+from service_kit.logging import (
+    LogLevel,
+    LogRateLimit,
+    configure_logger,
+    get_log_queue_statistics,
+    intercept_preconfigured_loggers,
+    intercept_uvicorn_loggers,
+    logger,
+)
+from service_kit.logging._logger import serializer
 
 
 def _capture_log_record(**extra_fields) -> dict:
@@ -17,6 +35,20 @@ def _capture_log_record(**extra_fields) -> dict:
     return json.loads(captured[0])
 
 
+def test_records_are_serialized_with_stdlib_by_default():
+    configure_logger(log_level=50000, log_directory=None, pretty_print_logs=False)
+    captured = []
+    handler_id = logger.add(
+        lambda message: captured.append(str(message)), format="{extra[serialized]}", level=0
+    )
+    try:
+        logger.info("test", city="Zürich", ratio=float("nan"), level_name=LogLevel.INFO)
+    finally:
+        logger.remove(handler_id)
+
+    assert '"city": "Z\\u00fcrich", "ratio": NaN, "level_name": "INFO"' in captured[0]
+
+
 def test_sort_fields_sorts_keys_alphabetically():
     configure_logger(log_level=50000, log_directory=None, pretty_print_logs=False, sort_fields=True)
 
@@ -46,3 +78,148 @@ def test_configure_extra():
     # Verifies all extras are included in the log
     intersection = {k: data[k] for k in data.keys() & extra.keys()}
     assert intersection == extra
+
+
+@pytest.fixture
+def io_stream(monkeypatch: pytest.MonkeyPatch) -> io.StringIO:
+    stream = io.StringIO()
+    monkeypatch.setattr("service_kit.logging._logger.io_stream", stream)
+
+    return stream
+
+
+@pytest.mark.parametrize("queue_size", [None, 10])
+def test_configure_log_directory(tmp_path: Path, io_stream: io.StringIO, queue_size: int | None):
+    configure_logger(
+        log_level=LogLevel.INFO,
+        log_directory=tmp_path,
+        pretty_print_logs=False,
+        queue_size=queue_size,
+    )
+
+    logger.info("test", field="value")
+    statistics = get_log_queue_statistics()
+    # Reconfiguring the logger writes any queued records
+    configure_logger(log_level=50000, log_directory=None, pretty_print_logs=False)
+
+    (log_file,) = tmp_path.iterdir()
+    log_record = json.loads(log_file.read_text())
+    assert log_record["field"] == "value"
+    assert json.loads(io_stream.getvalue()) == log_record
+    assert log_file.stat().st_mode & 0o777 == 0o600
+    assert set(statistics.keys()) == (set() if queue_size is None else {"stderr", "file"})
+
+
+def test_records_are_rendered_lazily_and_once(monkeypatch: pytest.MonkeyPatch):
+    configure_logger(log_level=50000, log_directory=None, pretty_print_logs=False)
+    serialize_json = MagicMock(wraps=serializer._serialize_json)
+    colorize_json = MagicMock(wraps=serializer._colorize_json)
+    monkeypatch.setattr(serializer, "_serialize_json", serialize_json)
+    monkeypatch.setattr(serializer, "_colorize_json", colorize_json)
+    monkeypatch.setattr(serializer, "_colorize", True)
+
+    captured: list[str] = []
+    handler_ids = [
+        logger.add(captured.append, format="{extra[serialized]}", level="INFO") for _ in range(2)
+    ]
+    try:
+        logger.debug("not rendered")
+        logger.info("rendered")
+    finally:
+        for handler_id in handler_ids:
+            logger.remove(handler_id)
+
+    assert len(captured) == 2
+    assert captured[0] == captured[1]
+    serialize_json.assert_called_once()
+    colorize_json.assert_not_called()
+
+
+def test_suppressed_records_are_summarized(io_stream: io.StringIO):
+    configure_logger(
+        log_level=LogLevel.INFO,
+        log_directory=None,
+        pretty_print_logs=False,
+        rate_limit=LogRateLimit(records_per_second=0.001, burst=2),
+        suppression_summary_interval=0.001,
+    )
+
+    for _ in range(5):
+        logger.info("test")
+        time.sleep(0.002)
+    configure_logger(log_level=50000, log_directory=None, pretty_print_logs=False)
+
+    log_records = [json.loads(line) for line in io_stream.getvalue().splitlines()]
+    assert [record["message"] for record in log_records if record["message"] == "test"] == [
+        "test"
+    ] * 2
+    summaries = [record for record in log_records if "suppressed_records" in record]
+    assert sum(summary["suppressed_records"] for summary in summaries) == 3
+    assert all(summary["level"] == "INFO" for summary in summaries)
+    assert all(summary["last_suppressed_message"] == "test" for summary in summaries)
+
+
+@pytest.fixture
+def captured_records() -> Iterator[list[dict]]:
+    captured: list[dict] = []
+    handler_id = logger.add(
+        lambda message: captured.append(json.loads(message)),
+        format="{extra[serialized]}",
+        level=0,
+    )
+
+    yield captured
+
+    logger.remove(handler_id)
+
+
+def test_intercepted_record_location(captured_records: list[dict]):
+    intercept_preconfigured_loggers(["test_logger"])
+
+    logging.getLogger("test_logger").warning("Hello, %s!", "world")
+
+    (record,) = captured_records
+    assert record["message"] == "Hello, world!"
+    assert record["level"] == "WARNING"
+    assert record["file"] == __file__
+    assert record["module"] == "test_logger"
+    assert record["function"] == "test_intercepted_record_location"
+
+
+@pytest.mark.parametrize("structured_access_logs", [True, False])
+def test_intercepted_uvicorn_access_record(
+    captured_records: list[dict], structured_access_logs: bool
+):
+    intercept_uvicorn_loggers(structured_access_logs)
+
+    logging.getLogger("uvicorn.access").info(
+        '%s - "%s %s HTTP/%s" %d', "127.0.0.1:5000", "GET", "/path?page=2", "1.1", 200
+    )
+
+    (record,) = captured_records
+    if structured_access_logs:
+        assert record["message"] == "Request handled"
+        assert record["client"] == "127.0.0.1:5000"
+        assert record["method"] == "GET"
+        assert record["path"] == "/path?page=2"
+        assert record["status_code"] == 200
+    else:
+        assert record["message"] == '127.0.0.1:5000 - "GET /path?page=2 HTTP/1.1" 200'
+        assert "status_code" not in record
+
+
+def test_format_timestamp():
+    utc = timezone.utc
+    plus_two = timezone(timedelta(hours=2))
+    times = [
+        datetime(2026, 10, 17, 12, 0, 0, 123456, utc),
+        datetime(2026, 10, 17, 12, 0, 0, 654321, utc),
+        datetime(2026, 10, 17, 12, 0, 0, 7, plus_two),
+        datetime(2026, 11, 17, 12, 0, 0, 0, plus_two),
+        datetime(2026, 11, 17, 12, 0, 1, 999999, plus_two),
+    ]
+
+    for record_time in times:
+        assert serializer._format_timestamp(record_time) == record_time.strftime(
+            "%Y-%m-%d %H:%M:%S:%f %z"
+        )
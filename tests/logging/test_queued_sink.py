@@ -0,0 +1,119 @@
+import threading
+from collections.abc import Sequence
+from types import SimpleNamespace
+
+import pytest
+
+from service_kit.logging import OverflowPolicy, QueuedSink
+
+
+class BlockingSink:
+    def __init__(self):
+        self.messages: list[str] = []
+        self.flushes = 0
+        self.stopped = False
+        self.unblock = threading.Event()
+
+    def write(self, message: str):
+        self.unblock.wait()
+        self.messages.append(message)
+
+    def flush(self):
+        self.flushes += 1
+
+    def stop(self):
+        self.stopped = True
+
+
+class Message(str):
+    # Imitates loguru's Message, which is a str with a `record` attribute
+    record: dict
+
+
+def _message(text: str, level_no: int) -> Message:
+    message = Message(text)
+    message.record = {"level": SimpleNamespace(no=level_no)}
+    return message
+
+
+@pytest.fixture
+def sink() -> BlockingSink:
+    return BlockingSink()
+
+
+def _fill_queue(queued_sink: QueuedSink, sink: BlockingSink, messages: Sequence[str]):
+    # The first message is taken by the writer thread, which then blocks in the sink
+    queued_sink.write("blocked")
+    while queued_sink.statistics.queued != 1 or queued_sink._size() != 0:
+        pass
+
+    for message in messages:
+        queued_sink.write(message)
+
+
+def test_writes_messages_in_order(sink: BlockingSink):
+    sink.unblock.set()
+    queued_sink = QueuedSink(sink)
+
+    for i in range(100):
+        queued_sink.write(str(i))
+    queued_sink.stop()
+
+    assert sink.messages == [str(i) for i in range(100)]
+    assert sink.flushes > 0
+    assert sink.stopped
+    assert queued_sink.statistics.written == 100
+
+
+def test_drop_newest(sink: BlockingSink):
+    queued_sink = QueuedSink(sink, max_size=2, overflow_policy=OverflowPolicy.DROP_NEWEST)
+
+    _fill_queue(queued_sink, sink, ["1", "2", "3", "4"])
+    sink.unblock.set()
+    queued_sink.stop()
+
+    assert sink.messages == ["blocked", "1", "2"]
+    assert queued_sink.statistics.queued == 3
+    assert queued_sink.statistics.dropped == 2
+    assert queued_sink.statistics.written == 3
+
+
+def test_drop_debug_first(sink: BlockingSink):
+    queued_sink = QueuedSink(sink, max_size=3, overflow_policy=OverflowPolicy.DROP_DEBUG_FIRST)
+    messages = [
+        _message("debug 1", 10),
+        _message("info 1", 20),
+        _message("debug 2", 10),
+        _message("error 1", 40),
+        _message("debug 3", 10),
+        _message("error 2", 40),
+    ]
+
+    _fill_queue(queued_sink, sink, messages)
+    sink.unblock.set()
+    queued_sink.stop()
+
+    assert sink.messages == ["blocked", "info 1", "error 1", "error 2"]
+    assert queued_sink.statistics.dropped == 3
+
+
+def test_block(sink: BlockingSink):
+    queued_sink = QueuedSink(sink, max_size=1, overflow_policy=OverflowPolicy.BLOCK)
+    _fill_queue(queued_sink, sink, ["1"])
+
+    blocked_writer = threading.Thread(target=queued_sink.write, args=("2",))
+    blocked_writer.start()
+    blocked_writer.join(0.1)
+    assert blocked_writer.is_alive()
+
+    sink.unblock.set()
+    blocked_writer.join()
+    queued_sink.stop()
+
+    assert sink.messages == ["blocked", "1", "2"]
+    assert queued_sink.statistics.dropped == 0
+
+
+def test_invalid_max_size(sink: BlockingSink):
+    with pytest.raises(ValueError):
+        QueuedSink(sink, max_size=0)
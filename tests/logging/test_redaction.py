@@ -0,0 +1,130 @@
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from service_kit import ServiceKitBaseModel
+from service_kit.logging import RedactionPolicy, Redactor, configure_logger, logger
+
+REPLACEMENT = "********"
+
+
+class Credentials(ServiceKitBaseModel):
+    username: str
+    password: str
+
+
+def test_redact_keys():
+    redactor = Redactor(RedactionPolicy())
+    fields = {
+        "message": "Request received",
+        "headers": {"Authorization": "Bearer secret", "Accept": "*/*"},
+        "users": [{"name": "alice", "password": "hunter2"}, ("bob", {"TOKEN": "abc"})],
+        "credentials": Credentials(username="alice", password="hunter2"),
+    }
+
+    redacted = redactor.redact(fields)
+
+    assert redacted == {
+        "message": "Request received",
+        "headers": {"Authorization": REPLACEMENT, "Accept": "*/*"},
+        "users": [{"name": "alice", "password": REPLACEMENT}, ["bob", {"TOKEN": REPLACEMENT}]],
+        "credentials": {"username": "alice", "password": REPLACEMENT},
+    }
+    # The logged objects are not modified
+    assert fields["headers"]["Authorization"] == "Bearer secret"  # type: ignore[index]
+
+
+def test_nothing_to_redact():
+    redactor = Redactor(RedactionPolicy())
+    fields = {"message": "Request received", "query_parameters": {"page": "1"}, "ids": [1, 2]}
+
+    assert redactor.redact(fields) is fields
+
+
+def test_key_and_value_patterns():
+    redactor = Redactor(
+        RedactionPolicy(
+            keys=frozenset(),
+            key_patterns=(r"_secret$", r"^x-internal-"),
+            value_patterns=(r"(?<=Bearer )\S+", r"\b\d{4}-\d{4}-\d{4}-\d{4}\b"),
+            replacement="[redacted]",
+        )
+    )
+
+    redacted = redactor.redact(
+        {
+            "client_secret": "abc",
+            "X-Internal-Key": "def",
+            "password": "not redacted",
+            "message": "Charged card 1234-5678-9012-3456 with Bearer xyz",
+        }
+    )
+
+    assert redacted == {
+        "client_secret": "[redacted]",
+        "X-Internal-Key": "[redacted]",
+        "password": "not redacted",
+        "message": "Charged card [redacted] with Bearer [redacted]",
+    }
+
+
+def test_max_depth():
+    redactor = Redactor(RedactionPolicy(max_depth=2))
+
+    redacted = redactor.redact({"a": {"b": {"c": {"d": 1}}, "list": [[1]]}, "e": [1]})
+
+    assert redacted == {"a": {"b": {"c": REPLACEMENT}, "list": [REPLACEMENT]}, "e": [1]}
+
+
+def test_redact_from_several_threads(monkeypatch: pytest.MonkeyPatch):
+    # The cache of keys is reset often, while other threads are using it
+    monkeypatch.setattr("service_kit.logging.redaction._MAX_CACHED_KEYS", 10)
+    redactor = Redactor(RedactionPolicy())
+
+    def redact(i: int) -> dict:
+        return redactor.redact({f"key_{i}": "value", "password": "hunter2"})
+
+    # Switching threads as often as possible makes races more likely
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(8) as executor:
+            redacted_records = list(executor.map(redact, range(20000)))
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert all(redacted["password"] == REPLACEMENT for redacted in redacted_records)
+
+
+def _capture_log_record(**extra_fields) -> dict:
+    captured = []
+    handler_id = logger.add(
+        lambda message: captured.append(str(message)), format="{extra[serialized]}", level=0
+    )
+    try:
+        logger.info("test", **extra_fields)
+    finally:
+        logger.remove(handler_id)
+
+    return json.loads(captured[0])
+
+
+@pytest.mark.parametrize(
+    "redaction_policy, expected_password",
+    [(RedactionPolicy(), REPLACEMENT), (None, "hunter2")],
+)
+def test_serializer_redacts_records(
+    redaction_policy: RedactionPolicy | None, expected_password: str
+):
+    configure_logger(
+        log_level=50000,
+        log_directory=None,
+        pretty_print_logs=False,
+        redaction_policy=redaction_policy,
+    )
+
+    record = _capture_log_record(body={"username": "alice", "password": "hunter2"})
+
+    assert record["body"] == {"username": "alice", "password": expected_password}
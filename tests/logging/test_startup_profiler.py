@@ -0,0 +1,90 @@
+import json
+from collections.abc import Iterator
+
+import pytest
+
+from service_kit.logging import StartupBudgetExceededError, StartupProfiler, logger
+
+
+@pytest.fixture
+def captured_logs() -> Iterator[list[dict]]:
+    captured: list[dict] = []
+    handler_id = logger.add(
+        lambda message: captured.append(json.loads(message)),
+        format="{extra[serialized]}",
+        level=0,
+    )
+
+    yield captured
+
+    logger.remove(handler_id)
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    now = [100.0]
+    monkeypatch.setattr("time.perf_counter", lambda: now[0])
+
+    return now
+
+
+def test_startup_profile(clock: list[float], captured_logs: list[dict]):
+    startup_profiler = StartupProfiler()
+
+    clock[0] += 1.5
+    startup_profiler.mark("import")
+    with startup_profiler.phase("load_configuration"):
+        clock[0] += 0.25
+    clock[0] += 0.5
+    with startup_profiler.phase("bootstrap_logging"):
+        clock[0] += 0.75
+
+    profile = startup_profiler.finish(budget=5)
+
+    assert profile == {
+        "phases": [
+            {"name": "import", "started_at_seconds": 0.0, "duration_seconds": 1.5},
+            {"name": "load_configuration", "started_at_seconds": 1.5, "duration_seconds": 0.25},
+            {"name": "bootstrap_logging", "started_at_seconds": 2.25, "duration_seconds": 0.75},
+        ],
+        "time_to_ready_seconds": 3.0,
+    }
+    assert captured_logs[-1]["message"] == "Startup profile"
+    assert captured_logs[-1]["level"] == "INFO"
+    assert captured_logs[-1]["phases"] == profile["phases"]
+
+
+def test_startup_budget_exceeded(clock: list[float], captured_logs: list[dict]):
+    startup_profiler = StartupProfiler()
+
+    with startup_profiler.phase("load_configuration"):
+        clock[0] += 2
+
+    with pytest.raises(StartupBudgetExceededError) as err:
+        startup_profiler.finish(budget=1)
+
+    assert err.value.time_to_ready_seconds == 2
+    assert captured_logs[-1]["level"] == "ERROR"
+    assert captured_logs[-1]["startup_time_budget_seconds"] == 1
+
+
+def test_startup_profiled_again_after_finish(clock: list[float], captured_logs: list[dict]):
+    startup_profiler = StartupProfiler()
+
+    with startup_profiler.phase("load_configuration"):
+        clock[0] += 0.75
+    startup_profiler.finish(budget=1)
+
+    # The service runs for a while before its lifespan runs again
+    clock[0] += 60
+    with startup_profiler.phase("load_configuration"):
+        clock[0] += 0.5
+    profile = startup_profiler.finish(budget=1)
+
+    assert profile == {
+        "phases": [
+            {"name": "load_configuration", "started_at_seconds": 0.0, "duration_seconds": 0.5},
+        ],
+        "time_to_ready_seconds": 0.5,
+    }
+    assert captured_logs[-1]["level"] == "INFO"
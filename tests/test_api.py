@@ -1,19 +1,42 @@
+import asyncio
+import importlib.util
+import io
+import json
+import logging
+import logging.config
+import pickle
+import socket
+import sys
+from collections.abc import Iterator
 from http import HTTPStatus
+from pathlib import Path
+from unittest.mock import MagicMock
 
 import pytest
-from fastapi import FastAPI
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
 from fastapi.testclient import TestClient
 from httpx import ASGITransport, AsyncClient
 
 from service_kit.api import (
+    PrerenderedErrorResponse,
     RequestID,
     RequestIDMiddleware,
     RequestLogMiddleware,
+    TooManyRequestsResponse,
+    UnauthorizedResponse,
+    bootstrap_logging,
+    get_standard_responses,
+    launch_uvicorn,
     register_authentication_error_handler,
     register_default_error_handler,
     register_timeout_error_handler,
 )
+from service_kit.api.api_utils import _bind_reuse_port_socket, _get_server_options
+from service_kit.configuration import EventLoop, HTTPProtocol, ServiceConfiguration
 from service_kit.errors import StructuredError
+from service_kit.logging import LogLevel, configure_logger, logger
 
 
 def register_error_handlers(_app: FastAPI):
@@ -47,6 +70,25 @@ def anyio_backend():
     return "asyncio"
 
 
+@pytest.fixture
+def captured_logs() -> Iterator[list[dict]]:
+    captured: list[dict] = []
+    handler_id = logger.add(
+        lambda message: captured.append(json.loads(message)),
+        format="{extra[serialized]}",
+        level=0,
+    )
+
+    yield captured
+
+    logger.remove(handler_id)
+
+
+@pytest.fixture
+def debug_request_logs(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(RequestLogMiddleware, "debug", True)
+
+
 TEST_EXCEPTION_MESSAGE = "This is a test exception"
 
 
@@ -78,6 +120,38 @@ def test_500_error_on_timeout(api_client: TestClient, request_id: RequestID):
     assert response.headers["content-type"] == "application/json"
 
 
+@app.get("/forbidden")
+def forbidden_test_endpoint():
+    raise HTTPException(HTTPStatus.FORBIDDEN)
+
+
+def test_401_error_on_forbidden(api_client: TestClient, request_id: RequestID):
+    response = api_client.get("/forbidden")
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert response.json() == UnauthorizedResponse(request_id=request_id).model_dump()
+    assert response.headers["content-type"] == "application/json"
+
+
+@pytest.mark.parametrize("rendered_request_id", ["01JAB8N6Z1FW3XQ2M5T7YV9C4D", 'quote"d\\ \u00e9'])
+def test_prerendered_error_response(rendered_request_id: RequestID):
+    prerendered_response = PrerenderedErrorResponse(
+        TooManyRequestsResponse, HTTPStatus.TOO_MANY_REQUESTS, "Too many requests were made."
+    )
+    expected_response = JSONResponse(
+        TooManyRequestsResponse(
+            request_id=rendered_request_id, message="Too many requests were made."
+        ).model_dump(),
+        status_code=HTTPStatus.TOO_MANY_REQUESTS,
+    )
+
+    response = prerendered_response.render(rendered_request_id)
+
+    assert response.body == expected_response.body
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert response.headers["content-type"] == "application/json"
+
+
 @app.get("/structured-error")
 def exception_structured_error():
     raise StructuredError(TEST_EXCEPTION_MESSAGE, param1="p1", param2="p2")
@@ -116,3 +190,326 @@ def test_structured_error_handling__no_additional_properties(
     assert response.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
     assert response.json() == expected_error
     assert response.headers["content-type"] == "application/json"
+
+
+@app.post("/echo-body")
+async def echo_body(request: Request):
+    return await request.json()
+
+
+def test_request_log_middleware__logs_request_and_response(
+    api_client: TestClient, request_id: RequestID, captured_logs: list[dict]
+):
+    api_client.post("/echo-body?param=value", json={"key": "value"})
+
+    request_log, response_log = [
+        log
+        for log in captured_logs
+        if log.get("request_id") == request_id and log["level"] == "INFO"
+    ]
+    assert request_log["message"] == "Request received"
+    assert request_log["method"] == "POST"
+    assert request_log["path"] == "/echo-body"
+    assert request_log["query_parameters"] == {"param": "value"}
+    assert request_log["request_id"] == request_id
+    assert response_log["status_code"] == HTTPStatus.OK
+    assert response_log["request_id"] == request_id
+
+
+def test_request_log_middleware__debug_replays_request_body(
+    api_client: TestClient,
+    request_id: RequestID,
+    captured_logs: list[dict],
+    debug_request_logs,
+):
+    body = {"key": "value"}
+
+    response = api_client.post("/echo-body", json=body, headers={"Authorization": "Bearer secret"})
+
+    assert response.json() == body
+    debug_request_log = next(
+        log
+        for log in captured_logs
+        if log["message"] == "Request received" and log["level"] == "DEBUG"
+    )
+    assert debug_request_log["body"] == body
+    assert debug_request_log["headers"]["authorization"] == "********"
+
+
+def test_request_log_middleware__debug_sanitizes_headers_without_redaction(
+    api_client: TestClient, debug_request_logs
+):
+    configure_logger(
+        log_level=50000, log_directory=None, pretty_print_logs=False, redaction_policy=None
+    )
+    captured: list[dict] = []
+    logger.add(lambda message: captured.append(json.loads(message)), format="{extra[serialized]}")
+
+    try:
+        api_client.post(
+            "/echo-body",
+            json={},
+            headers={"Authorization": "Bearer secret", "Cookie": "session=secret"},
+        )
+    finally:
+        configure_logger(log_level=50000, log_directory=None, pretty_print_logs=False)
+
+    request_log = next(log for log in captured if "authorization" in log.get("headers", {}))
+    assert request_log["headers"]["authorization"] == "********"
+    assert request_log["headers"]["cookie"] == "********"
+
+
+def test_request_log_middleware__flight_recorder(
+    api_client: TestClient, monkeypatch: pytest.MonkeyPatch, debug_request_logs
+):
+    stream = io.StringIO()
+    monkeypatch.setattr("service_kit.logging._logger.io_stream", stream)
+    configure_logger(
+        LogLevel.INFO, None, pretty_print_logs=False, flight_recorder_level=LogLevel.DEBUG
+    )
+
+    try:
+        api_client.post("/echo-body", json={"key": "value"})
+        api_client.get("/exception-500")
+    finally:
+        configure_logger(log_level=50000, log_directory=None, pretty_print_logs=False)
+
+    logs = [json.loads(line) for line in stream.getvalue().splitlines()]
+    debug_logs = [log for log in logs if log["level"] == "DEBUG"]
+    assert [log["path"] for log in debug_logs] == ["/exception-500"]
+    assert debug_logs[0]["flight_recorder"] is True
+    error_log_index = next(i for i, log in enumerate(logs) if log["level"] == "ERROR")
+    assert logs[error_log_index - 1] == debug_logs[0]
+
+
+def test_request_id_middleware__response_header(api_client: TestClient, request_id: RequestID):
+    response = api_client.get("/structured-error", headers={"X-Request-ID": "inbound-id"})
+
+    assert response.headers["X-Request-ID"] == request_id
+
+
+trusted_request_id_app = FastAPI()
+trusted_request_id_app.add_middleware(RequestIDMiddleware, trust_inbound_request_id=True)
+
+
+@trusted_request_id_app.get("/request-id")
+def get_request_id(request: Request):
+    return request.state.id
+
+
+@pytest.fixture
+def trusted_request_id_client() -> TestClient:
+    return TestClient(trusted_request_id_app)
+
+
+@pytest.mark.parametrize(
+    "headers, expected_request_id",
+    [
+        ({"X-Request-ID": "inbound-id"}, "inbound-id"),
+        (
+            {"traceparent": "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"},
+            "4bf92f3577b34da6a3ce929d0e0e4736",
+        ),
+        (
+            {
+                "X-Request-ID": "invalid id!",
+                "traceparent": "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01",
+            },
+            "4bf92f3577b34da6a3ce929d0e0e4736",
+        ),
+        ({"X-Request-ID": "a" * 129}, None),
+        ({"X-Request-ID": "<script>"}, None),
+        ({"traceparent": "00-00000000000000000000000000000000-00f067aa0ba902b7-01"}, None),
+        ({}, None),
+    ],
+)
+def test_request_id_middleware__trusted_inbound_request_id(
+    trusted_request_id_client: TestClient,
+    request_id: RequestID,
+    headers: dict[str, str],
+    expected_request_id: str | None,
+):
+    expected_request_id = expected_request_id or request_id
+
+    response = trusted_request_id_client.get("/request-id", headers=headers)
+
+    assert response.json() == expected_request_id
+    assert response.headers["X-Request-ID"] == expected_request_id
+
+
+def test_get_standard_responses__openapi_schema():
+    standard_responses_app = FastAPI()
+
+    @standard_responses_app.get(
+        "/a", responses=get_standard_responses([HTTPStatus.NOT_FOUND, HTTPStatus.UNAUTHORIZED])
+    )
+    def a():
+        pass
+
+    @standard_responses_app.get("/b", responses=get_standard_responses([HTTPStatus.NOT_FOUND]))
+    def b():
+        pass
+
+    openapi_schema = standard_responses_app.openapi()
+
+    for path in ("/a", "/b"):
+        assert openapi_schema["paths"][path]["get"]["responses"]["404"] == {
+            "description": "Not Found",
+            "content": {
+                "application/json": {"schema": {"$ref": "#/components/schemas/NotFoundResponse"}}
+            },
+        }
+    assert openapi_schema["components"]["schemas"]["UnauthorizedResponse"] == (
+        UnauthorizedResponse.model_json_schema()
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_logger_config(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("service_kit.api.api_utils._logger_config", None)
+
+
+@pytest.fixture
+def uvicorn_run(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    run = MagicMock()
+    monkeypatch.setattr("uvicorn.run", run)
+
+    return run
+
+
+def test_launch_uvicorn__server_options(uvicorn_run: MagicMock):
+    config = ServiceConfiguration(
+        workers=4,
+        server_backlog=4096,
+        server_event_loop=EventLoop.ASYNCIO,
+        server_http_protocol=HTTPProtocol.H11,
+        server_keep_alive_timeout=30,
+        server_limit_concurrency=1000,
+    )
+
+    launch_uvicorn("test-service", "test_service:app", config)
+
+    uvicorn_run.assert_called_once()
+    assert uvicorn_run.call_args.args == ("test_service:app",)
+    assert {**uvicorn_run.call_args.kwargs, "log_config": None} == {
+        "host": "127.0.0.1",
+        "port": 8080,
+        "reload": False,
+        "workers": 4,
+        "loop": "asyncio",
+        "http": "h11",
+        "backlog": 4096,
+        "limit_concurrency": 1000,
+        "timeout_keep_alive": 30,
+        "ssl_keyfile": None,
+        "ssl_certfile": None,
+        "log_config": None,
+    }
+
+
+def test_launch_uvicorn__stops_sending_to_the_aggregator_once_it_stops(
+    uvicorn_run: MagicMock, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys
+):
+    stream = io.StringIO()
+    monkeypatch.setattr("service_kit.logging._logger.io_stream", stream)
+    log_directory = tmp_path / "logs"
+    config = ServiceConfiguration(
+        log_directory=log_directory,
+        log_aggregator_socket=tmp_path / "log.sock",
+        pretty_print_logs=False,
+    )
+
+    def run(*_, log_config, **__):
+        # uvicorn configures the launching process's logging with the configuration's log_config
+        logging.config.dictConfig(log_config)
+        logger.info("Server started")
+
+    uvicorn_run.side_effect = run
+
+    try:
+        launch_uvicorn("test-service", "test_service:app", config)
+        logger.info("After the server stopped")
+    finally:
+        configure_logger(log_level=50000, log_directory=None, pretty_print_logs=False)
+
+    assert "Traceback" not in capsys.readouterr().err
+    assert "After the server stopped" in stream.getvalue()
+    # Only the aggregator writes a log file
+    (log_file,) = log_directory.glob("*.log")
+    messages = [json.loads(line)["message"] for line in log_file.read_text().splitlines()]
+    assert "Server started" in messages
+
+
+def test_bootstrap_logging__keeps_the_log_file_of_the_process(tmp_path: Path):
+    log_directory = tmp_path / "logs"
+    config = ServiceConfiguration(log_directory=log_directory, pretty_print_logs=False)
+
+    try:
+        # uvicorn configures each process's logging before the app's lifespan starts
+        logging.config.dictConfig(_get_server_options(config)["log_config"])
+        logging.getLogger("uvicorn.error").info("Started server process")
+        asyncio.run(bootstrap_logging(app, config, extra={"service": "test-service"}))
+        logger.info("Application started")
+    finally:
+        configure_logger(log_level=50000, log_directory=None, pretty_print_logs=False)
+
+    (log_file,) = log_directory.glob("*.log")
+    records = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert records[0]["message"] == "Started server process"
+    assert records[-1]["message"] == "Application started"
+    assert records[-1]["service"] == "test-service"
+
+
+@pytest.mark.parametrize("installed", [True, False])
+def test_launch_uvicorn__auto_detects_fast_implementations(
+    uvicorn_run: MagicMock, monkeypatch: pytest.MonkeyPatch, installed: bool
+):
+    find_spec = importlib.util.find_spec
+    monkeypatch.setattr(
+        "importlib.util.find_spec",
+        lambda name, *args: (
+            (MagicMock() if installed else None)
+            if name in ("httptools", "uvloop")
+            else find_spec(name, *args)
+        ),
+    )
+
+    launch_uvicorn("test-service", "test_service:app", ServiceConfiguration())
+
+    expected_loop = "uvloop" if installed and sys.platform != "win32" else "asyncio"
+    assert uvicorn_run.call_args.kwargs["loop"] == expected_loop
+    assert uvicorn_run.call_args.kwargs["http"] == ("httptools" if installed else "h11")
+
+
+def test_launch_uvicorn__log_config_configures_each_process(monkeypatch: pytest.MonkeyPatch):
+    stream = io.StringIO()
+    monkeypatch.setattr("service_kit.logging._logger.io_stream", stream)
+    config = ServiceConfiguration(pretty_print_logs=False, structured_access_logs=True)
+    uvicorn_config = uvicorn.Config("test_service:app", **_get_server_options(config))
+
+    try:
+        # uvicorn spawns its workers, so the configuration must be picklable
+        pickle.loads(pickle.dumps(uvicorn_config)).configure_logging()  # noqa: DUO103
+        logging.getLogger("uvicorn.error").info("Started server process")
+        logging.getLogger("uvicorn.access").info(
+            '%s - "%s %s HTTP/%s" %d', "127.0.0.1:5000", "GET", "/", "1.1", 200
+        )
+    finally:
+        configure_logger(log_level=50000, log_directory=None, pretty_print_logs=False)
+
+    error_log, access_log = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert error_log["message"] == "Started server process"
+    assert access_log["path"] == "/"
+    assert access_log["status_code"] == HTTPStatus.OK
+
+
+@pytest.mark.skipif(not hasattr(socket, "SO_REUSEPORT"), reason="SO_REUSEPORT is not supported")
+def test_bind_reuse_port_socket():
+    first_socket = _bind_reuse_port_socket("127.0.0.1", 0)
+    port = first_socket.getsockname()[1]
+
+    try:
+        with _bind_reuse_port_socket("127.0.0.1", port) as second_socket:
+            assert second_socket.getsockname()[1] == port
+    finally:
+        first_socket.close()
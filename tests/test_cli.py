@@ -0,0 +1,26 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from service_kit.cli import main
+from service_kit.logging import LogLevel, configure_logger, logger
+
+
+def test_logs(tmp_path: Path, capsys: pytest.CaptureFixture):
+    configure_logger(LogLevel.INFO, tmp_path, pretty_print_logs=True, log_file_index=True)
+    for request_id in ("a", "b", "a"):
+        logger.info("Request received", request_id=request_id)
+    configure_logger(log_level=50000, log_directory=None, pretty_print_logs=False)
+    capsys.readouterr()
+
+    main(["logs", str(tmp_path), "--request-id", "a", "--level", "info"])
+
+    output = capsys.readouterr().out
+    records = [json.loads(record) for record in output.replace("}\n{", "}\0{").split("\0")]
+    assert [record["request_id"] for record in records] == ["a", "a"]
+
+
+def test_logs_invalid_directory(tmp_path: Path):
+    with pytest.raises(SystemExit):
+        main(["logs", str(tmp_path / "missing")])
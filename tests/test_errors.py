@@ -29,3 +29,10 @@ def test_unknown_attribute():
 
 def test_str():
     assert str(STRUCTURED_ERROR) == MESSAGE
+
+
+def test_structured_error_is_read_only():
+    with pytest.raises(TypeError):
+        STRUCTURED_ERROR.structured_error["message"] = "modified"  # type: ignore[index]
+
+    assert STRUCTURED_ERROR.message == MESSAGE
@@ -0,0 +1,46 @@
+import subprocess
+import sys
+from typing import Final
+
+import pytest
+
+pytestmark = pytest.mark.slow
+
+# The total self time of Service-Kit's own modules, excluding their dependencies. It's generous, so
+# that it only fails if something slow is done at import time, e.g. generating JSON schemas.
+SERVICE_KIT_IMPORT_TIME_BUDGET_MS: Final[float] = 250
+# Optional or rarely used dependencies that must only be imported when they're used
+LAZILY_IMPORTED_MODULES: Final[tuple[str, ...]] = ("psycopg", "pygments", "uvicorn", "yaml")
+
+
+def _import(module: str) -> tuple[list[str], float]:
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import sys, {module}; print(*sys.modules, sep='\\n')",
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+    # Each line of -X importtime's output is "import time: <self us> | <cumulative us> | <module>"
+    service_kit_import_time_us = 0
+    for line in process.stderr.splitlines():
+        self_time, _, imported_module = line.removeprefix("import time:").split("|")
+        if imported_module.strip().startswith("service_kit"):
+            service_kit_import_time_us += int(self_time)
+
+    return process.stdout.splitlines(), service_kit_import_time_us / 1000
+
+
+@pytest.mark.parametrize("module", ["service_kit", "service_kit.logging", "service_kit.api"])
+def test_import_time(module: str):
+    imported_modules, service_kit_import_time_ms = _import(module)
+
+    for lazily_imported_module in LAZILY_IMPORTED_MODULES:
+        assert lazily_imported_module not in imported_modules
+    assert service_kit_import_time_ms < SERVICE_KIT_IMPORT_TIME_BUDGET_MS
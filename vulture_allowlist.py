@@ -1,8 +1,6 @@
-from service_kit import api, base_model, configuration, errors, logging, testing
+from service_kit import api, base_model, cli, configuration, errors, logging, testing
 from service_kit.utils import Timer
 
-api.RequestIDMiddleware.dispatch
-api.RequestLogMiddleware.dispatch
 api.bootstrap_logging
 api.get_standard_responses
 api.launch_uvicorn
@@ -11,8 +9,11 @@ api.request_id
 base_model.MutableServiceKitBaseModel
 base_model._raise_type_or_value_error
 
+cli.main
+
 configuration.ListConfigurationType
 configuration.override_log_level_on_debug
+configuration.ServiceConfiguration.startup_time_budget
 
 errors.handle_forbidden_error
 errors.handle_timeout_error
@@ -30,6 +31,13 @@ logging.LogLevel.WARNING
 logging.LogLevel.CRITICAL
 logging.SecurityRisk.LOW
 logging.SecurityRisk.HIGH
+logging.QueuedSinkStatistics.queued
+logging.QueuedSinkStatistics.dropped
+logging.QueuedSinkStatistics.written
+logging.RateLimitKey.MESSAGE
+logging.StartupProfiler.finish
+logging.StartupProfiler.mark
+logging.StartupProfiler.phase
 
 testing.request_id
 testing.args